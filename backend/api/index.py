@@ -3,6 +3,16 @@ import os
 # Ensure production defaults for serverless environment
 os.environ.setdefault('FLASK_ENV', 'production')
 os.environ.setdefault('FLASK_DEBUG', 'false')
+# Keep cold starts short: load the solver's scipy / numba on the first CoG
+# request, and skip DB initialisation (run `flask --app main init-db` once
+# per deploy against the production database instead).
+os.environ.setdefault('COG_LAZY_ACCEL', '1')
+os.environ.setdefault('DB_INIT_AT_IMPORT', '0')
+# Solve inline on the request thread: a serverless instance serves one
+# request at a time, and the solver's process pool (forkserver start-up,
+# a multiprocessing semaphore and a /dev/shm block per solve) is pure
+# overhead there — and not reliably available.
+os.environ.setdefault('COG_SOLVER_PROCESSES', '0')
 
 # Import the Flask WSGI app
 from wsgi import app  # Vercel Python will use `app` as the WSGI handler
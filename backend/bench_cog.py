@@ -0,0 +1,398 @@
+"""Micro-benchmarks for the CoG solver hot paths.
+
+Usage:
+  python bench_cog.py seeds                      # _diverse_seeds, P = 1k … 50k
+  python bench_cog.py seeds --sizes 1000 5000 --n-seeds 8 --repeat 5
+  python bench_cog.py float32                    # use_float32 vs float64 solve
+  python bench_cog.py float32 --db               # … also every area in the DB
+  python bench_cog.py score                      # _score_all, N = 2k / 20k / 200k
+  python bench_cog.py ellipse                    # bottom-20 vs bootstrap ellipse
+
+Every benchmark runs on synthetic parcels scattered around Johannesburg so
+it needs no database.  Timings are best-of ``--repeat`` wall-clock
+milliseconds from time.perf_counter().
+
+Notes:
+- ``seeds`` also times the previous O(n_seeds² · P) implementation (kept
+  below as ``_diverse_seeds_reference``) and checks both pick the same seeds.
+- ``float32`` is the regression check for ``SolverConfig.use_float32``: for
+  each area and investor profile it solves in float64 and float32 and
+  compares the top-V parcel, the landing parcel and the potential.
+  ``arrays`` is the normed matrix + V + proximity field the mode narrows;
+  ``peak`` the tracemalloc peak of a whole solve (neighbour index included).  ``--db`` adds every area in
+  DATABASE_URL, loaded the way /api/cog/solve loads it.  Exits 1 if any
+  landing differs or a potential moves by more than ``--tol``.
+- ``score`` times ``_score_all`` through the fused Numba kernel (when
+  Numba is installed) and the in-place NumPy path, against the previous
+  promote / matmul / copy / mask implementation (``_score_all_reference``),
+  and reports the largest |ΔV| of each.
+- ``ellipse`` times ``confidence_ellipse`` (argpartition, metre space)
+  against the previous argsort / degree-space version
+  (``_confidence_ellipse_reference``), and ``bootstrap_uncertainty`` for
+  ``--samples`` replicates, printing both modes' radius.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import cog_solver
+from cog_solver import (
+    CentreOfGravitySolver,
+    SolverConfig,
+    _build_neighbour_index,
+    _diverse_seeds,
+    _score_all,
+    bootstrap_uncertainty,
+    confidence_ellipse,
+    discrete_solve,
+    encode_zoning,
+    warmup_jit,
+)
+from geo import M_PER_DEG_LAT, project
+
+DEFAULT_SIZES = [1_000, 2_000, 5_000, 10_000, 20_000, 50_000]
+FLOAT32_SIZES = [500, 2_000, 10_000, 50_000]
+SCORE_SIZES = [2_000, 20_000, 200_000]
+ELLIPSE_SIZES = [2_000, 20_000, 100_000]
+
+# Investor profiles the float32 check solves for (API weight keys).
+PROFILES = {
+    'balanced': {'rentalYield': 25, 'pricePerSqm': 25, 'vacancy': 20,
+                 'transitProximity': 15, 'footfall': 15},
+    'yield':    {'rentalYield': 60, 'pricePerSqm': 10, 'vacancy': 20,
+                 'transitProximity': 5, 'footfall': 5},
+    'retail':   {'rentalYield': 10, 'pricePerSqm': 10, 'vacancy': 10,
+                 'transitProximity': 30, 'footfall': 40},
+}
+ZONINGS = ('residential', 'commercial', 'mixed', 'industrial', 'retail')
+
+
+def synthetic_area(n: int, seed: int = 0):
+    """Positions (lat/lng + metres), scored potentials and a feasible mask."""
+    rng = np.random.default_rng(seed)
+    positions = np.column_stack([
+        -26.20 + rng.uniform(-0.15, 0.15, n),
+        28.05 + rng.uniform(-0.15, 0.15, n),
+    ])
+    V = rng.normal(0.5, 0.15, n)
+    feasible = rng.random(n) > 0.2
+    return positions, project(positions), V, feasible
+
+
+def synthetic_columns(n: int, seed: int = 0) -> dict:
+    """``from_arrays`` columns: clustered parcels, raw metrics, hazards."""
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(-0.12, 0.12, (8, 2))
+    latlng = (
+        np.array([-26.20, 28.05])
+        + centres[rng.integers(0, len(centres), n)]
+        + rng.normal(0, 0.02, (n, 2))
+    )
+    metrics = np.column_stack([
+        rng.uniform(4, 11, n),            # rental yield %
+        rng.uniform(8_000, 40_000, n),    # price per m²
+        rng.uniform(1, 20, n),            # vacancy %
+        rng.uniform(10, 95, n),           # transit score
+        rng.uniform(10, 95, n),           # footfall score
+    ])
+    zoning_idx, zoning_vocab = encode_zoning(
+        [ZONINGS[i] for i in rng.integers(0, len(ZONINGS), n)]
+    )
+    return {
+        'ids': np.arange(1, n + 1, dtype=np.int64),
+        'latlng': latlng,
+        'metrics': metrics,
+        'hazard': rng.random(n) < 0.03,
+        'zoning_idx': zoning_idx,
+        'zoning_vocab': zoning_vocab,
+    }
+
+
+def db_areas():
+    """(label, cols, zoning_allow) for every area in the configured DB."""
+    from area_models import Area
+    from main import _DEFAULT_ZONING_ALLOW, _load_cog_columns, app
+
+    out = []
+    with app.app_context():
+        for area in Area.query.order_by(Area.id).all():
+            cols, source = _load_cog_columns(area, area.id, _DEFAULT_ZONING_ALLOW)
+            if len(cols['ids']) >= 3:
+                out.append((f"area {area.id} ({source})", cols, set(_DEFAULT_ZONING_ALLOW)))
+    return out
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall-clock time of ``repeat`` calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def _diverse_seeds_reference(pos_m, V, feasible_mask, n_seeds):
+    """Pre-incremental _diverse_seeds: full (P, C, 2) distance tensor per round."""
+    pool = np.where(feasible_mask)[0]
+    if len(pool) == 0:
+        pool = np.arange(len(V), dtype=np.intp)
+    n_seeds = min(n_seeds, len(pool))
+    if n_seeds <= 1:
+        return np.array([pool[int(np.argmax(V[pool]))]], dtype=np.intp)
+    sorted_pool = pool[np.argsort(V[pool])[::-1]]
+    seeds = [int(sorted_pool[0])]
+    top_half = sorted_pool[:max(1, len(sorted_pool) // 2)]
+    pool_pos = pos_m[pool]
+    for _ in range(n_seeds - 1):
+        diff = pool_pos[:, None, :] - pos_m[seeds][None, :, :]
+        dist_min = np.sqrt((diff ** 2).sum(axis=2)).min(axis=1)
+        pv = V[pool]
+        v_score = (pv - pv.min()) / (pv.max() - pv.min() + 1e-9)
+        d_score = dist_min / (dist_min.max() + 1e-9)
+        combined = 0.4 * v_score + 0.6 * d_score
+        mask_chosen = np.zeros(len(pool), dtype=np.bool_)
+        for s in seeds:
+            mask_chosen |= (pool == s)
+        mask_top = np.isin(pool, top_half)
+        candidates = np.where(mask_top & ~mask_chosen)[0]
+        if len(candidates) == 0:
+            candidates = np.where(~mask_chosen)[0]
+        if len(candidates) == 0:
+            break
+        best = candidates[int(np.argmax(combined[candidates]))]
+        seeds.append(int(pool[best]))
+    return np.array(seeds, dtype=np.intp)
+
+
+def bench_seeds(args) -> None:
+    print(f"_diverse_seeds  n_seeds={args.n_seeds}  best of {args.repeat}")
+    print(f"{'P':>8}  {'incremental ms':>15}  {'reference ms':>13}  {'speed-up':>8}  same")
+    for n in args.sizes:
+        _, pos_m, V, feasible = synthetic_area(n)
+        new = best_of(lambda: _diverse_seeds(pos_m, V, feasible, args.n_seeds), args.repeat)
+        ref = best_of(lambda: _diverse_seeds_reference(pos_m, V, feasible, args.n_seeds), args.repeat)
+        same = np.array_equal(
+            _diverse_seeds(pos_m, V, feasible, args.n_seeds),
+            _diverse_seeds_reference(pos_m, V, feasible, args.n_seeds),
+        )
+        print(f"{n:>8}  {new:>15.3f}  {ref:>13.3f}  {ref / new:>7.1f}x  {same}")
+
+
+def _score_all_reference(normed, weight_vec, feasible_mask, hazard_mask, cfg,
+                         proximity_field=None):
+    """Pre-fused _score_all: float64 promote, matmul, copy, masked updates."""
+    n64 = normed.astype(np.float64)
+    w64 = weight_vec.astype(np.float64)
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        v = (n64 @ w64).copy()
+    np.nan_to_num(v, copy=False, nan=0.0, posinf=1.0, neginf=-1.0)
+    v[~feasible_mask] -= cfg.zoning_penalty
+    v[hazard_mask] -= cfg.hazard_penalty
+    if proximity_field is not None:
+        v -= cfg.barrier_soft_weight * proximity_field
+    return v
+
+
+@contextlib.contextmanager
+def numpy_tier():
+    """Run cog_solver's pure-NumPy code paths even if Numba is installed."""
+    has_numba = cog_solver._HAS_NUMBA
+    cog_solver._HAS_NUMBA = False
+    try:
+        yield
+    finally:
+        cog_solver._HAS_NUMBA = has_numba
+
+
+def bench_score(args) -> None:
+    cfg = SolverConfig()
+    warmup_jit()
+    fused = 'fused' if cog_solver._HAS_NUMBA else 'fused (no numba)'
+    print(f"_score_all  F=5  best of {args.repeat}  parallel from "
+          f"N={cog_solver.SCORE_PARALLEL_MIN}")
+    print(f"{'N':>8}  {fused + ' ms':>10}  {'numpy ms':>9}  {'reference ms':>12}"
+          f"  {'speed-up':>8}  {'max |ΔV| fused':>14}  {'numpy':>8}")
+    for n in args.sizes:
+        rng = np.random.default_rng(n)
+        normed = rng.random((n, 5))
+        w = rng.random(5)
+        w /= w.sum()
+        feasible = rng.random(n) > 0.2
+        hazard = rng.random(n) < 0.03
+        prox = np.exp(-rng.random(n) * 5) * (rng.random(n) < 0.3)
+        call = (normed, w, feasible, hazard, cfg)
+
+        ref = _score_all_reference(*call, proximity_field=prox)
+        new_v = _score_all(*call, proximity_field=prox)
+        new = best_of(lambda: _score_all(*call, proximity_field=prox), args.repeat)
+        with numpy_tier():
+            np_v = _score_all(*call, proximity_field=prox)
+            npy = best_of(lambda: _score_all(*call, proximity_field=prox), args.repeat)
+        old = best_of(lambda: _score_all_reference(*call, proximity_field=prox), args.repeat)
+        print(f"{n:>8}  {new:>10.3f}  {npy:>9.3f}  {old:>12.3f}  {old / new:>7.1f}x"
+              f"  {np.abs(new_v - ref).max():>14.2e}  {np.abs(np_v - ref).max():>8.2e}")
+
+
+def _confidence_ellipse_reference(positions, V, solution_lat, solution_lng,
+                                  sigma=1.0, n_bottom=20):
+    """Pre-argpartition ellipse: full argsort, degree-space covariance."""
+    import math
+    m_lat = M_PER_DEG_LAT
+    n_bottom = min(n_bottom, len(positions))
+    bottom_idx = np.argsort(V)[:n_bottom]
+    inv_scores = 1.0 / (np.abs(V[bottom_idx]) + 1e-9)
+    w = inv_scores / inv_scores.sum()
+    diff = positions[bottom_idx] - np.array([solution_lat, solution_lng])
+    cov = (w[:, None] * diff).T @ diff
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    eigenvalues = np.maximum(eigenvalues, 0.0)
+    m_lng = m_lat * math.cos(math.radians(solution_lat))
+    idx = np.argsort(eigenvalues)[::-1]
+    ev = eigenvectors[:, idx[0]]
+    a_m = sigma * math.sqrt(eigenvalues[idx[0]]) * math.sqrt(
+        (m_lat * float(ev[0])) ** 2 + (m_lng * float(ev[1])) ** 2)
+    b_m = sigma * math.sqrt(eigenvalues[idx[1]]) * math.sqrt((m_lat ** 2 + m_lng ** 2) / 2.0)
+    return {'radius_m': round(math.sqrt((a_m ** 2 + b_m ** 2) / 2.0), 1)}
+
+
+def bench_ellipse(args) -> None:
+    cfg = SolverConfig(bootstrap_samples=args.samples)
+    warmup_jit()
+    print(f"uncertainty  best of {args.repeat}  bootstrap B={args.samples}")
+    print(f"{'N':>8}  {'bottom ms':>9}  {'reference ms':>12}  {'speed-up':>8}"
+          f"  {'bootstrap ms':>12}  {'radius m: bottom':>16} {'ref':>8} {'bootstrap':>9}"
+          f"  {'agreement':>9}")
+    for n in args.sizes:
+        cols = synthetic_columns(n, seed=n)
+        solver = CentreOfGravitySolver.from_arrays(
+            **cols, weights=PROFILES['balanced'], zoning_allow=set(ZONINGS[:3]),
+            config=cfg,
+        )
+        prep = solver._prepare()
+        w = solver._weight_vector(solver._weight_by_metric, prep.normed.dtype)
+        V = _score_all(prep.normed, w, prep.feasible_mask, prep.hazard_mask, cfg,
+                       proximity_field=prep.proximity)
+        nb = _build_neighbour_index(prep.positions, cfg.k_neighbours, pos_m=prep.pos_m)
+        best, _ = discrete_solve(prep.positions, prep.normed, w, prep.feasible_mask,
+                                 prep.hazard_mask, cfg, V=V, neighbours=nb, pos_m=prep.pos_m)
+        lat, lng = float(prep.positions[best, 0]), float(prep.positions[best, 1])
+
+        def boot():
+            return bootstrap_uncertainty(
+                prep.positions, prep.pos_m, prep.normed, w, prep.feasible_mask,
+                prep.hazard_mask, cfg, V, best, nb, proximity_field=prep.proximity,
+            )
+
+        new = best_of(lambda: confidence_ellipse(prep.positions, V, lat, lng,
+                                                 pos_m=prep.pos_m), args.repeat)
+        old = best_of(lambda: _confidence_ellipse_reference(prep.positions, V, lat, lng),
+                      args.repeat)
+        bt = best_of(boot, max(1, args.repeat // 4))
+        e_new = confidence_ellipse(prep.positions, V, lat, lng, pos_m=prep.pos_m)
+        e_old = _confidence_ellipse_reference(prep.positions, V, lat, lng)
+        e_bt = boot()
+        print(f"{n:>8}  {new:>9.3f}  {old:>12.3f}  {old / new:>7.1f}x  {bt:>12.2f}"
+              f"  {e_new['radius_m']:>16.1f} {e_old['radius_m']:>8.1f} {e_bt['radius_m']:>9.1f}"
+              f"  {e_bt['agreement']:>9.2f}")
+
+
+def _solve_fp(cols, weights, zoning_allow, use_float32: bool, repeat: int):
+    """(top-V index, landing index, potential, best ms, array bytes, peak bytes)."""
+    cfg = SolverConfig(use_float32=use_float32)
+
+    def solver():
+        return CentreOfGravitySolver.from_arrays(
+            **cols, weights=weights, zoning_allow=zoning_allow, config=cfg,
+        )
+
+    s = solver()
+    prep = s._prepare()
+    V = _score_all(prep.normed, s._weight_vector(s._weight_by_metric, prep.normed.dtype),
+                   prep.feasible_mask, prep.hazard_mask, cfg,
+                   proximity_field=prep.proximity)
+    arrays = prep.normed.nbytes + V.nbytes + prep.proximity.nbytes
+    tracemalloc.start()
+    result = solver().solve(include_parcels=False)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    ms = best_of(lambda: solver().solve(include_parcels=False), repeat)
+    landing = int(np.flatnonzero(
+        (prep.positions[:, 0].round(7) == result.lat)
+        & (prep.positions[:, 1].round(7) == result.lng)
+    )[0])
+    return int(np.argmax(V)), landing, result.potential, ms, arrays, peak
+
+
+def bench_float32(args) -> None:
+    cases = [
+        (f"synthetic N={n}", synthetic_columns(n, seed=n), set(ZONINGS[:3]))
+        for n in args.sizes
+    ]
+    if args.db:
+        cases += db_areas()
+    warmup_jit()                     # keep compilation out of the timings
+
+    print(f"use_float32 vs float64  best of {args.repeat}  tol={args.tol}")
+    print(f"{'area':<36} {'profile':<9} {'top V':>5} {'landing':>7} {'|Δpot|':>7}"
+          f"  {'ms f64':>8} {'f32':>8}  {'arrays KiB f64':>14} {'f32':>7}"
+          f"  {'peak MiB f64':>12} {'f32':>7}")
+    failed = 0
+    for label, cols, zoning_allow in cases:
+        for name, weights in PROFILES.items():
+            top64, land64, pot64, ms64, arr64, mem64 = _solve_fp(
+                cols, weights, zoning_allow, False, args.repeat)
+            top32, land32, pot32, ms32, arr32, mem32 = _solve_fp(
+                cols, weights, zoning_allow, True, args.repeat)
+            dpot = abs(pot64 - pot32)
+            ok = land64 == land32 and dpot <= args.tol
+            failed += not ok
+            print(f"{label:<36} {name:<9} {str(top64 == top32):>5} {str(land64 == land32):>7}"
+                  f" {dpot:>7.4f}  {ms64:>8.2f} {ms32:>8.2f}"
+                  f"  {arr64 / 2**10:>14.1f} {arr32 / 2**10:>7.1f}"
+                  f"  {mem64 / 2**20:>12.2f} {mem32 / 2**20:>7.2f}{'' if ok else '  FAIL'}")
+    if failed:
+        print(f"{failed} case(s) differ beyond tolerance")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CoG solver micro-benchmarks')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_seeds = sub.add_parser('seeds', help='farthest-first seed selection')
+    p_seeds.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    p_seeds.add_argument('--n-seeds', type=int, default=SolverConfig().n_restarts)
+    p_seeds.add_argument('--repeat', type=int, default=5)
+    p_seeds.set_defaults(func=bench_seeds)
+
+    p_score = sub.add_parser('score', help='fused _score_all vs NumPy vs previous')
+    p_score.add_argument('--sizes', type=int, nargs='+', default=SCORE_SIZES)
+    p_score.add_argument('--repeat', type=int, default=20)
+    p_score.set_defaults(func=bench_score)
+
+    p_ell = sub.add_parser('ellipse', help='bottom-20 vs bootstrap uncertainty')
+    p_ell.add_argument('--sizes', type=int, nargs='+', default=ELLIPSE_SIZES)
+    p_ell.add_argument('--samples', type=int, default=cog_solver.BOOTSTRAP_SAMPLES)
+    p_ell.add_argument('--repeat', type=int, default=20)
+    p_ell.set_defaults(func=bench_ellipse)
+
+    p_f32 = sub.add_parser('float32', help='use_float32 accuracy / speed / memory')
+    p_f32.add_argument('--sizes', type=int, nargs='+', default=FLOAT32_SIZES)
+    p_f32.add_argument('--db', action='store_true', help='also every area in DATABASE_URL')
+    p_f32.add_argument('--tol', type=float, default=1e-3,
+                       help='max |potential difference| (normalised units)')
+    p_f32.add_argument('--repeat', type=int, default=3)
+    p_f32.set_defaults(func=bench_float32)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,442 @@
+"""
+cog_executor.py
+===============
+Runs CoG solves off the Flask request thread, in a process pool.
+
+Why
+---
+``CentreOfGravitySolver.solve()`` is CPU-bound.  Run inline, one heavy area
+blocks its Gunicorn worker (and, through the GIL, that worker's other
+threads) for the whole solve.  ``solver_executor`` hands the solve to a
+``concurrent.futures.ProcessPoolExecutor`` whose workers are pre-warmed with
+``warmup_jit`` and only import cog_solver — never main.py or the DB layer.
+
+Data path
+---------
+The parcel columns (ids, latlng, metrics, zoning_idx, hazard) are packed
+into one ``multiprocessing.shared_memory`` block, 8-byte aligned; the task
+carries only the block name, per-array (dtype, shape, offset) descriptors
+and the small scalars (weights, zoning vocabulary, SolverConfig, normaliser
+state).  The worker copies the arrays out once and detaches, so the block
+can be unlinked as soon as the future settles.  Results come back pickled
+(CogResult is O(N), the inputs would have been O(N·F)).  A caller that
+passes ``progress`` gets a small progress slot appended to the block; the
+worker writes the solver's reports there and ``run`` polls it.
+
+Admission control
+-----------------
+At most ``COG_SOLVER_PROCESSES`` solves run at once and at most
+``COG_SOLVER_QUEUE`` more wait for a process; beyond that ``run`` raises
+``SolverBusy`` immediately and the endpoint answers 429 SOLVER_BUSY.
+``COG_SOLVER_PROCESSES=0`` keeps the same limits but solves inline on the
+request thread (useful for local debugging and single-core hosts).
+
+Config (environment)
+--------------------
+  COG_SOLVER_PROCESSES   worker processes           (default 2; 0 = inline)
+  COG_SOLVER_QUEUE       queued solves beyond those (default 4)
+  COG_SOLVER_TIMEOUT_S   per-solve wait in seconds  (default 60)
+
+Public API
+----------
+  solver_executor.run(cols, weights, zoning_allow, config=None,
+                      normaliser=None, mode="solve", progress=None,
+                      timeout=None, wait=None, **mode_opts)
+      -> CogResult | list[CogResult]   (raises SolverBusy, TimeoutError)
+  solver_executor.stats()  -> dict
+  SolverBusy
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+from cog_solver import (
+    CentreOfGravitySolver,
+    CogResult,
+    ProgressFn,
+    QuantileNormaliser,
+    SolverConfig,
+    warmup_jit,
+)
+
+# ── Config ─────────────────────────────────────────────────────────────────
+MAX_PROCESSES: int   = int(os.getenv("COG_SOLVER_PROCESSES", "2"))
+QUEUE_DEPTH:   int   = int(os.getenv("COG_SOLVER_QUEUE", "4"))
+TIMEOUT_S:     float = float(os.getenv("COG_SOLVER_TIMEOUT_S", "60"))
+
+# Columns shipped through shared memory (everything else is small).
+_SHARED_COLUMNS: tuple[str, ...] = ("ids", "latlng", "metrics", "zoning_idx", "hazard")
+_ALIGN = 8
+
+# Progress slot appended to the block when the caller passes ``progress``:
+# int64 [stage code, done, total, iterations]; stage code 0 = nothing yet.
+_PROGRESS_KEY    = "_progress"
+_PROGRESS_STAGES = ("seeds", "tiles", "profiles")
+_PROGRESS_POLL_S = 0.25
+
+
+class SolverBusy(Exception):
+    """Raised when every solver slot and queue position is taken."""
+
+    def __init__(self, limit: int, queue_depth: int) -> None:
+        super().__init__("CoG solver is at capacity; retry shortly.")
+        self.limit       = limit
+        self.queue_depth = queue_depth
+
+
+# ── Shared-memory packing ──────────────────────────────────────────────────
+
+def _pack(
+    cols: dict[str, Any], with_progress: bool = False,
+) -> tuple[SharedMemory, list[tuple[str, str, tuple, int]]]:
+    """Copy the shared columns into one new block; return it + descriptors."""
+    arrays = {k: np.ascontiguousarray(cols[k]) for k in _SHARED_COLUMNS}
+    if with_progress:
+        arrays[_PROGRESS_KEY] = np.zeros(4, dtype=np.int64)
+    specs: list[tuple[str, str, tuple, int]] = []
+    offset = 0
+    for key, arr in arrays.items():
+        specs.append((key, arr.dtype.str, arr.shape, offset))
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+    shm = SharedMemory(create=True, size=max(offset, _ALIGN))
+    for key, dtype, shape, off in specs:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)
+        view[...] = arrays[key]
+        del view                          # no exported buffers left at close()
+    return shm, specs
+
+
+def _unpack(name: str, specs: list[tuple[str, str, tuple, int]]) -> dict[str, np.ndarray]:
+    """Attach to block ``name``, copy the columns out, detach."""
+    shm = SharedMemory(name=name)
+    try:
+        return {
+            key: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off).copy()
+            for key, dtype, shape, off in specs
+        }
+    finally:
+        shm.close()
+
+
+# ── Worker side ────────────────────────────────────────────────────────────
+
+def _init_worker() -> None:
+    """Process-pool initializer: compile / load the Numba kernels once."""
+    warmup_jit()
+
+
+def _solve_task(
+    shm_name: str,
+    specs: list[tuple[str, str, tuple, int]],
+    zoning_vocab: tuple[str, ...],
+    weights: Any,
+    zoning_allow: set[str],
+    config: SolverConfig | None,
+    normaliser_state: dict[str, Any] | None,
+    mode: str,
+    mode_opts: dict[str, Any],
+) -> CogResult | list[CogResult]:
+    """
+    Runs in a pool process: rebuild the solver from arrays and solve.  If
+    the block carries a progress slot, stay attached and write the solver's
+    progress reports into it for the parent to poll.
+    """
+    progress_spec = next((sp for sp in specs if sp[0] == _PROGRESS_KEY), None)
+    cols = _unpack(shm_name, [sp for sp in specs if sp[0] != _PROGRESS_KEY])
+    normaliser = (
+        QuantileNormaliser.from_state(normaliser_state) if normaliser_state else None
+    )
+    solver = CentreOfGravitySolver.from_arrays(
+        **cols,
+        zoning_vocab=zoning_vocab,
+        weights=weights,
+        zoning_allow=zoning_allow,
+        config=config,
+        normaliser=normaliser,
+    )
+    if progress_spec is None:
+        return _dispatch(solver, mode, mode_opts)
+
+    shm  = SharedMemory(name=shm_name)
+    slot = [np.ndarray((4,), dtype=np.int64, buffer=shm.buf, offset=progress_spec[3])]
+
+    def _report(stage: str, done: int, total: int, iterations: int) -> None:
+        slot[0][1:] = (done, total, iterations)
+        slot[0][0]  = _PROGRESS_STAGES.index(stage) + 1
+
+    try:
+        return _dispatch(solver, mode, {**mode_opts, "progress": _report})
+    finally:
+        slot.clear()                      # drop the view before close()
+        shm.close()
+
+
+def _dispatch(
+    solver: CentreOfGravitySolver, mode: str, mode_opts: dict[str, Any],
+) -> CogResult | list[CogResult]:
+    if mode == "batch":
+        return solver.solve_batch(**mode_opts)
+    if mode == "tiled":
+        return solver.solve_tiled(**mode_opts)
+    return solver.solve(**mode_opts)
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for pool workers.  Never plain fork: the parent holds DB
+    connections and (once warmed up) a Numba thread pool.  forkserver forks
+    workers from a clean server that already has NumPy imported; spawn is
+    the fallback where it is unavailable.  The server must not import this
+    module: cog_solver would launch Numba's threading layer there, which
+    GNU OpenMP does not survive fork and which keeps the server from
+    exiting with its parent under TBB.  Each worker imports cog_solver
+    (and launches its own layer) in ``_init_worker`` instead.
+    As with any non-fork start method, a script entry point must keep its
+    work under ``if __name__ == "__main__"`` (gunicorn and main.py do).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["numpy"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+# ── Executor ───────────────────────────────────────────────────────────────
+
+class _SolverExecutor:
+    """Bounded front door to a lazily started process pool."""
+
+    def __init__(
+        self,
+        max_processes: int = MAX_PROCESSES,
+        queue_depth: int = QUEUE_DEPTH,
+        timeout_s: float = TIMEOUT_S,
+    ) -> None:
+        self.max_processes = max_processes
+        self.queue_depth   = queue_depth
+        self.timeout_s     = timeout_s
+        self._slots = threading.BoundedSemaphore(max(1, max_processes) + queue_depth)
+        self._lock  = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected  = 0
+        self._failed    = 0
+
+    # ── Public ──────────────────────────────────────────────────────────
+
+    def run(
+        self,
+        cols: dict[str, Any],
+        weights: Any,
+        zoning_allow: set[str],
+        config: SolverConfig | None = None,
+        normaliser: QuantileNormaliser | None = None,
+        mode: str = "solve",
+        progress: ProgressFn | None = None,
+        timeout: float | None = None,
+        wait: float | None = None,
+        **mode_opts: Any,
+    ) -> CogResult | list[CogResult]:
+        """
+        Solve ``cols`` (``fetch_parcel_columns`` layout) and wait for it.
+
+        ``mode`` picks the solver method — "solve", "tiled" (solve_tiled)
+        or "batch" (solve_batch) — and ``mode_opts`` are its keyword
+        arguments (e.g. ``include_parcels``, ``tile_m``, ``weights_list``).
+        ``progress`` is called on this thread with the solver's reports
+        (polled every 0.25 s from the worker).  ``timeout`` overrides
+        timeout_s for this call.  ``wait`` blocks up to that many seconds
+        for a free slot instead of failing fast (background jobs).
+        Raises SolverBusy when at capacity, TimeoutError after the timeout;
+        solver exceptions (CogValidationError, LinAlgError, …) propagate.
+        """
+        acquired = (
+            self._slots.acquire(timeout=wait) if wait
+            else self._slots.acquire(blocking=False)
+        )
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+            raise SolverBusy(max(1, self.max_processes), self.queue_depth)
+        with self._lock:
+            self._in_flight += 1
+
+        if self.max_processes <= 0:
+            try:
+                if progress is not None:
+                    mode_opts["progress"] = progress
+                return self._finish(self._run_inline(
+                    cols, weights, zoning_allow, config, normaliser, mode, mode_opts,
+                ))
+            except BaseException:
+                self._finish(None, failed=True)
+                raise
+
+        normaliser_state = (
+            normaliser.to_state() if normaliser is not None and normaliser.is_fitted else None
+        )
+        shm = None
+        try:
+            shm, specs = _pack(cols, with_progress=progress is not None)
+            fut = self._submit(
+                _solve_task, shm.name, specs, tuple(cols["zoning_vocab"]),
+                weights, set(zoning_allow), config, normaliser_state, mode, mode_opts,
+            )
+        except BaseException:
+            if shm is not None:
+                self._release_shm(shm)
+            self._finish(None, failed=True)
+            raise
+
+        # The slot is released when the solve settles, even if this thread
+        # stops waiting (timeout) — the process is still busy.  The block
+        # is released by whichever of this thread and the callback is last.
+        block = _SharedBlock(shm, specs)
+
+        def _settled(f: Future) -> None:
+            block.release(settled=True)
+            self._finish(None, failed=f.cancelled() or f.exception() is not None)
+        fut.add_done_callback(_settled)
+
+        timeout = self.timeout_s if timeout is None else timeout
+        last = None
+
+        def _relay() -> None:
+            nonlocal last
+            report = block.progress()
+            if report is not None and report != last:
+                last = report
+                progress(*report)
+
+        try:
+            if progress is None:
+                return fut.result(timeout=timeout)
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    result = fut.result(timeout=max(0.0, min(_PROGRESS_POLL_S, remaining)))
+                except TimeoutError:
+                    if remaining <= _PROGRESS_POLL_S:
+                        raise
+                    _relay()
+                    continue
+                _relay()                          # final report
+                return result
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise
+        finally:
+            block.release(settled=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "mode":          "process" if self.max_processes > 0 else "inline",
+                "max_processes": self.max_processes,
+                "queue_depth":   self.queue_depth,
+                "timeout_s":     self.timeout_s,
+                "pool_started":  self._pool is not None,
+                "in_flight":     self._in_flight,
+                "completed":     self._completed,
+                "rejected":      self._rejected,
+                "failed":        self._failed,
+            }
+
+    # ── Internal ────────────────────────────────────────────────────────
+
+    def _run_inline(self, cols, weights, zoning_allow, config, normaliser, mode, mode_opts):
+        solver = CentreOfGravitySolver.from_arrays(
+            **cols,
+            weights=weights,
+            zoning_allow=zoning_allow,
+            config=config,
+            normaliser=normaliser,
+        )
+        return _dispatch(solver, mode, mode_opts)
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_processes,
+                    mp_context=_mp_context(),
+                    initializer=_init_worker,
+                )
+            pool = self._pool
+        return pool.submit(fn, *args)
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, result: Any, failed: bool = False) -> Any:
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+        self._slots.release()
+        return result
+
+    @staticmethod
+    def _release_shm(shm: SharedMemory) -> None:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _SharedBlock:
+    """
+    Parent-side handle on one task's block.  Freed once both the waiting
+    thread and the future's done-callback have called ``release`` — so the
+    waiter can still read the final progress after the solve settles.
+    """
+
+    def __init__(self, shm: SharedMemory, specs: list[tuple[str, str, tuple, int]]) -> None:
+        self._shm  = shm
+        self._lock = threading.Lock()
+        self._holders = {True, False}             # settled callback, waiter
+        self._progress_offset = next(
+            (off for key, _, _, off in specs if key == _PROGRESS_KEY), None,
+        )
+
+    def progress(self) -> tuple[str, int, int, int] | None:
+        with self._lock:
+            if self._shm is None or self._progress_offset is None:
+                return None
+            stage, done, total, iterations = np.ndarray(
+                (4,), dtype=np.int64, buffer=self._shm.buf, offset=self._progress_offset,
+            ).tolist()
+        if stage == 0:
+            return None
+        return _PROGRESS_STAGES[stage - 1], done, total, iterations
+
+    def release(self, settled: bool) -> None:
+        with self._lock:
+            self._holders.discard(settled)
+            if self._holders:
+                return
+            shm, self._shm = self._shm, None
+        if shm is not None:
+            _SolverExecutor._release_shm(shm)
+
+
+# Module-level singleton — import this everywhere
+solver_executor = _SolverExecutor()
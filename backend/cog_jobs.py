@@ -0,0 +1,275 @@
+"""
+cog_jobs.py
+===========
+Asynchronous CoG solve jobs on an in-process queue.
+
+Why
+---
+A metro-scale tiled solve or a many-profile batch can run longer than the
+hosting platform's request timeout.  ``POST /api/cog/jobs`` enqueues the
+solve and returns a job id at once; ``GET /api/cog/jobs/<id>`` reports
+progress (restart k of n, tiles done, iterations so far) and, when finished,
+the result.
+
+Queue
+-----
+Jobs run on a small thread pool inside the web process — no broker, so it
+works unchanged for local development.  Each job thread loads its parcels
+and hands the solve to ``cog_executor.solver_executor`` with ``wait=`` so it
+queues for a solver slot rather than being rejected; interactive
+/api/cog/solve requests share the same slots.  The job table lives in this
+process: run a single web worker (the Render default) or route polls back
+to the worker that accepted the job.
+
+Caching
+-------
+Every job carries a ``cog_result_cache.result_key``.  If the key is already
+cached the job is created finished (``cached: true``); if an identical job
+is queued or running, that job is returned instead of a new one.  Finished
+results are stored in ``result_cache``.
+
+Config (environment)
+--------------------
+  COG_JOB_WORKERS      concurrent job threads          (default 2)
+  COG_JOB_QUEUE        max queued + running jobs       (default 16)
+  COG_JOB_HISTORY      finished jobs kept for polling  (default 200)
+  COG_JOB_TIMEOUT_S    solve timeout per job (s)       (default 600)
+
+Public API
+----------
+  job_queue.submit(kind, area_id, cache_key, run) -> CogJob
+      ``run(progress)`` returns a CachedResult; raise JobError to fail
+      the job with a structured error.         (raises JobQueueFull)
+  job_queue.get(job_id)  -> CogJob | None
+  job_queue.stats()      -> dict
+  CogJob, JobError, JobQueueFull, JOB_TIMEOUT_S
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from cog_result_cache import CachedResult, result_cache
+from cog_solver import ProgressFn
+
+logger = logging.getLogger(__name__)
+
+# ── Config ─────────────────────────────────────────────────────────────────
+JOB_WORKERS:   int   = int(os.getenv("COG_JOB_WORKERS", "2"))
+JOB_QUEUE:     int   = int(os.getenv("COG_JOB_QUEUE", "16"))
+JOB_HISTORY:   int   = int(os.getenv("COG_JOB_HISTORY", "200"))
+JOB_TIMEOUT_S: float = float(os.getenv("COG_JOB_TIMEOUT_S", "600"))
+
+
+class JobError(Exception):
+    """A job failure with the fields of a ``_cog_error`` response."""
+
+    def __init__(
+        self, message: str, code: str, status: int = 500,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.code    = code
+        self.status  = status
+        self.details = details or {}
+
+
+class JobQueueFull(Exception):
+    """Raised by ``submit`` when COG_JOB_QUEUE jobs are already pending."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__("CoG job queue is full; retry shortly.")
+        self.limit = limit
+
+
+@dataclass
+class CogJob:
+    """
+    One submitted solve.
+
+    status   : "queued" | "running" | "done" | "failed"
+    progress : {"stage", "done", "total", "iterations"} — stage is "loading"
+               until the parcels are in, then the solver's "seeds" /
+               "tiles" / "profiles"
+    result   : CachedResult once done
+    error    : {"error", "code", "status", "details"} once failed
+    """
+    job_id:      str
+    kind:        str
+    area_id:     int
+    cache_key:   str
+    status:      str = "queued"
+    cached:      bool = False
+    created_at:  float = field(default_factory=time.time)
+    started_at:  "float | None" = None
+    finished_at: "float | None" = None
+    progress:    dict[str, Any] = field(default_factory=dict)
+    result:      "CachedResult | None" = None
+    error:       "dict[str, Any] | None" = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Status fields for the API (the result is rendered by the caller)."""
+        out = {
+            "job_id":     self.job_id,
+            "kind":       self.kind,
+            "area_id":    self.area_id,
+            "status":     self.status,
+            "cached":     self.cached,
+            "progress":   dict(self.progress),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.started_at is not None:
+            end = self.finished_at or time.time()
+            out["elapsed_s"] = round(end - self.started_at, 3)
+        if self.error is not None:
+            out["error"] = self.error
+        return out
+
+
+class _JobQueue:
+    """Job table + worker pool.  All job mutations happen under ``_lock``."""
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_pending: int = JOB_QUEUE,
+        history: int = JOB_HISTORY,
+    ) -> None:
+        self._workers     = workers
+        self._max_pending = max_pending
+        self._history     = history
+        self._jobs: OrderedDict[str, CogJob] = OrderedDict()
+        self._active: dict[str, CogJob] = {}        # cache_key → pending job
+        self._lock  = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._submitted   = 0
+        self._cache_hits  = 0
+        self._deduplicated = 0
+        self._failed      = 0
+
+    # ── Public ──────────────────────────────────────────────────────────
+
+    def submit(
+        self,
+        kind: str,
+        area_id: int,
+        cache_key: str,
+        run: Callable[[ProgressFn], CachedResult],
+    ) -> CogJob:
+        """
+        Enqueue ``run`` unless its result is cached or already pending.
+        Returns the (possibly already finished) job.
+        """
+        cached = result_cache.get(cache_key)
+        with self._lock:
+            self._submitted += 1
+            if cached is not None:
+                now = time.time()
+                job = self._new_job(kind, area_id, cache_key)
+                job.status, job.cached, job.result = "done", True, cached
+                job.started_at = job.finished_at = now
+                self._cache_hits += 1
+                self._trim()
+                return job
+            pending = self._active.get(cache_key)
+            if pending is not None:
+                self._deduplicated += 1
+                return pending
+            if len(self._active) >= self._max_pending:
+                raise JobQueueFull(self._max_pending)
+            job = self._new_job(kind, area_id, cache_key)
+            self._active[cache_key] = job
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="cog-job",
+                )
+            self._trim()
+        self._pool.submit(self._run, job, run)
+        return job
+
+    def get(self, job_id: str) -> CogJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts: dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                "workers":      self._workers,
+                "max_pending":  self._max_pending,
+                "jobs":         counts,
+                "submitted":    self._submitted,
+                "cache_hits":   self._cache_hits,
+                "deduplicated": self._deduplicated,
+                "failed":       self._failed,
+            }
+
+    # ── Internal ────────────────────────────────────────────────────────
+
+    def _new_job(self, kind: str, area_id: int, cache_key: str) -> CogJob:
+        job = CogJob(uuid.uuid4().hex, kind, int(area_id), cache_key)
+        self._jobs[job.job_id] = job
+        return job
+
+    def _trim(self) -> None:
+        """
+        Forget the oldest finished jobs beyond the history limit.  Jobs are
+        moved to the end of ``_jobs`` as they finish, so "oldest" is by
+        finish time and a long job is never forgotten as it completes.
+        """
+        finished = [j.job_id for j in self._jobs.values() if j.finished]
+        for job_id in finished[:max(0, len(finished) - self._history)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: CogJob, run: Callable[[ProgressFn], CachedResult]) -> None:
+        def _progress(stage: str, done: int, total: int, iterations: int) -> None:
+            with self._lock:
+                job.progress = {
+                    "stage": stage, "done": done, "total": total,
+                    "iterations": iterations,
+                }
+
+        with self._lock:
+            job.status, job.started_at = "running", time.time()
+            job.progress = {"stage": "loading", "done": 0, "total": 0, "iterations": 0}
+        result = error = None
+        try:
+            result = run(_progress)
+            result_cache.put(job.cache_key, result)
+        except JobError as je:
+            error = {"error": str(je), "code": je.code,
+                     "status": je.status, "details": je.details}
+        except Exception:
+            logger.exception("CoG job %s failed", job.job_id)
+            error = {"error": "Solver failed unexpectedly. Please try again.",
+                     "code": "SOLVER_FAILED", "status": 500, "details": {}}
+        with self._lock:
+            job.finished_at = time.time()
+            if error is None:
+                job.status, job.result = "done", result
+            else:
+                job.status, job.error = "failed", error
+                self._failed += 1
+            self._active.pop(job.cache_key, None)
+            self._jobs.move_to_end(job.job_id)
+            self._trim()
+
+
+# Module-level singleton — import this everywhere
+job_queue = _JobQueue()
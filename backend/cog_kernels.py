@@ -0,0 +1,217 @@
+"""
+cog_kernels.py
+==============
+Build-time bundle of the CoG solver's compiled Numba kernels.
+
+Why
+---
+The solver's kernels are ``cache=True``, but Numba caches next to the source
+(``__pycache__``) and a fresh Render container — or any host that does not
+persist the build tree's ``__pycache__`` — starts without it, so the first
+solve after every cold start pays ~2 s of LLVM compilation.  ``python cog_kernels.py`` runs at build time: it compiles
+every kernel signature ``warmup_jit`` covers into a scratch Numba cache and
+copies the result into ``numba_kernels/`` inside the deployed tree.
+
+At import, cog_solver calls ``install_bundle()`` before importing Numba.  It
+copies the bundle into a writable cache directory (deployed trees may be
+read-only, and Numba's cache path depends on where the source lives) and
+points ``NUMBA_CACHE_DIR`` at it, so ``warmup_jit`` loads the kernels instead
+of compiling them.  ``acceleration_info()["kernels"]`` reports which
+happened and how long it took.
+
+Portability
+-----------
+Numba keys cached code by CPU model.  By default the bundle is compiled for
+the ``generic`` CPU so it loads on whatever machine the app lands on; the
+server then also compiles for ``generic`` (``NUMBA_CPU_NAME``), giving up
+host-specific instructions for a predictable cold start.  ``--cpu host``
+builds for the build machine instead — use it only when build and runtime
+share hardware.  A bundle built by another Python or Numba version is
+ignored.
+
+Usage (from backend/, after ``pip install -r requirements.txt``)
+----------------------------------------------------------------
+  python cog_kernels.py                      # → numba_kernels/
+  python cog_kernels.py --cpu host --out DIR
+
+Config (environment)
+--------------------
+  COG_KERNEL_BUNDLE      bundle directory           (default backend/numba_kernels)
+  COG_KERNEL_CACHE_DIR   writable Numba cache       (default <tmp>/digitalestate_numba_cache)
+
+Public API
+----------
+  install_bundle() -> dict   (call before importing numba)
+  build_bundle(out, cpu_name="generic") -> dict
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from importlib import metadata
+from typing import Any
+
+# ── Config ─────────────────────────────────────────────────────────────────
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+KERNEL_BUNDLE_DIR: str = os.getenv(
+    "COG_KERNEL_BUNDLE", os.path.join(_HERE, "numba_kernels"),
+)
+KERNEL_CACHE_DIR: str = os.getenv(
+    "COG_KERNEL_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "digitalestate_numba_cache"),
+)
+MANIFEST = "bundle.json"
+
+
+def _python_tag() -> str:
+    return f"py{sys.version_info[0]}{sys.version_info[1]}"
+
+
+def _numba_version() -> "str | None":
+    try:
+        return metadata.version("numba")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _cache_subpath(cache_dir: str) -> str:
+    """
+    Where Numba caches this directory's modules under ``cache_dir`` —
+    mirrors numba.core.caching._CacheLocator.get_suitable_cache_subpath.
+    """
+    name = os.path.basename(_HERE)
+    digest = hashlib.sha1(_HERE.encode()).hexdigest()
+    return os.path.join(cache_dir, f"{name}_{digest}")
+
+
+# ---------------------------------------------------------------------------
+#  Runtime: install the bundle
+# ---------------------------------------------------------------------------
+
+def install_bundle() -> dict[str, Any]:
+    """
+    Point Numba's cache at a writable copy of the kernel bundle.  Must run
+    before ``numba`` is imported.  Returns a status dict for
+    ``acceleration_info``: ``bundle`` (installed or not), ``cache_dir``
+    and, when not installed, ``reason``.  Never raises — without a usable
+    bundle the kernels are simply JIT-compiled as before.
+    """
+    status: dict[str, Any] = {"bundle": False, "cache_dir": os.getenv("NUMBA_CACHE_DIR")}
+    if status["cache_dir"]:
+        status["reason"] = "NUMBA_CACHE_DIR set by the environment"
+        return status
+    try:
+        with open(os.path.join(KERNEL_BUNDLE_DIR, MANIFEST)) as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        status["reason"] = "no bundle"
+        return status
+    if manifest.get("python") != _python_tag() or manifest.get("numba") != _numba_version():
+        status["reason"] = (
+            f"bundle built for {manifest.get('python')} / numba {manifest.get('numba')}"
+        )
+        return status
+
+    try:
+        dest = _cache_subpath(KERNEL_CACHE_DIR)
+        os.makedirs(dest, exist_ok=True)
+        for name in os.listdir(KERNEL_BUNDLE_DIR):
+            if name == MANIFEST or os.path.exists(os.path.join(dest, name)):
+                continue
+            shutil.copy2(os.path.join(KERNEL_BUNDLE_DIR, name), dest)
+    except OSError as exc:
+        status["reason"] = f"cannot copy bundle: {exc}"
+        return status
+
+    os.environ["NUMBA_CACHE_DIR"] = KERNEL_CACHE_DIR
+    if manifest.get("cpu_name") == "generic":
+        os.environ.setdefault("NUMBA_CPU_NAME", "generic")
+    status.update(bundle=True, cache_dir=KERNEL_CACHE_DIR,
+                  cpu_name=manifest.get("cpu_name"), built_at=manifest.get("built_at"))
+    return status
+
+
+# ---------------------------------------------------------------------------
+#  Build time: compile into a bundle
+# ---------------------------------------------------------------------------
+
+def build_bundle(out: str, cpu_name: str = "generic") -> dict[str, Any]:
+    """
+    Compile every kernel ``warmup_jit`` covers into a scratch cache and copy
+    the cache files plus a manifest into ``out`` (replacing its contents).
+    Must run in a fresh interpreter, before cog_solver or numba is imported.
+    """
+    if "numba" in sys.modules:
+        raise RuntimeError("build_bundle must run before numba is imported")
+    if _numba_version() is None:
+        raise RuntimeError("numba is not installed; nothing to precompile")
+
+    scratch = tempfile.mkdtemp(prefix="cog_kernels_")
+    os.environ["NUMBA_CACHE_DIR"] = scratch
+    if cpu_name == "generic":
+        os.environ["NUMBA_CPU_NAME"] = "generic"
+    else:
+        os.environ.pop("NUMBA_CPU_NAME", None)
+
+    try:
+        import cog_solver
+
+        t0 = time.perf_counter()
+        cog_solver.warmup_jit()
+        compile_s = time.perf_counter() - t0
+
+        built = _cache_subpath(scratch)
+        files = sorted(os.listdir(built)) if os.path.isdir(built) else []
+        if not files:
+            raise RuntimeError(f"no kernels were cached under {scratch}")
+
+        shutil.rmtree(out, ignore_errors=True)
+        os.makedirs(out)
+        for name in files:
+            shutil.copy2(os.path.join(built, name), out)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if cpu_name != "generic":
+        import llvmlite.binding as ll
+        cpu_name = ll.get_host_cpu_name()
+    manifest = {
+        "python":    _python_tag(),
+        "numba":     _numba_version(),
+        "cpu_name":  cpu_name,
+        "files":     len(files),
+        "compile_s": round(compile_s, 3),
+        "built_at":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(os.path.join(out, MANIFEST), "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", default=KERNEL_BUNDLE_DIR,
+                        help="bundle directory (default: %(default)s)")
+    parser.add_argument("--cpu", choices=("generic", "host"), default="generic",
+                        help="CPU model to compile for (default: %(default)s)")
+    args = parser.parse_args()
+    if _numba_version() is None:
+        # numpy-only deployments have no kernels; not a build failure
+        print("cog_kernels: numba is not installed; skipping")
+        sys.exit(0)
+    try:
+        info = build_bundle(args.out, args.cpu)
+    except RuntimeError as exc:
+        print(f"cog_kernels: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"cog_kernels: {info['files']} files for {info['cpu_name']} "
+          f"({info['python']}, numba {info['numba']}) in {info['compile_s']} s "
+          f"→ {args.out}")
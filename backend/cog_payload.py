@@ -0,0 +1,157 @@
+"""
+cog_payload.py
+==============
+Response encodings for the per-parcel part of CoG solver responses.
+
+/api/cog/solve, /api/cog/solve-batch and /api/cog/preview return a score
+for every parcel.  At N = 2000 the default one-dict-per-parcel JSON dominates
+response time and peak memory, so callers may ask for a leaner layout with
+``"format"`` in the request body (or ``?format=`` on the URL):
+
+  objects   (default)  "parcels": [ {id, lat, lng, score, feasible, zoning}, ... ]
+  columnar             "parcels": { "ids": [...], "lats": [...], "lngs": [...],
+                                    "scores": [...], "feasible": [...],
+                                    "zoning_idx": [...], "zoning_vocab": [...] }
+  binary               application/vnd.digitalestate.cog+binary (see below)
+
+Binary layout  (all integers little-endian)
+-------------------------------------------
+  uint32             header_len
+  header_len bytes   UTF-8 JSON header: every scalar field of the JSON
+                     response (lat, lng, potential, …) plus
+                     "parcel_count": N,
+                     "zoning_vocab": [str, ...],
+                     "buffers": [ {"name", "dtype", "offset", "length"}, ... ]
+  zero padding       up to the next 8-byte boundary
+  buffers            each starts 8-byte aligned; ``offset`` is relative to
+                     the first buffer, ``length`` counts elements
+
+  ids         <i8   parcel ids
+  lats, lngs  <f8   parcel coordinates (float64 so they match solution lat/lng)
+  scores      <f4   normalised score in [0, 1]
+  feasible    |u1   0 / 1
+  zoning_idx  <i2   index into header.zoning_vocab
+
+The JS decoder lives in frontend/src/services/cogPayload.js.
+
+Public API
+----------
+  RESPONSE_FORMATS, BINARY_MIMETYPE
+  requested_format(body, args)              -> str   (raises ValueError)
+  parcel_columns(ids, latlng, scores, feasible, zoning_idx, zoning_vocab) -> dict
+  parcels_as_objects(cols)                  -> list[dict]
+  parcels_as_columnar(cols)                 -> dict
+  encode_binary(header, cols)               -> bytes
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any
+
+import numpy as np
+
+RESPONSE_FORMATS: tuple[str, ...] = ("objects", "columnar", "binary")
+BINARY_MIMETYPE: str = "application/vnd.digitalestate.cog+binary"
+
+# Buffer order and wire dtype for the binary encoding.
+_BINARY_BUFFERS: tuple[tuple[str, str], ...] = (
+    ("ids",        "<i8"),
+    ("lats",       "<f8"),
+    ("lngs",       "<f8"),
+    ("scores",     "<f4"),
+    ("feasible",   "|u1"),
+    ("zoning_idx", "<i2"),
+)
+_ALIGN = 8
+
+
+def requested_format(body: dict[str, Any], args: Any = None) -> str:
+    """Response format from the JSON body or query string (default objects)."""
+    fmt = body.get("format") or (args.get("format") if args is not None else None)
+    fmt = str(fmt or "objects").lower()
+    if fmt not in RESPONSE_FORMATS:
+        raise ValueError(
+            f"Unknown response format: {fmt}. Expected one of {list(RESPONSE_FORMATS)}."
+        )
+    return fmt
+
+
+def parcel_columns(
+    ids: np.ndarray,
+    latlng: np.ndarray,
+    scores: np.ndarray,
+    feasible: np.ndarray,
+    zoning_idx: np.ndarray,
+    zoning_vocab: "tuple[str, ...] | list[str]",
+) -> dict[str, Any]:
+    """Bundle per-parcel arrays into the layout every encoder below takes."""
+    latlng = np.asarray(latlng, dtype=np.float64)
+    return {
+        "ids":          np.asarray(ids, dtype=np.int64),
+        "lats":         latlng[:, 0],
+        "lngs":         latlng[:, 1],
+        "scores":       np.asarray(scores, dtype=np.float64),
+        "feasible":     np.asarray(feasible, dtype=np.bool_),
+        "zoning_idx":   np.asarray(zoning_idx, dtype=np.int16),
+        "zoning_vocab": tuple(zoning_vocab),
+    }
+
+
+def parcels_as_objects(cols: dict[str, Any]) -> list[dict[str, Any]]:
+    """The default one-dict-per-parcel shape (scores rounded to 4 dp)."""
+    vocab = np.asarray(cols["zoning_vocab"], dtype=object)
+    return [
+        {
+            "id":       pid,
+            "lat":      lat,
+            "lng":      lng,
+            "score":    round(score, 4),
+            "feasible": feas,
+            "zoning":   zoning,
+        }
+        for pid, lat, lng, score, feas, zoning in zip(
+            cols["ids"].tolist(), cols["lats"].tolist(), cols["lngs"].tolist(),
+            cols["scores"].tolist(), cols["feasible"].tolist(),
+            vocab[cols["zoning_idx"]].tolist(),
+        )
+    ]
+
+
+def parcels_as_columnar(cols: dict[str, Any]) -> dict[str, Any]:
+    """Flat parallel arrays — one JSON list per field instead of N dicts."""
+    return {
+        "ids":          cols["ids"].tolist(),
+        "lats":         cols["lats"].tolist(),
+        "lngs":         cols["lngs"].tolist(),
+        "scores":       np.round(cols["scores"], 4).tolist(),
+        "feasible":     cols["feasible"].tolist(),
+        "zoning_idx":   cols["zoning_idx"].tolist(),
+        "zoning_vocab": list(cols["zoning_vocab"]),
+    }
+
+
+def encode_binary(header: dict[str, Any], cols: dict[str, Any]) -> bytes:
+    """Encode ``header`` + parcel ``cols`` in the binary layout above."""
+    buffers: list[bytes] = []
+    specs:   list[dict[str, Any]] = []
+    offset = 0
+    for name, dtype in _BINARY_BUFFERS:
+        raw = np.ascontiguousarray(cols[name], dtype=dtype).tobytes()
+        specs.append({
+            "name": name, "dtype": dtype, "offset": offset,
+            "length": int(cols[name].shape[0]),
+        })
+        pad = -len(raw) % _ALIGN
+        buffers.append(raw + b"\0" * pad)
+        offset += len(raw) + pad
+
+    head = dict(header)
+    head["parcel_count"] = int(cols["ids"].shape[0])
+    head["zoning_vocab"] = list(cols["zoning_vocab"])
+    head["buffers"]      = specs
+    head_bytes = json.dumps(head, separators=(",", ":")).encode("utf-8")
+    prefix = struct.pack("<I", len(head_bytes)) + head_bytes
+    prefix += b"\0" * (-len(prefix) % _ALIGN)
+    return prefix + b"".join(buffers)
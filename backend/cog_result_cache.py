@@ -0,0 +1,241 @@
+"""
+cog_result_cache.py
+===================
+In-process LRU of finished CoG solve responses.
+
+Why
+---
+A solve is deterministic in its inputs: the area's parcel data, the weight
+vector, the zoning filter and the SolverConfig.  Re-submitting the same
+request (the same investor profile on the same area, a polling client
+retrying a job) should not repeat the DB load, normalisation, proximity
+field, neighbour index, ascent and ellipse to reproduce an answer we
+already have.  ``result_key`` hashes every input, so a hit is exactly the
+response a fresh solve would produce.  New parcel data is handled two ways:
+async jobs put a parcel data version into the key (new data simply misses);
+/api/cog/solve keys without it, stamps each result with the version it was
+solved at (``CachedResult.data_version``) and passes the area's current
+version — ``parcel_cache.current_version``, probed at most every
+``COG_CACHE_REVALIDATE_S`` — to ``get``, which drops a result from older
+rows.  A version change seen by parcel_cache also calls ``invalidate_area``
+(main.py registers it as an invalidation listener), so results are not kept
+past a data change merely because nobody asked for them since.
+
+Bounds
+------
+Entries are evicted least-recently-used once the cache exceeds either
+``COG_RESULT_CACHE_SIZE`` entries or ``COG_RESULT_CACHE_MAX_BYTES`` of
+per-parcel arrays, and ignored once older than ``COG_RESULT_CACHE_TTL_S``
+(hours by default — a backstop, not the freshness mechanism).
+
+Config (environment)
+--------------------
+  COG_RESULT_CACHE_SIZE        max entries            (default 64)
+  COG_RESULT_CACHE_MAX_BYTES   max array bytes        (default 64 MiB)
+  COG_RESULT_CACHE_TTL_S       entry lifetime (s)     (default 21600)
+
+Public API
+----------
+  result_key(area_id, kind, weights, zoning_allow, config,
+             data_version=None, **options) -> str
+  result_cache.get(key, data_version=None) -> CachedResult | None
+  result_cache.put(key, result)
+  result_cache.invalidate_area(area_id) -> int   (entries dropped)
+  result_cache.stats()                  -> dict
+  CachedResult
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from cog_solver import CentreOfGravitySolver, SolverConfig
+
+# ── Config ─────────────────────────────────────────────────────────────────
+MAX_ENTRIES: int   = int(os.getenv("COG_RESULT_CACHE_SIZE", "64"))
+MAX_BYTES:   int   = int(os.getenv("COG_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTL_SECONDS: float = float(os.getenv("COG_RESULT_CACHE_TTL_S", str(6 * 3600)))
+
+# Normalised weights are keyed at this precision: far finer than any slider
+# step, coarse enough to absorb float division noise.
+_WEIGHT_DECIMALS: int = 12
+
+
+@dataclass
+class CachedResult:
+    """
+    One finished solve, ready to render in any response format.
+
+    payload     : dict             — JSON-safe scalar response fields
+                                     (lat, lng, convergence, results, …)
+    parcel_cols : dict | None      — cog_payload.parcel_columns arrays for
+                                     single solves; None for batch results
+    data_version: str | None       — parcel data version the solve read
+                                     (None when the key already carries it)
+    """
+    area_id:     int
+    payload:     dict[str, Any]
+    parcel_cols: "dict[str, Any] | None" = None
+    created_at:  float = field(default_factory=time.time)
+    data_version: "str | None" = None
+
+    @property
+    def nbytes(self) -> int:
+        if not self.parcel_cols:
+            return 0
+        return sum(v.nbytes for v in self.parcel_cols.values() if isinstance(v, np.ndarray))
+
+    def is_expired(self, ttl: float = TTL_SECONDS) -> bool:
+        return (time.time() - self.created_at) > ttl
+
+
+def result_key(
+    area_id: int | str,
+    kind: str,
+    weights: Any,
+    zoning_allow: set[str] | list[str],
+    config: SolverConfig,
+    data_version: str | None = None,
+    **options: Any,
+) -> str:
+    """
+    SHA-256 over the canonical JSON of every solve input.  ``weights`` is a
+    weight dict or (batch) a list of (key, weights) pairs, each normalised
+    the way the CentreOfGravitySolver constructor does (metric keys, divided
+    by total |weight|) and rounded to 12 decimals, so {25, 25, …} and
+    {0.25, 0.25, …} share a key even where the two divisions differ in the
+    last bit.  ``data_version`` may be None when the caller relies on
+    ``invalidate_area`` instead.  ``options`` carries mode-specific inputs
+    (tiled, tile_m, include_parcels, …).
+    """
+    def _w(w: dict[str, Any]) -> dict[str, float]:
+        return {
+            k: round(v, _WEIGHT_DECIMALS)
+            for k, v in CentreOfGravitySolver._metric_weights(
+                {k: float(v) for k, v in w.items()}
+            ).items()
+        }
+
+    spec = {
+        "area_id":      int(area_id),
+        "kind":         kind,
+        "weights":      _w(weights) if isinstance(weights, dict)
+                        else [[key, _w(w)] for key, w in weights],
+        "zoning_allow": sorted(zoning_allow),
+        "config":       dataclasses.asdict(config),
+        "data_version": data_version,
+        "options":      options,
+    }
+    canon = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+
+class _ResultLRUCache:
+    """Thread-safe LRU of CachedResult bounded by entries and array bytes."""
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        max_bytes: int = MAX_BYTES,
+        ttl: float = TTL_SECONDS,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes   = max_bytes
+        self._ttl         = ttl
+        self._store: OrderedDict[str, CachedResult] = OrderedDict()
+        self._bytes  = 0
+        self._lock   = threading.Lock()
+        self._hits   = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidated = 0
+        self._outdated = 0
+
+    # ── Public ──────────────────────────────────────────────────────────
+
+    def get(self, key: str, data_version: str | None = None) -> CachedResult | None:
+        """
+        The result for ``key``, or None if absent, expired or — when both
+        ``data_version`` and the result's own version are known — solved
+        from different parcel data.
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            outdated = (
+                entry is not None and data_version is not None
+                and entry.data_version is not None
+                and entry.data_version != data_version
+            )
+            if entry is None or outdated or entry.is_expired(self._ttl):
+                if entry is not None:
+                    self._drop(key)
+                if outdated:
+                    self._outdated += 1
+                self._misses += 1
+                return None
+            self._store.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: str, result: CachedResult) -> None:
+        with self._lock:
+            if key in self._store:
+                self._drop(key)
+            self._store[key] = result
+            self._bytes += result.nbytes
+            while self._store and (
+                len(self._store) > self._max_entries or self._bytes > self._max_bytes
+            ):
+                self._drop(next(iter(self._store)))
+                self._evictions += 1
+
+    def invalidate_area(self, area_id: int | str) -> int:
+        """Drop every result for ``area_id``; return how many were dropped."""
+        with self._lock:
+            keys = [k for k, e in self._store.items() if e.area_id == int(area_id)]
+            for k in keys:
+                self._drop(k)
+            self._invalidated += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries":        len(self._store),
+                "max_entries":    self._max_entries,
+                "bytes_resident": self._bytes,
+                "max_bytes":      self._max_bytes,
+                "ttl_seconds":    self._ttl,
+                "hits":           self._hits,
+                "misses":         self._misses,
+                "hit_rate":       round(self._hits / total, 4) if total else 0.0,
+                "evictions":      self._evictions,
+                "invalidated":    self._invalidated,
+                "outdated":       self._outdated,
+            }
+
+    # ── Internal ────────────────────────────────────────────────────────
+
+    def _drop(self, key: str) -> None:
+        entry = self._store.pop(key)
+        self._bytes -= entry.nbytes
+
+
+# Module-level singleton — import this everywhere
+result_cache = _ResultLRUCache()
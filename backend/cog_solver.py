@@ -4,17 +4,22 @@ Centre-of-Gravity Geospatial Optimizer  —  Discrete k-NN Edition
 
 Architecture
 ------------
-1.  Load      – parcels_from_db builds a Parcel list from SQLAlchemy objects.
+1.  Load      – parcels_from_db builds a Parcel list from SQLAlchemy objects;
+                CentreOfGravitySolver.from_arrays takes columnar NumPy input
+                (parcel_domain.fetch_parcel_columns) with no Parcel objects.
 2.  Normalise – QuantileNormaliser clips each metric to [p5, p95] then scales
                 to [0, 1].  Lower-is-better metrics are flipped so that 1.0
                 always means "most desirable for investment".
 3.  Barriers  – _compute_proximity_field builds a soft repulsion field: each
                 parcel receives a penalty that decays exponentially with its
                 distance to the nearest hazard / zoning-infeasible parcel
-                (default 1/e radius = 400 m).  This graduates the hard-stop
-                flat penalty into a smooth geospatial influence zone.
+                (default 1/e radius = 400 m), cut off to 0 beyond 5 radii
+                so only parcels near a barrier are evaluated.  This
+                graduates the hard-stop flat penalty into a smooth
+                geospatial influence zone.
 4.  Potential – _score_all vectorises V(j) = w·m - hard_penalties - soft_field
-                for all N parcels in one matmul + a few masked subtractions.
+                for all N parcels: one fused Numba pass (threaded for large
+                N) or, without Numba, one matmul + in-place masked updates.
 5.  Solver    – Multi-start tabu-enhanced best-neighbour ascent:
                     a. Pre-build a k=30 KD-tree neighbour index (scipy,
                        O(N log N)) or fall back to O(N²) brute-force.
@@ -27,48 +32,83 @@ Architecture
                     d. Expanded-neighbour retry: if no restart converged,
                        re-run seeds with k × k_expand_factor neighbours
                        (variable-neighbourhood search without index rebuild).
-                    e. Inner hot-loop JIT-compiled by Numba (cache=True,
-                       fastmath=True) if available, plain NumPy otherwise.
-6.  Ellipse   – confidence_ellipse eigen-decomposes the position covariance
-                of the 20 *lowest*-potential parcels weighted by 1/|V| to
-                give a 1-sigma risk ellipse in metres.
-
-Acceleration tiers (auto-detected at import time)
---------------------------------------------------
+                    e. All restarts advance in one kernel call: a Numba
+                       prange over seeds (cache=True, fastmath=True) if
+                       available, otherwise a NumPy lockstep formulation
+                       that gathers V[nb[current]] for every walker per step.
+6.  Ellipse   – confidence_ellipse eigen-decomposes the metre-space
+                covariance of the 20 *lowest*-potential parcels (picked by
+                argpartition) weighted by 1/|V| to give a 1-sigma risk
+                ellipse.  uncertainty_mode="bootstrap" instead re-solves
+                with jittered weights and resampled seeds in one batch
+                (bootstrap_uncertainty) and reports the solution's spread.
+7.  Batch     – CentreOfGravitySolver.solve_batch scores P investor profiles
+                with one (N,F)@(F,P) matmul over a shared normalised matrix,
+                proximity field and neighbour index.
+8.  Tiled     – CentreOfGravitySolver.solve_tiled / tiled_discrete_solve
+                partition metro-scale parcel sets into a metre grid, run the
+                ascent per tile (core + halo parcels, so walks cross tile
+                borders) on a thread pool and keep the best tile optimum.
+                Neighbour-index memory is bounded by tile size, not N.
+
+Acceleration tiers (detected at import, or on first use with COG_LAZY_ACCEL=1)
+-------------------------------------------------------------------------------
 Tier 1  scipy + numba   KD-tree O(N log N) index + Numba JIT inner loop
 Tier 2  scipy only       KD-tree index, pure-NumPy inner loop
 Tier 3  numpy only       O(N²) brute-force index, pure-NumPy inner loop
 
 Call ``acceleration_info()`` to inspect which tier is active.
 Call ``warmup_jit()`` once at server startup to pre-compile Numba kernels
-(avoids a ~2 s cold-start penalty on the first solve request).
+(avoids a ~2 s cold-start penalty on the first solve request); with a
+build-time ``python cog_kernels.py`` bundle it loads them instead.
 
 Public interface (unchanged from previous version):
     Parcel, SolverConfig, CogResult, CentreOfGravitySolver, parcels_from_db,
     CogValidationError, validate_weights, acceleration_info, warmup_jit
+Columnar input: CentreOfGravitySolver.from_arrays, parcels_to_columns
+Tiled solve:    CentreOfGravitySolver.solve_tiled, tiled_discrete_solve
+Top-K sites:    CentreOfGravitySolver.solve(top_k=...), distinct_sites
+Progress:       ProgressFn — optional ``progress`` on solve / solve_tiled /
+                solve_batch (seed k of n, tiles done, iterations so far)
 """
 
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass, field
-from typing import Any, Optional
+import os
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Optional
 
 import numpy as np
 
-# ── Optional acceleration libraries ────────────────────────────────────────
-try:
-    from scipy.spatial import KDTree as _KDTree
-    _HAS_SCIPY = True
-except ImportError:  # pragma: no cover
-    _HAS_SCIPY = False
+from cog_kernels import install_bundle
+from geo import metre_scale, project, reference_lat
 
-try:
-    import numba as _numba
-    _HAS_NUMBA = True
-except ImportError:  # pragma: no cover
-    _numba = None  # type: ignore
-    _HAS_NUMBA = False
+# ── Optional acceleration libraries ────────────────────────────────────────
+# scipy and numba are imported by _load_acceleration(): when this module is
+# imported (default) or, with COG_LAZY_ACCEL=1, on first solver use, so web
+# workers that never solve do not pay for them.  Until then the flags below
+# read False and every kernel is bound to its NumPy tier.
+LAZY_ACCEL: bool = os.getenv("COG_LAZY_ACCEL", "0") == "1"
+
+_KDTree:    Any  = None
+_numba:     Any  = None
+_HAS_SCIPY: bool = False
+_HAS_NUMBA: bool = False
+_ACCEL_LOCK = threading.Lock()
+# When and how long the acceleration imports took:
+#   loaded    False until _load_acceleration has run
+#   trigger   "import" or "first_use"
+#   scipy_s / numba_s   import time of each library (bundle install included)
+#   threading_layer     Numba's launched layer ("tbb", "omp", "workqueue") or
+#                       None when no thread-safe layer could be loaded
+#   parallel            False when the prange kernels are bound serial
+_ACCEL_LOAD:    dict[str, Any] = {"loaded": False, "lazy": LAZY_ACCEL}
+_KERNEL_BUNDLE: dict[str, Any] = {}
 
 
 # ---------------------------------------------------------------------------
@@ -87,6 +127,11 @@ class CogValidationError(ValueError):
         self.code    = code
         self.details = details or {}
 
+    def __reduce__(self):
+        # Rebuilt from all three fields when a pool worker (cog_executor)
+        # sends it back to the parent; the default would pass only message.
+        return (type(self), (str(self), self.code, self.details))
+
 
 # ---------------------------------------------------------------------------
 #  Constants
@@ -114,12 +159,33 @@ HIGHER_IS_BETTER: dict[str, bool] = {
 ZONING_PENALTY:       float = 0.35     # subtracted from V when zoning is infeasible
 HAZARD_PENALTY:       float = 0.40     # subtracted from V when hazard_flag is True
 K_NEIGHBOURS:         int   = 30       # nearest neighbours evaluated per ascent step
-M_PER_DEG_LAT:        float = 111_320.0
 
 # Soft barrier parameters — graduated penalty that decays with distance to the
 # nearest hazard/infeasible parcel (rather than the flat hard-stop above).
 HAZARD_DECAY_M:       float = 400.0   # 1/e decay radius in metres
 BARRIER_SOFT_WEIGHT:  float = 0.15    # max contribution of soft penalty to V
+PROXIMITY_CUTOFF:     float = 5.0     # field is 0 beyond this many decay radii
+PROXIMITY_CHUNK:      int   = 1 << 20 # parcel × barrier pairs per fallback chunk
+
+# _score_all runs the fused Numba kernel across threads from this many
+# parcels up; below it thread start-up costs more than the single pass.
+SCORE_PARALLEL_MIN:   int   = 20_000
+
+# Tiled solve (see tiled_discrete_solve) — grid cell edge and the border band
+# of neighbouring-tile parcels each tile's ascent may walk into.
+TILE_SIZE_M:          float = 2_000.0
+TILE_HALO_M:          float = 250.0
+
+# Top-K candidate sites (see distinct_sites) — default minimum spacing
+# between reported sites, and restarts per requested site so each basin is
+# sampled by several seeds.
+SITE_SEPARATION_M:    float = 500.0
+SITE_SEEDS_PER_SITE:  int   = 4
+
+# Bootstrap uncertainty (SolverConfig.uncertainty_mode = "bootstrap") —
+# replicates per solve and the log-normal sigma each weight is jittered by.
+BOOTSTRAP_SAMPLES:      int   = 32
+BOOTSTRAP_WEIGHT_NOISE: float = 0.10
 
 
 # ---------------------------------------------------------------------------
@@ -129,11 +195,13 @@ BARRIER_SOFT_WEIGHT:  float = 0.15    # max contribution of soft penalty to V
 def acceleration_info() -> dict[str, Any]:
     """
     Return a dict describing which optional acceleration backends are active.
+    Loads them first under COG_LAZY_ACCEL.
 
     >>> from cog_solver import acceleration_info
     >>> print(acceleration_info())
     {'scipy_kdtree': True, 'numba_jit': True, 'tier': 1}
     """
+    _load_acceleration()
     tier = 3
     if _HAS_SCIPY:
         tier = 2
@@ -144,21 +212,67 @@ def acceleration_info() -> dict[str, Any]:
         "numba_jit":    _HAS_NUMBA,
         "tier":         tier,
         "tier_label":   {1: "scipy+numba", 2: "scipy", 3: "numpy"}[tier],
+        "kernels":      dict(_KERNEL_BUNDLE, **_KERNEL_LOAD),
+        "imports":      dict(_ACCEL_LOAD),
     }
 
 
+# How warmup_jit obtained the kernels in this process:
+#   source     "precompiled" (every signature loaded from the Numba cache —
+#              the cog_kernels bundle or a warm __pycache__), "jit" (at
+#              least one compiled), "pending" (warmup not finished) or
+#              "unavailable" (no Numba)
+#   load_s     wall time of the first warmup_jit
+#   cache_hits / cache_misses   signatures loaded / compiled
+_KERNEL_LOAD: dict[str, Any] = {"source": "pending"}
+_KERNEL_LOAD_LOCK = threading.Lock()
+
+
 def warmup_jit() -> None:
     """
     Pre-compile Numba kernels so the first real solve request is fast.
-    No-op if Numba is not installed.  Typical compilation time: 1–3 s.
+    No-op if Numba is not installed.  Typical compilation time: 1–3 s;
+    loading a cog_kernels bundle takes a fraction of that.  The first call
+    records its outcome in ``acceleration_info()["kernels"]``.
     """
+    _load_acceleration()
     if not _HAS_NUMBA:
         return
-    _dV   = np.ones(8, dtype=np.float64)
-    _dpos = np.zeros((8, 2), dtype=np.float64)
+    with _KERNEL_LOAD_LOCK:
+        t0 = time.perf_counter()
+        _warmup_kernels()
+        if _KERNEL_LOAD["source"] != "pending":
+            return
+        kernels = {id(k): k for k in (
+            _discrete_solve_core, _discrete_solve_multi, _discrete_solve_serial,
+            _score_fused, _score_fused_parallel, _bootstrap_multi,
+        )}.values()                        # serial fallback aliases some
+        hits   = sum(sum(k.stats.cache_hits.values()) for k in kernels)
+        misses = sum(sum(k.stats.cache_misses.values()) for k in kernels)
+        _KERNEL_LOAD.update(
+            source="precompiled" if hits and not misses else "jit",
+            load_s=round(time.perf_counter() - t0, 3),
+            cache_hits=hits, cache_misses=misses,
+        )
+
+
+def _warmup_kernels() -> None:
+    """Call every kernel once per signature the solver uses."""
+    _dpos = np.zeros((8, 2), dtype=np.float64)            # metre positions
     _dnb  = np.arange(24, dtype=np.int64).reshape(8, 3) % 8
     _dmsk = np.ones(8, dtype=np.bool_)
-    _discrete_solve_core(_dV, _dpos, _dnb, _dmsk, 3, M_PER_DEG_LAT, 0, 4)
+    for dtype in (np.float64, np.float32):     # default and use_float32 V
+        _dV = np.ones(8, dtype=dtype)
+        _discrete_solve_core(_dV, _dpos, _dnb, _dmsk, 3, 0, 4)
+        for kernel in (_discrete_solve_multi, _discrete_solve_serial):
+            kernel(_dV, _dpos, _dnb, _dmsk, 3, np.array([0, 4], dtype=np.int64), 4)
+        _dN = np.ones((8, 5), dtype=dtype)
+        for kernel in (_score_fused, _score_fused_parallel):
+            kernel(_dN, np.ones(5, dtype=dtype), _dmsk, ~_dmsk, _dV,
+                   ZONING_PENALTY, HAZARD_PENALTY, BARRIER_SOFT_WEIGHT,
+                   np.empty(8, dtype=dtype))
+        _bootstrap_multi(np.ones((2, 8), dtype=dtype), _dpos, _dnb, _dmsk, 3,
+                         np.zeros((2, 2), dtype=np.int64), 4)
 
 
 # ---------------------------------------------------------------------------
@@ -233,7 +347,7 @@ class Parcel:
 
     ``metrics`` holds raw values keyed by the canonical metric name
     (rental_yield, price_per_m2, vacancy, transit_score, footfall_score).
-    After normalisation these values are replaced in place with [0, 1] floats.
+    They stay raw unless a QuantileNormaliser is run with write_back=True.
     """
     id:          int
     lat:         float
@@ -294,16 +408,39 @@ class SolverConfig:
     # ── Soft barrier field ───────────────────────────────────────────────
     hazard_decay_m:      float = HAZARD_DECAY_M
     barrier_soft_weight: float = BARRIER_SOFT_WEIGHT
+    proximity_cutoff:    float = PROXIMITY_CUTOFF
     # Each non-hazard parcel receives a proximity penalty proportional to
     # exp(-d / hazard_decay_m) where d is the distance to the nearest
     # hazard/infeasible parcel.  Creates a smooth repulsion field that
     # deflects trajectories away from barrier zones before they reach them.
+    # Beyond proximity_cutoff × hazard_decay_m (exp(-5) ≈ 0.007 at the
+    # default) the penalty is taken as 0, so only parcels near a barrier are
+    # evaluated.  0 → exact field with no cut-off.
+
+    # ── Uncertainty ──────────────────────────────────────────────────────
+    uncertainty_mode:       str   = "bottom"
+    bootstrap_samples:      int   = BOOTSTRAP_SAMPLES
+    bootstrap_weight_noise: float = BOOTSTRAP_WEIGHT_NOISE
+    # "bottom"    — confidence_ellipse: where the lowest-V parcels lie
+    #               relative to the solution (cheap, the original output).
+    # "bootstrap" — bootstrap_uncertainty: spread of the solution itself
+    #               across bootstrap_samples re-solves with jittered weights
+    #               and resampled seeds, run as one batch over the shared
+    #               neighbour index.  Not used by solve_tiled.
 
     # ── Performance options ──────────────────────────────────────────────
     use_float32: bool = False
-    # Store normed metrics as float32 instead of float64.  Halves the
-    # matrix memory footprint and speeds up the matmul on SIMD hardware.
-    # Only beneficial for N > 5 000; leave False for normal production use.
+    # Normalise, score and ascend in float32 instead of float64: the normed
+    # matrix, the matmul, V, the proximity field and the Numba kernel all
+    # stay float32.  Halves their memory footprint and speeds up the matmul
+    # on SIMD hardware.  Only beneficial for N > 5 000; leave False for
+    # normal production use (``python bench_cog.py float32`` reports the
+    # landing / potential agreement and the speed and memory difference).
+
+
+# Progress callback for long solves: (stage, done, total, iterations so far)
+# where stage is "seeds" (restarts), "tiles" or "profiles".
+ProgressFn = Callable[[str, int, int, int], None]
 
 
 @dataclass
@@ -316,6 +453,14 @@ class CogResult:
     potential:   float              # normalised V of the solution in [0, 1]
     feasible:    bool
     parcels:     list[dict[str, Any]]
+    # Per-parcel arrays behind ``parcels`` — ids, latlng, scores (normalised
+    # [0, 1]), feasible, zoning_idx, zoning_vocab — for columnar / binary
+    # encoders (see cog_payload.parcel_columns).
+    parcel_arrays: "dict[str, Any] | None" = None
+    # Per-tile local optima — only set by CentreOfGravitySolver.solve_tiled.
+    tiles: "list[dict[str, Any]] | None" = None
+    # Distinct candidate sites, best first — only set by solve(top_k=...).
+    sites: "list[dict[str, Any]] | None" = None
 
 
 # ---------------------------------------------------------------------------
@@ -329,61 +474,202 @@ class QuantileNormaliser:
       2. Scale linearly to [0, 1].
       3. Flip lower-is-better metrics so 1.0 always means "most desirable".
 
-    ``fit_transform`` modifies ``parcel.metrics`` in place AND returns an
-    (N, F) float64 matrix for fast downstream vectorised operations.
+    Fitting and transforming are separate steps so fitted bounds can be
+    reused on cache hits, re-solves and newly ingested parcels:
+
+      fit(data)            learn lo_ / hi_ (p5 / p95) and median_ per column
+      partial_fit(data)    fold a new batch into the fitted bounds
+      transform(data)      apply the fitted bounds — no percentile work
+      fit_transform(data)  fit + transform (the original one-shot path)
+
+    ``data`` is either a list of Parcel objects or a pre-built (N, F) array
+    whose columns follow ``metric_keys``.  Every path returns an (N, F)
+    float64 matrix (``transform`` / ``fit_transform`` take ``dtype=`` to
+    write float32 directly).  Normalised values are written back into
+    ``parcel.metrics`` only when ``write_back=True``; by default the Parcel
+    objects are left untouched.
+
+    ``to_state()`` / ``from_state()`` round-trip the fitted bounds through
+    a JSON-serialisable dict.
     """
 
-    def __init__(self, metric_keys: list[str]) -> None:
-        self.metric_keys = metric_keys
-        self.lo_: dict[str, float] = {}
-        self.hi_: dict[str, float] = {}
+    def __init__(self, metric_keys: list[str], write_back: bool = False) -> None:
+        self.metric_keys = list(metric_keys)
+        self.write_back  = write_back
+        self.lo_:     dict[str, float] = {}
+        self.hi_:     dict[str, float] = {}
+        self.median_: dict[str, float] = {}   # NaN imputation value; NaN = column never observed
+        self.n_seen_: int = 0
+
+    # ── State ──────────────────────────────────────────────────────────
 
-    def fit_transform(self, parcels: list[Parcel]) -> np.ndarray:
-        keys   = self.metric_keys
-        N, F   = len(parcels), len(keys)
+    @property
+    def is_fitted(self) -> bool:
+        return bool(self.lo_) and all(k in self.lo_ for k in self.metric_keys)
+
+    def to_state(self) -> dict[str, Any]:
+        """JSON-serialisable fitted state (NaN medians are stored as None)."""
+        return {
+            "metric_keys": list(self.metric_keys),
+            "lo":          dict(self.lo_),
+            "hi":          dict(self.hi_),
+            "median":      {
+                k: (None if math.isnan(v) else v) for k, v in self.median_.items()
+            },
+            "n_seen":      self.n_seen_,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any], write_back: bool = False) -> "QuantileNormaliser":
+        norm = cls(state["metric_keys"], write_back=write_back)
+        norm.lo_     = {k: float(v) for k, v in state["lo"].items()}
+        norm.hi_     = {k: float(v) for k, v in state["hi"].items()}
+        norm.median_ = {
+            k: (math.nan if v is None else float(v))
+            for k, v in state["median"].items()
+        }
+        norm.n_seen_ = int(state.get("n_seen", 0))
+        return norm
+
+    # ── Fitting ────────────────────────────────────────────────────────
+
+    def _as_matrix(self, data: "list[Parcel] | np.ndarray") -> np.ndarray:
+        """Return the raw (N, F) float64 matrix for ``data``."""
+        if isinstance(data, np.ndarray):
+            if data.ndim != 2 or data.shape[1] != len(self.metric_keys):
+                raise ValueError(
+                    f"expected an (N, {len(self.metric_keys)}) metric matrix, "
+                    f"got shape {data.shape}"
+                )
+            return data.astype(np.float64, copy=False)
 
         # ── Vectorised NaN-safe extraction ─────────────────────────────
         # Single list comprehension builds (N, F) in one numpy call;
         # ~8-10× faster than a nested Python double-loop for N > 500.
-        raw = np.array(
-            [[_to_float_nan(p.metrics.get(k)) for k in keys] for p in parcels],
+        keys = self.metric_keys
+        return np.array(
+            [[_to_float_nan(p.metrics.get(k)) for k in keys] for p in data],
             dtype=np.float64,
-        )
+        ).reshape(len(data), len(keys))
 
-        normed = np.zeros_like(raw)
+    def _column_bounds(self, raw: np.ndarray) -> dict[str, tuple[float, float, float]]:
+        """Per-column (lo, hi, median) of one batch; all-NaN → (0, 1, NaN)."""
+        bounds: dict[str, tuple[float, float, float]] = {}
         for fi, key in enumerate(self.metric_keys):
             col      = raw[:, fi]
             nan_mask = np.isnan(col)
 
             if nan_mask.all():
-                # Every parcel is missing this metric — use neutral 0.5
-                normed[:, fi] = 0.5
-                self.lo_[key] = 0.0
-                self.hi_[key] = 1.0
+                # Every parcel is missing this metric — neutral 0.5 on transform
+                bounds[key] = (0.0, 1.0, math.nan)
                 continue
 
-            # Impute NaN cells with the column median before clipping/scaling
+            # Impute NaN cells with the column median before taking percentiles
+            median = float(np.nanmedian(col))
             if nan_mask.any():
                 col = col.copy()
-                col[nan_mask] = float(np.nanmedian(col))
-
-            lo   = float(np.nanpercentile(col, 5))
-            hi   = float(np.nanpercentile(col, 95))
-            span = (hi - lo) if (hi - lo) > 1e-9 else 1.0
-            self.lo_[key] = lo
-            self.hi_[key] = hi
-            scaled = (np.clip(col, lo, hi) - lo) / span    # -> [0, 1]
+                col[nan_mask] = median
+
+            bounds[key] = (
+                float(np.percentile(col, 5)),
+                float(np.percentile(col, 95)),
+                median,
+            )
+        return bounds
+
+    def fit(self, data: "list[Parcel] | np.ndarray") -> "QuantileNormaliser":
+        raw = self._as_matrix(data)
+        for key, (lo, hi, med) in self._column_bounds(raw).items():
+            self.lo_[key], self.hi_[key], self.median_[key] = lo, hi, med
+        self.n_seen_ = int(raw.shape[0])
+        return self
+
+    def partial_fit(self, data: "list[Parcel] | np.ndarray") -> "QuantileNormaliser":
+        """
+        Fold a new batch into the fitted bounds without revisiting old rows.
+
+        Bounds and medians are merged as a count-weighted mean of the fitted
+        and batch estimates — an approximation of the true p5/p95 of the
+        union that needs only the serialisable state.  Columns not yet
+        observed take the batch values directly.
+        """
+        if not self.is_fitted:
+            return self.fit(data)
+
+        raw = self._as_matrix(data)
+        n_b = int(raw.shape[0])
+        if n_b == 0:
+            return self
+        n_a = self.n_seen_
+        wa, wb = n_a / (n_a + n_b), n_b / (n_a + n_b)
+
+        for key, (lo, hi, med) in self._column_bounds(raw).items():
+            if math.isnan(med):
+                continue                                # batch adds no information
+            if math.isnan(self.median_[key]):
+                self.lo_[key], self.hi_[key], self.median_[key] = lo, hi, med
+                continue
+            self.lo_[key]     = wa * self.lo_[key]     + wb * lo
+            self.hi_[key]     = wa * self.hi_[key]     + wb * hi
+            self.median_[key] = wa * self.median_[key] + wb * med
+        self.n_seen_ = n_a + n_b
+        return self
+
+    # ── Transforming ───────────────────────────────────────────────────
+
+    def transform(
+        self,
+        data: "list[Parcel] | np.ndarray",
+        write_back: "bool | None" = None,
+        dtype: Any = np.float64,
+    ) -> np.ndarray:
+        if not self.is_fitted:
+            raise ValueError("QuantileNormaliser.transform called before fit")
+
+        raw    = self._as_matrix(data)
+        normed = np.empty(raw.shape, dtype=dtype)
+        for fi, key in enumerate(self.metric_keys):
+            med = self.median_[key]
+            if math.isnan(med):
+                normed[:, fi] = 0.5
+                continue
+
+            col = normed[:, fi]
+            np.copyto(col, raw[:, fi])
+            col[np.isnan(col)] = med
+            lo, hi = self.lo_[key], self.hi_[key]
+            span   = (hi - lo) if (hi - lo) > 1e-9 else 1.0
+            np.clip(col, lo, hi, out=col)
+            col -= lo
+            col /= span                                   # -> [0, 1]
             if not HIGHER_IS_BETTER.get(key, True):
-                scaled = 1.0 - scaled                       # flip
-            normed[:, fi] = scaled
+                np.subtract(1.0, col, out=col)            # flip
 
-        # Write normalised values back into each Parcel for transparency
-        for ni, p in enumerate(parcels):
-            for fi, key in enumerate(self.metric_keys):
-                p.metrics[key] = float(normed[ni, fi])
+        if write_back if write_back is not None else self.write_back:
+            self._write_back(data, normed)
+        return normed
 
+    def fit_transform(
+        self,
+        data: "list[Parcel] | np.ndarray",
+        write_back: "bool | None" = None,
+        dtype: Any = np.float64,
+    ) -> np.ndarray:
+        raw = self._as_matrix(data)
+        self.fit(raw)
+        normed = self.transform(raw, write_back=False, dtype=dtype)
+        if write_back if write_back is not None else self.write_back:
+            self._write_back(data, normed)
         return normed
 
+    def _write_back(self, data: "list[Parcel] | np.ndarray", normed: np.ndarray) -> None:
+        """Opt-in: copy normalised values into each ``parcel.metrics``."""
+        if isinstance(data, np.ndarray):
+            raise ValueError("write_back requires a list of Parcel objects")
+        for ni, p in enumerate(data):
+            for fi, key in enumerate(self.metric_keys):
+                p.metrics[key] = float(normed[ni, fi])
+
 
 # ---------------------------------------------------------------------------
 #  Step 3 — Hybrid potential function
@@ -412,6 +698,56 @@ def hybrid_potential(
     return v
 
 
+# ── Fused scoring kernel (Numba tier) ───────────────────────────────────────
+# One pass over the rows: dot product, NaN/inf clean-up and the three
+# penalty terms per parcel, written straight into ``out``.  The operations
+# and their order match the NumPy path below; only the dot product's
+# summation order differs (≈ 1 ulp).  No fastmath — it would let LLVM
+# assume the NaN checks away.
+
+def _score_fused_py(
+    normed:        np.ndarray,   # (N, F)  float64 | float32
+    weight_vec:    np.ndarray,   # (F,)    same dtype
+    feasible_mask: np.ndarray,   # (N,)    bool
+    hazard_mask:   np.ndarray,   # (N,)    bool
+    proximity:     np.ndarray,   # (N,) or (0,) when there is no field
+    zoning_penalty: float,
+    hazard_penalty: float,
+    soft_weight:   float,
+    out:           np.ndarray,   # (N,)    same dtype — V
+) -> None:
+    """
+    Numba tier of ``_score_all``: V for all N parcels in a single pass.
+
+    Each row accumulates its dot product in float64, maps NaN → 0 and
+    ±inf → ±1 (as ``np.nan_to_num`` does), subtracts the zoning, hazard and
+    soft barrier terms, and is stored once.  Rows are independent, so the
+    ``parallel=True`` build splits them across threads with no reduction.
+    """
+    N, F     = normed.shape
+    has_prox = proximity.shape[0] > 0
+    for j in _numba.prange(N):
+        v = 0.0
+        for f in range(F):
+            v += normed[j, f] * weight_vec[f]
+        if math.isnan(v):
+            v = 0.0
+        elif math.isinf(v):
+            v = 1.0 if v > 0 else -1.0
+        if not feasible_mask[j]:
+            v -= zoning_penalty
+        if hazard_mask[j]:
+            v -= hazard_penalty
+        if has_prox:
+            v -= soft_weight * proximity[j]
+        out[j] = v
+
+
+# Bound by _bind_numba_kernels; _score_all only calls them when _HAS_NUMBA.
+_score_fused:          Any = None
+_score_fused_parallel: Any = None
+
+
 def _score_all(
     normed: np.ndarray,
     weight_vec: np.ndarray,
@@ -421,30 +757,94 @@ def _score_all(
     proximity_field: "np.ndarray | None" = None,
 ) -> np.ndarray:
     """
-    Vectorised hybrid_potential for all N parcels.  Returns (N,) float64.
+    Vectorised hybrid_potential for all N parcels.  Returns (N,) in the
+    dtype of ``normed`` — float32 under ``cfg.use_float32``, else float64.
+
+    The weights are cast to that dtype rather than ``normed`` promoted, so
+    the float32 mode keeps the matmul, V and the penalty updates in float32
+    with no (N, F) copy.  BLAS overflow / NaN is mapped to finite values.
 
-    Always promotes inputs to float64 before the matmul to prevent BLAS
-    overflow / NaN warnings when the caller supplies float32 arrays.
+    With Numba, V comes from the fused single-pass ``_score_fused`` kernel
+    (threaded from SCORE_PARALLEL_MIN parcels).  Otherwise the matmul
+    allocates V and every later step updates it in place; the only
+    temporaries are the inverted feasibility mask (1 byte per parcel) and
+    the scaled proximity term.
 
     ``proximity_field`` (N,)  — optional precomputed soft barrier penalties.
     Each value is the distance-decayed proximity to the nearest
     hazard/infeasible parcel, scaled to [0, 1].  Multiplied by
     cfg.barrier_soft_weight and subtracted from the raw score.
     """
-    n64 = normed.astype(np.float64)
-    w64 = weight_vec.astype(np.float64)
+    _load_acceleration()
+    dtype  = _score_dtype(normed)
+    normed = np.asarray(normed, dtype=dtype)      # base ndarray view of a memmap
+    w = weight_vec.astype(dtype, copy=False)
+
+    if _HAS_NUMBA:
+        v = np.empty(normed.shape[0], dtype=dtype)
+        prox = (
+            np.asarray(proximity_field, dtype=dtype) if proximity_field is not None
+            else np.empty(0, dtype=dtype)
+        )
+        kernel = (
+            _score_fused_parallel if normed.shape[0] >= SCORE_PARALLEL_MIN
+            else _score_fused
+        )
+        kernel(
+            np.ascontiguousarray(normed), np.ascontiguousarray(w),
+            np.asarray(feasible_mask, dtype=np.bool_),
+            np.asarray(hazard_mask, dtype=np.bool_), prox,
+            float(cfg.zoning_penalty), float(cfg.hazard_penalty),
+            float(cfg.barrier_soft_weight), v,
+        )
+        return v
+
     with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
-        v = (n64 @ w64).copy()
+        v = normed @ w
     np.nan_to_num(v, copy=False, nan=0.0, posinf=1.0, neginf=-1.0)
-    v[~feasible_mask] -= cfg.zoning_penalty
-    v[hazard_mask]    -= cfg.hazard_penalty
+    np.subtract(v, cfg.zoning_penalty, out=v, where=~feasible_mask)
+    np.subtract(v, cfg.hazard_penalty, out=v, where=hazard_mask)
     if proximity_field is not None:
         # Graduated soft repulsion — decays with distance so parcels far
         # from any barrier zone are minimally penalised.
-        v -= cfg.barrier_soft_weight * proximity_field
+        v -= dtype.type(cfg.barrier_soft_weight) * proximity_field.astype(dtype, copy=False)
     return v
 
 
+def _score_batch(
+    normed: np.ndarray,
+    weight_mat: np.ndarray,
+    feasible_mask: np.ndarray,
+    hazard_mask: np.ndarray,
+    cfg: SolverConfig,
+    proximity_field: "np.ndarray | None" = None,
+) -> np.ndarray:
+    """
+    Multi-profile ``_score_all``.  Returns (N, P) in the dtype of ``normed``.
+
+    ``weight_mat`` is (F, P) — one normalised weight column per investor
+    profile — so every profile is scored by a single (N,F)@(F,P) matmul.
+    The penalty terms do not depend on the weights and are broadcast across
+    all P columns.
+    """
+    dtype = _score_dtype(normed)
+    w = weight_mat.astype(dtype, copy=False)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        V = normed.astype(dtype, copy=False) @ w         # (N, P)
+    np.nan_to_num(V, copy=False, nan=0.0, posinf=1.0, neginf=-1.0)
+    penalty = np.where(feasible_mask, 0.0, cfg.zoning_penalty)
+    penalty = penalty + np.where(hazard_mask, cfg.hazard_penalty, 0.0)
+    if proximity_field is not None:
+        penalty = penalty + cfg.barrier_soft_weight * proximity_field
+    V -= penalty.astype(dtype, copy=False)[:, None]
+    return V
+
+
+def _score_dtype(normed: np.ndarray) -> np.dtype:
+    """float32 for float32 input (SolverConfig.use_float32), else float64."""
+    return np.dtype(np.float32 if normed.dtype == np.float32 else np.float64)
+
+
 # ---------------------------------------------------------------------------
 #  Soft barrier proximity field
 # ---------------------------------------------------------------------------
@@ -454,6 +854,9 @@ def _compute_proximity_field(
     hazard_mask: np.ndarray,   # (N,)    bool
     feasible_mask: np.ndarray, # (N,)    bool
     decay_m: float,            # 1/e decay distance in metres
+    pos_m: "np.ndarray | None" = None,   # (N, 2) metre projection, if cached
+    cutoff: float = PROXIMITY_CUTOFF,    # in decay radii; 0 → no cut-off
+    dtype: Any = np.float64,             # float32 under cfg.use_float32
 ) -> np.ndarray:
     """
     Pre-compute a soft repulsion penalty for every parcel based on its
@@ -462,40 +865,64 @@ def _compute_proximity_field(
     Returns a (N,) array where each value is in [0, 1]:
         penalty[j] = exp( -dist_to_nearest_barrier_m / decay_m )
 
-    Parcels far from any barrier receive ≈ 0 (no penalty).
+    Parcels far from any barrier receive ≈ 0 (no penalty); beyond
+    ``cutoff × decay_m`` exactly 0.
     Parcels immediately adjacent to a barrier receive ≈ 1 (full weight).
 
     Multiplied by ``cfg.barrier_soft_weight`` in ``_score_all``.
 
     Strategy
     --------
-    scipy available  — KD-tree query on metre-projected coords.  O(N log B)
-                       where B = number of barrier parcels.
-    scipy missing    — O(N × B) pairwise, only practical for small datasets.
+    scipy available  — KD-tree query on metre-projected coords with
+                       ``distance_upper_bound`` = cut-off radius, so the
+                       search for a parcel far from every barrier stops at
+                       the first pruned node.  O(N log B) worst case, where
+                       B = number of barrier parcels.
+    scipy missing    — pairwise distances in chunks of parcels, at most
+                       PROXIMITY_CHUNK parcel × barrier pairs at a time;
+                       chunks whose bounding box lies beyond the cut-off of
+                       every barrier are skipped.
     """
+    _load_acceleration()
     N = positions.shape[0]
-    penalties = np.zeros(N, dtype=np.float64)
+    penalties = np.zeros(N, dtype=dtype)
     decay_m   = max(decay_m, 1.0)
+    radius_m  = cutoff * decay_m if cutoff > 0 else np.inf
 
     barrier_idx = np.where(hazard_mask | (~feasible_mask))[0]
     if len(barrier_idx) == 0:
         return penalties  # no barriers → no proximity penalty
 
     # Project to approximate metres for distance calculation
-    lat_rad       = math.radians(float(np.mean(positions[:, 0])))
-    m_per_deg_lng = M_PER_DEG_LAT * math.cos(lat_rad)
-    scale         = np.array([M_PER_DEG_LAT, m_per_deg_lng], dtype=np.float64)
-    pos_m         = positions * scale
+    if pos_m is None:
+        pos_m = project(positions)
+    barrier_m = pos_m[barrier_idx]                       # (B, 2)
 
     if _HAS_SCIPY:
-        tree   = _KDTree(pos_m[barrier_idx])
-        dists, _ = tree.query(pos_m, k=1, workers=-1)   # (N,) in metres
-        penalties = np.exp(-dists / decay_m)
+        tree   = _KDTree(barrier_m)
+        dists, _ = tree.query(pos_m, k=1, distance_upper_bound=radius_m,
+                              workers=-1)                # (N,) m; inf = beyond
     else:
-        barrier_m = pos_m[barrier_idx]                   # (B, 2)
-        diff  = pos_m[:, None, :] - barrier_m[None, :, :]  # (N, B, 2)
-        dists = np.sqrt((diff ** 2).sum(axis=2)).min(axis=1)   # (N,)
-        penalties = np.exp(-dists / decay_m)
+        dists = np.full(N, np.inf)
+        step  = max(1, PROXIMITY_CHUNK // len(barrier_idx))
+        for lo in range(0, N, step):
+            chunk = pos_m[lo:lo + step]                  # (C, 2)
+            b = barrier_m
+            if np.isfinite(radius_m):
+                near = np.all(
+                    (b >= chunk.min(axis=0) - radius_m)
+                    & (b <= chunk.max(axis=0) + radius_m), axis=1,
+                )
+                b = b[near]
+                if len(b) == 0:
+                    continue
+            dx = chunk[:, 0, None] - b[None, :, 0]       # (C, B')
+            dy = chunk[:, 1, None] - b[None, :, 1]
+            dists[lo:lo + step] = np.sqrt((dx * dx + dy * dy).min(axis=1))
+        dists[dists > radius_m] = np.inf
+
+    near = np.isfinite(dists)
+    penalties[near] = np.exp(-dists[near] / decay_m)
 
     # Parcels that ARE barriers already carry hard penalties; zero out their
     # soft field so we don't double-penalise them.
@@ -507,32 +934,74 @@ def _compute_proximity_field(
 #  Step 4 — Discrete k-NN solver
 # ---------------------------------------------------------------------------
 
-def _build_neighbour_index(positions: np.ndarray, k: int) -> np.ndarray:
+def nearest_parcels(
+    positions: np.ndarray,     # (N, 2)  lat/lng
+    points: np.ndarray,        # (M, 2)  lat/lng to snap
+    pos_m: "np.ndarray | None" = None,
+    tree: Any = None,
+) -> np.ndarray:
+    """
+    Index of the parcel nearest each of ``points`` — e.g. a previous
+    result's lat/lng, for ``discrete_solve(warm_start=...)``.  ``points``
+    are projected about the parcels' mean latitude, like ``pos_m``.
+    Returns an (M,) int64 array.
+    """
+    _load_acceleration()
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int64)
+    if pos_m is None:
+        pos_m = project(positions)
+    pts_m = project(points, reference_lat(positions))
+    if tree is None and _HAS_SCIPY:
+        tree = _KDTree(pos_m)
+    if tree is not None:
+        return np.asarray(tree.query(pts_m, k=1)[1], dtype=np.int64)
+    d2 = ((pts_m[:, None, :] - pos_m[None, :, :]) ** 2).sum(axis=2)   # (M, N)
+    return np.argmin(d2, axis=1).astype(np.int64)
+
+
+def _build_kdtree(pos_m: np.ndarray) -> Any:
+    """KD-tree over metre-projected positions, or None without scipy."""
+    _load_acceleration()
+    return _KDTree(pos_m) if _HAS_SCIPY else None
+
+
+def _build_neighbour_index(
+    positions: np.ndarray,
+    k: int,
+    pos_m: "np.ndarray | None" = None,
+    tree: Any = None,
+) -> np.ndarray:
     """
     Return an (N, k) int64 array of per-parcel nearest-neighbour indices
     (self excluded), sorted nearest-first.
 
+    Because rows are sorted nearest-first, ``nb[:, :k2]`` for any k2 ≤ k is
+    exactly the k2-neighbour index — callers holding a wide index slice it
+    rather than calling this again.
+
     Strategy
     --------
     scipy available  — builds a KD-tree on metre-projected coordinates;
                        O(N log N) build + O(k log N) query per parcel.
-                       Handles N = 50 000 comfortably.
+                       Handles N = 50 000 comfortably.  ``pos_m`` / ``tree``
+                       (see ParcelCacheEntry) skip the projection / build.
     scipy missing    — O(N²) sum-of-squares identity; allocates an (N, N)
                        float64 matrix (200 MB at N = 5 000) so use only
                        for N ≤ 2 000.
     """
+    _load_acceleration()
     N = positions.shape[0]
     k = min(k, N - 1)
 
     if _HAS_SCIPY:
         # Project lat/lng → approximate metres so KD-tree distances are
         # physically meaningful (equal-area approximation).
-        lat_rad       = math.radians(float(np.mean(positions[:, 0])))
-        m_per_deg_lng = M_PER_DEG_LAT * math.cos(lat_rad)
-        scale         = np.array([M_PER_DEG_LAT, m_per_deg_lng], dtype=np.float64)
-        pos_m         = positions * scale          # (N, 2)  in metres
-
-        tree = _KDTree(pos_m)
+        if pos_m is None:
+            pos_m = project(positions)  # (N, 2)  in metres
+        if tree is None:
+            tree = _KDTree(pos_m)
         # query returns (distances, indices); column 0 is the point itself
         _, idx = tree.query(pos_m, k=k + 1, workers=-1)
         return idx[:, 1:].astype(np.int64)         # drop self → (N, k)
@@ -550,12 +1019,11 @@ def _build_neighbour_index(positions: np.ndarray, k: int) -> np.ndarray:
 # without boxing.
 
 def _discrete_solve_core_py(
-    V:             np.ndarray,   # (N,)    float64  — scored potentials
-    positions:     np.ndarray,   # (N, 2)  float64  — lat/lng
+    V:             np.ndarray,   # (N,)    float64 | float32 — scored potentials
+    pos_m:         np.ndarray,   # (N, 2)  float64  — metre projection
     nb:            np.ndarray,   # (N, k)  int64    — neighbour indices
     feasible_mask: np.ndarray,   # (N,)    bool     — zoning feasibility
     max_iter:      int,
-    m_per_deg_lat: float,
     start:         int,          # explicit starting parcel index
     tabu_size:     int,          # circular tabu buffer length (0 = disabled)
 ) -> tuple[int, int, bool, float]:
@@ -638,9 +1106,9 @@ def _discrete_solve_core_py(
             converged = True
             break
 
-        dlat       = positions[move_to, 0] - positions[current, 0]
-        dlng       = positions[move_to, 1] - positions[current, 1]
-        last_delta = math.sqrt(dlat * dlat + dlng * dlng) * m_per_deg_lat
+        dy         = pos_m[move_to, 0] - pos_m[current, 0]
+        dx         = pos_m[move_to, 1] - pos_m[current, 1]
+        last_delta = math.sqrt(dy * dy + dx * dx)
         iterations = t + 1
 
         if move_to == current:
@@ -658,13 +1126,325 @@ def _discrete_solve_core_py(
 
 
 
-# JIT-compile if Numba is present; fall back transparently otherwise.
-if _HAS_NUMBA:
+# JIT-compiled by _bind_numba_kernels if Numba is present; the plain Python
+# function is the fallback.
+_discrete_solve_core = _discrete_solve_core_py
+
+
+# ── Multi-seed kernels ──────────────────────────────────────────────────────
+# Every restart is advanced by one call instead of a Python loop per seed.
+# Both tiers return (landing_idx, iterations, converged, last_delta_m), each
+# an (R,) array aligned with ``seeds``, and match _discrete_solve_core_py
+# seed-for-seed.
+
+def _discrete_solve_multi_numba_py(
+    V:             np.ndarray,   # (N,)    float64 | float32
+    pos_m:         np.ndarray,   # (N, 2)  float64
+    nb:            np.ndarray,   # (N, k)  int64
+    feasible_mask: np.ndarray,   # (N,)    bool
+    max_iter:      int,
+    seeds:         np.ndarray,   # (R,)    int64
+    tabu_size:     int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Numba tier: ``prange`` over seeds, each running the compiled single-start
+    kernel on its own thread.  Restarts are independent, so no reduction is
+    needed until the caller picks the best landing.
+    """
+    R          = seeds.shape[0]
+    landing    = np.empty(R, dtype=np.int64)
+    iterations = np.empty(R, dtype=np.int64)
+    converged  = np.empty(R, dtype=np.bool_)
+    last_delta = np.empty(R, dtype=np.float64)
+    for r in _numba.prange(R):
+        idx, it, cv, d = _discrete_solve_core(
+            V, pos_m, nb, feasible_mask,
+            max_iter, seeds[r], tabu_size,
+        )
+        landing[r]    = idx
+        iterations[r] = it
+        converged[r]  = cv
+        last_delta[r] = d
+    return landing, iterations, converged, last_delta
+
+
+def _lockstep_ascent(
+    V_rows:        np.ndarray,   # (B, N)  float64 | float32
+    walker_row:    np.ndarray,   # (R,)    int64 — row of V_rows each walker reads
+    pos_m:         np.ndarray,   # (N, 2)  float64
+    nb:            np.ndarray,   # (N, k)  int64
+    max_iter:      int,
+    seeds:         np.ndarray,   # (R,)    int64
+    tabu_size:     int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pure-NumPy multi-walker ascent shared by the multi-seed and bootstrap
+    tiers: all walkers advance in lockstep, walker r scoring against
+    ``V_rows[walker_row[r]]``.
+
+    Each step gathers ``V[nb[current]]`` as an (A, k) block for the A still
+    active walkers and applies the same four move cases as the scalar
+    kernel with whole-array operations; the tabu test is one (A, k, T)
+    broadcast comparison.  Python-level work is O(max_iter), not
+    O(max_iter × R).
+    """
+    R          = seeds.shape[0]
+    current    = seeds.astype(np.int64).copy()
+    iterations = np.zeros(R, dtype=np.int64)
+    converged  = np.zeros(R, dtype=np.bool_)
+    last_delta = np.zeros(R, dtype=np.float64)
+    tabu_buf   = np.full((R, max(tabu_size, 1)), -1, dtype=np.int64)
+    tabu_ptr   = np.zeros(R, dtype=np.int64)
+    active     = np.arange(R)
+
+    for t in range(max_iter):
+        if active.size == 0:
+            break
+        cur  = current[active]
+        vrow = walker_row[active]
+        cand = nb[cur]                                   # (A, k)
+        vc   = V_rows[vrow[:, None], cand]               # (A, k)
+        rows = np.arange(active.size)
+
+        any_col    = np.argmax(vc, axis=1)               # first max, as scalar
+        best_any_v = vc[rows, any_col]
+        best_any   = cand[rows, any_col]
+
+        if tabu_size > 0:
+            in_tabu = (cand[:, :, None] == tabu_buf[active][:, None, :tabu_size]).any(axis=2)
+            vc_nt   = np.where(in_tabu, -np.inf, vc)
+            has_nt  = ~in_tabu.all(axis=1)
+        else:
+            vc_nt   = vc
+            has_nt  = np.ones(active.size, dtype=np.bool_)
+        nt_col    = np.argmax(vc_nt, axis=1)
+        best_nt_v = vc_nt[rows, nt_col]
+        best_nt   = cand[rows, nt_col]
+
+        v_curr = V_rows[vrow, cur]
+        case1  = has_nt & (best_nt_v > v_curr)            # improving non-tabu
+        case2  = ~case1 & (best_any_v > v_curr)           # aspiration
+        case3  = ~case1 & ~case2 & has_nt                 # lateral plateau move
+        stuck  = ~(case1 | case2 | case3)
+
+        converged[active[stuck]] = True
+        moving  = ~stuck
+        move_to = np.where(case2, best_any, best_nt)[moving]
+        mv      = active[moving]
+        frm     = cur[moving]
+
+        d = pos_m[move_to] - pos_m[frm]
+        last_delta[mv] = np.sqrt((d * d).sum(axis=1))
+        iterations[mv] = t + 1
+
+        same = move_to == frm
+        converged[mv[same]] = True
+
+        step = ~same
+        mv_s = mv[step]
+        if tabu_size > 0 and mv_s.size:
+            tabu_buf[mv_s, tabu_ptr[mv_s] % tabu_size] = frm[step]
+            tabu_ptr[mv_s] += 1
+        current[mv_s] = move_to[step]
+        active = mv_s
+
+    return current, iterations, converged, last_delta
+
+
+def _discrete_solve_multi_numpy(
+    V:             np.ndarray,
+    pos_m:         np.ndarray,
+    nb:            np.ndarray,
+    feasible_mask: np.ndarray,
+    max_iter:      int,
+    seeds:         np.ndarray,
+    tabu_size:     int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pure-NumPy tier: every seed in one ``_lockstep_ascent`` over a single V."""
+    return _lockstep_ascent(
+        V[None, :], np.zeros(seeds.shape[0], dtype=np.int64),
+        pos_m, nb, max_iter, seeds, tabu_size,
+    )
+
+
+_discrete_solve_multi = _discrete_solve_multi_numpy     # see _bind_numba_kernels
+# Same contract, never parallel: a compiled loop over the single-start
+# kernel (Numba) or the NumPy tier.  Used where solves already run on
+# several threads (tiled_discrete_solve) so no prange kernel is launched
+# concurrently.
+_discrete_solve_serial = _discrete_solve_multi_numpy    # see _bind_numba_kernels
+
+
+def _bootstrap_multi_py(
+    V_bt:          np.ndarray,   # (B, N)  float64 | float32 — one V per replicate
+    pos_m:         np.ndarray,   # (N, 2)  float64
+    nb:            np.ndarray,   # (N, k)  int64
+    feasible_mask: np.ndarray,   # (N,)    bool
+    max_iter:      int,
+    seeds:         np.ndarray,   # (B, R)  int64
+    tabu_size:     int,
+) -> np.ndarray:
+    """
+    Numba tier of the bootstrap ascent: one ``prange`` over every
+    (replicate, seed) pair, each running the single-start kernel on its
+    replicate's V row.  Returns the (B, R) landing parcels.
+    """
+    B, R    = seeds.shape
+    landing = np.empty((B, R), dtype=np.int64)
+    for i in _numba.prange(B * R):
+        b = i // R
+        r = i % R
+        idx, _, _, _ = _discrete_solve_core(
+            V_bt[b], pos_m, nb, feasible_mask,
+            max_iter, seeds[b, r], tabu_size,
+        )
+        landing[b, r] = idx
+    return landing
+
+
+def _bootstrap_multi_numpy(
+    V_bt, pos_m, nb, feasible_mask, max_iter, seeds, tabu_size,
+) -> np.ndarray:
+    """
+    Pure-NumPy tier: one ``_lockstep_ascent`` over all B·R walkers, walker
+    (b, r) reading ``V_bt[b]`` — O(max_iter) Python steps for the whole
+    bootstrap rather than one lockstep run per replicate.
+    """
+    B, R = seeds.shape
+    landing = _lockstep_ascent(
+        V_bt, np.repeat(np.arange(B, dtype=np.int64), R),
+        pos_m, nb, max_iter, seeds.reshape(-1), tabu_size,
+    )[0]
+    return landing.reshape(B, R)
+
+
+_bootstrap_multi = _bootstrap_multi_numpy               # see _bind_numba_kernels
+
+
+# ---------------------------------------------------------------------------
+#  Acceleration loading
+# ---------------------------------------------------------------------------
+
+def _serial_copy(fn: Callable, suffix: str = "_serial") -> Callable:
+    """
+    ``fn`` under another qualname, for its non-parallel build (``prange``
+    then runs as ``range``).  Numba keys its on-disk cache by qualname, not
+    by the ``parallel`` flag, so the serial and parallel builds of one
+    function would otherwise load each other's cached code.
+    """
+    clone = types.FunctionType(
+        fn.__code__, fn.__globals__, fn.__name__ + suffix,
+        fn.__defaults__, fn.__closure__,
+    )
+    clone.__qualname__ = fn.__qualname__ + suffix
+    clone.__doc__ = fn.__doc__
+    return clone
+
+
+def _bind_numba_kernels(parallel: bool) -> None:
+    """
+    Rebind every kernel to its Numba build (numba must be imported).
+    Without a thread-safe threading layer (``parallel`` False) the
+    ``parallel=True`` builds are replaced by their serial ones.
+    """
+    global _score_fused, _score_fused_parallel
+    global _discrete_solve_core, _discrete_solve_multi, _discrete_solve_serial
+    global _bootstrap_multi
+    _score_fused = _numba.njit(
+        cache=True, boundscheck=False,
+    )(_serial_copy(_score_fused_py))
     _discrete_solve_core = _numba.njit(
         cache=True, fastmath=True, boundscheck=False,
     )(_discrete_solve_core_py)
-else:
-    _discrete_solve_core = _discrete_solve_core_py
+    _discrete_solve_serial = _numba.njit(
+        cache=True, fastmath=True, boundscheck=False,
+    )(_serial_copy(_discrete_solve_multi_numba_py))
+    if not parallel:
+        _score_fused_parallel = _score_fused
+        _discrete_solve_multi = _discrete_solve_serial
+        _bootstrap_multi = _numba.njit(
+            cache=True, fastmath=True, boundscheck=False,
+        )(_serial_copy(_bootstrap_multi_py))
+        return
+    _score_fused_parallel = _numba.njit(
+        cache=True, boundscheck=False, parallel=True,
+    )(_score_fused_py)
+    _discrete_solve_multi = _numba.njit(
+        cache=True, fastmath=True, boundscheck=False, parallel=True,
+    )(_discrete_solve_multi_numba_py)
+    _bootstrap_multi = _numba.njit(
+        cache=True, fastmath=True, boundscheck=False, parallel=True,
+    )(_bootstrap_multi_py)
+
+
+def _start_threading_layer() -> bool:
+    """
+    Launch Numba's threading layer and return whether the ``prange``
+    kernels may run in parallel.
+
+    Kernels are launched from several threads at once — request threads,
+    the warmup thread, job threads and tiled solves when
+    COG_SOLVER_PROCESSES=0 — and Numba's fallback ``workqueue`` layer
+    aborts the process on concurrent parallel launches.  Unless
+    NUMBA_THREADING_LAYER pins a layer, the ``threadsafe`` one (tbb, then
+    omp) is requested.  If neither loads, or ``workqueue`` was pinned, the
+    kernels are bound to their serial builds.
+    """
+    if not os.getenv("NUMBA_THREADING_LAYER"):
+        _numba.config.THREADING_LAYER = "threadsafe"
+    try:
+        _numba.get_num_threads()           # launches the layer
+        layer = _numba.threading_layer()
+    except ValueError:                     # no thread-safe layer installed
+        layer = None
+    _ACCEL_LOAD["threading_layer"] = layer
+    _ACCEL_LOAD["parallel"] = layer not in (None, "workqueue")
+    return _ACCEL_LOAD["parallel"]
+
+
+def _load_acceleration() -> None:
+    """
+    Import scipy and numba (once per process) and bind the Numba kernels.
+    Every function that reads ``_HAS_SCIPY`` / ``_HAS_NUMBA`` or calls a
+    kernel calls this first; after the first call it is a flag check.
+    """
+    global _KDTree, _numba, _HAS_SCIPY, _HAS_NUMBA, _KERNEL_BUNDLE
+    if _ACCEL_LOAD["loaded"]:
+        return
+    with _ACCEL_LOCK:
+        if _ACCEL_LOAD["loaded"]:
+            return
+        t0 = time.perf_counter()
+        try:
+            from scipy.spatial import KDTree
+            _KDTree, _HAS_SCIPY = KDTree, True
+        except ImportError:  # pragma: no cover
+            pass
+        t1 = time.perf_counter()
+
+        # A build-time kernel bundle (cog_kernels.py) must be installed
+        # before Numba reads its cache configuration at import.
+        _KERNEL_BUNDLE = install_bundle()
+        try:
+            import numba
+            _numba, _HAS_NUMBA = numba, True
+            # The layer is chosen and launched once, under _ACCEL_LOCK,
+            # before any kernel can run on another thread.
+            _bind_numba_kernels(_start_threading_layer())
+        except ImportError:  # pragma: no cover
+            _KERNEL_LOAD["source"] = "unavailable"
+        t2 = time.perf_counter()
+
+        _ACCEL_LOAD.update(
+            loaded=True,
+            trigger="first_use" if LAZY_ACCEL else "import",
+            scipy_s=round(t1 - t0, 3),
+            numba_s=round(t2 - t1, 3),
+        )
+
+
+if not LAZY_ACCEL:
+    _load_acceleration()
 
 
 # ---------------------------------------------------------------------------
@@ -691,6 +1471,11 @@ def _diverse_seeds(
     landscape regions, greatly reducing sensitivity to local maxima in areas
     with uneven spatial distribution of high-scoring parcels.
 
+    Incremental: the running ``dist_min`` (distance from every pool parcel
+    to its nearest chosen seed) is only updated against the newest seed, and
+    the top-half / chosen masks are kept as boolean arrays over the pool, so
+    selection is O(n_seeds · P) with no per-round (P, C, 2) tensor.
+
     Returns an int array of parcel indices, length ≤ n_seeds.
     """
     pool = np.where(feasible_mask)[0]
@@ -702,36 +1487,47 @@ def _diverse_seeds(
         return np.array([pool[int(np.argmax(V[pool]))]], dtype=np.intp)
 
     # Sort pool by V descending; first seed = highest-score feasible parcel
-    sorted_pool = pool[np.argsort(V[pool])[::-1]]
-    seeds: list[int] = [int(sorted_pool[0])]
+    pv    = V[pool]
+    order = np.argsort(pv)[::-1]                  # pool positions, best first
+    P     = len(pool)
 
     # Top-50% candidates (by V) used for diversity selection
-    top_half = sorted_pool[:max(1, len(sorted_pool) // 2)]
-    pool_pos = pos_m[pool]            # (pool_size, 2)
+    mask_top = np.zeros(P, dtype=np.bool_)
+    mask_top[order[:max(1, P // 2)]] = True
+    mask_chosen = np.zeros(P, dtype=np.bool_)
+
+    # V normalised to [0, 1] once — it does not change between rounds
+    v_score  = (pv - pv.min()) / (pv.max() - pv.min() + 1e-9)
+    v_part   = 0.4 * v_score
+    pool_pos = pos_m[pool]                        # (P, 2)
+    dist_min = np.full(P, np.inf)
+    d_new    = np.empty(P)
+    combined = np.empty(P)
+    NEG_INF  = -np.inf
+
+    best  = int(order[0])
+    seeds: list[int] = [int(pool[best])]
 
     for _ in range(n_seeds - 1):
-        chosen_pos   = pos_m[seeds]   # (n_chosen, 2)
-        diff         = pool_pos[:, None, :] - chosen_pos[None, :, :]  # (P, C, 2)
-        dist_min     = np.sqrt((diff ** 2).sum(axis=2)).min(axis=1)   # (P,)
+        # Fold in the distance to the newest seed only
+        mask_chosen[best] = True
+        diff = pool_pos - pos_m[seeds[-1]]
+        np.sqrt((diff ** 2).sum(axis=1), out=d_new)
+        np.minimum(dist_min, d_new, out=dist_min)
 
-        # Normalise V and distance to [0, 1] for combination
-        pv      = V[pool]
-        v_score = (pv - pv.min()) / (pv.max() - pv.min() + 1e-9)
-        d_score = dist_min / (dist_min.max() + 1e-9)
-        combined = 0.4 * v_score + 0.6 * d_score
+        # combined = 0.4 · v_score + 0.6 · d_score
+        np.divide(dist_min, dist_min.max() + 1e-9, out=combined)
+        combined *= 0.6
+        combined += v_part
 
         # Restrict to top-half, exclude already chosen
-        mask_chosen = np.zeros(len(pool), dtype=np.bool_)
-        for s in seeds:
-            mask_chosen |= (pool == s)
-        mask_top    = np.isin(pool, top_half)
-        candidates  = np.where(mask_top & ~mask_chosen)[0]
-        if len(candidates) == 0:
-            candidates = np.where(~mask_chosen)[0]
-        if len(candidates) == 0:
+        candidates = mask_top & ~mask_chosen
+        if not candidates.any():
+            candidates = ~mask_chosen
+        if not candidates.any():
             break
 
-        best = candidates[int(np.argmax(combined[candidates]))]
+        best = int(np.argmax(np.where(candidates, combined, NEG_INF)))
         seeds.append(int(pool[best]))
 
     return np.array(seeds, dtype=np.intp)
@@ -745,6 +1541,14 @@ def discrete_solve(
     hazard_mask: np.ndarray,
     cfg: SolverConfig,
     proximity_field: "np.ndarray | None" = None,
+    V: "np.ndarray | None" = None,
+    neighbours: "np.ndarray | None" = None,
+    pos_m: "np.ndarray | None" = None,
+    tree: Any = None,
+    progress: "ProgressFn | None" = None,
+    keep_landings: bool = False,
+    warm_start: "np.ndarray | None" = None,
+    serial: bool = False,
 ) -> tuple[int, dict[str, Any]]:
     """
     Multi-start tabu-enhanced best-neighbour ascent on the parcel graph.
@@ -763,62 +1567,127 @@ def discrete_solve(
     Jitter      Reports geographic spread (std dev of landing positions in
                 metres), not V-value spread, for more interpretable output.
 
+    Shared structures
+    -----------------
+    ``V``          (N,)   precomputed potentials — skips ``_score_all``.
+    ``neighbours`` (N, K) nearest-first neighbour matrix from
+                   ``_build_neighbour_index``.  Columns are sliced to k (and to
+                   k × k_expand_factor for the retry) when K is wide enough,
+                   so batch callers build the index once for every profile.
+    ``pos_m``      (N, 2) metre-projected positions.
+    ``tree``       KD-tree over ``pos_m``; only used if an index must be built.
+    ``progress``   optional ``ProgressFn``; when given the restarts run one
+                   kernel call each (same landings) and report
+                   ``("seeds", restarts done, restarts planned, iterations)``
+                   after each — the expanded retry adds its restarts to both.
+    ``keep_landings`` adds ``"landings"`` to the convergence dict: each
+                   restart's landing parcel (the better of its two passes
+                   when the retry ran), for ``distinct_sites``.
+    ``warm_start`` parcel indices to restart from — the previous optimum
+                   first, then optionally its landings (``nearest_parcels``
+                   maps a previous result's coordinates).  They replace all
+                   but the best fresh seed, and the best of them is kept
+                   if no restart improves on it, so a small weight change
+                   converges within a few iterations.
+    ``serial``     run the restarts with ``_discrete_solve_serial`` instead
+                   of the prange kernel — for callers that already solve on
+                   several threads.
+
     Returns
     -------
     best_parcel_index : int
     convergence_dict  : dict  (iterations, delta_m, converged, jitter_m, n_restarts)
     """
+    _load_acceleration()
     N  = positions.shape[0]
     k  = min(cfg.k_neighbours, N - 1)
 
     # ── Score all parcels (incorporating soft barrier field if given) ────
-    V  = _score_all(normed, weight_vec, feasible_mask, hazard_mask, cfg,
-                    proximity_field=proximity_field)
-    nb = _build_neighbour_index(positions, k)          # (N, k)  int64
+    if V is None:
+        V = _score_all(normed, weight_vec, feasible_mask, hazard_mask, cfg,
+                       proximity_field=proximity_field)
 
-    # ── Metre-projected positions for seed diversity computation ────────
-    lat_rad       = math.radians(float(np.mean(positions[:, 0])))
-    m_per_deg_lng = M_PER_DEG_LAT * math.cos(lat_rad)
-    scale         = np.array([M_PER_DEG_LAT, m_per_deg_lng], dtype=np.float64)
-    pos_m         = positions * scale
+    # ── Metre-projected positions for seeding and any index build ───────
+    if pos_m is None:
+        pos_m = project(positions)
+
+    if neighbours is not None and neighbours.shape[1] >= k:
+        nb = neighbours[:, :k]                         # nearest-first slice
+    else:
+        nb = _build_neighbour_index(positions, k, pos_m=pos_m, tree=tree)
 
     # ── Geographically diverse seeds ────────────────────────────────────
     n_rest = max(1, min(cfg.n_restarts, len(np.where(feasible_mask)[0]) or N))
     seeds  = _diverse_seeds(pos_m, V, feasible_mask, n_rest)
 
-    # ── Ensure correct dtypes for Numba specialisation ──────────────────
-    V_f64   = V.astype(np.float64)
-    pos_f64 = positions.astype(np.float64)
-    nb_i64  = nb.astype(np.int64)
-    fm_bool = feasible_mask.astype(np.bool_)
-    tabu_sz = int(cfg.tabu_size)
-    max_it  = int(cfg.max_iter)
-
-    best_idx       = int(seeds[0])
-    best_V_final   = -np.inf
-    best_iters     = 0
-    best_converged = False
-    best_delta     = 0.0
-    all_final_vs:  list[float] = []
-    all_final_pos: list[np.ndarray] = []
-
-    def _run_seed(seed: int, k_nb: np.ndarray) -> tuple[int, int, bool, float]:
-        return _discrete_solve_core(
-            V_f64, pos_f64, k_nb.astype(np.int64), fm_bool,
-            max_it, M_PER_DEG_LAT, seed, tabu_sz,
-        )
+    # ── Warm start: previous optimum / landings ahead of fresh seeds ────
+    # They take up to n_rest - 1 slots; the best fresh seed (the top-V
+    # feasible parcel) always runs, so a large weight change is still found.
+    warm = np.empty(0, dtype=np.int64)
+    if warm_start is not None and len(warm_start):
+        warm = np.asarray(warm_start, dtype=np.int64)
+        warm = warm[(warm >= 0) & (warm < N)]
+        warm = warm[np.sort(np.unique(warm, return_index=True)[1])]
+        warm = warm[:max(0, n_rest - 1)]
+        fresh = seeds[~np.isin(seeds, warm)][:max(1, n_rest - len(warm))]
+        seeds = np.concatenate([warm, fresh]).astype(np.intp)
 
-    for seed in seeds:
-        idx, iters, conv, delta = _run_seed(int(seed), nb)
-        fv = float(V_f64[int(idx)])
-        all_final_vs.append(fv)
-        all_final_pos.append(pos_m[int(idx)])
-        if fv > best_V_final:
-            best_V_final   = fv
-            best_idx       = int(idx)
-            best_iters     = int(iters)
-            best_converged = bool(conv)
-            best_delta     = float(delta)
+    # ── Ensure correct dtypes for Numba specialisation ──────────────────
+    # V keeps its dtype: the kernels are compiled for float32 and float64
+    # potentials, so the float32 mode never widens it.  No copies when the
+    # inputs already have these dtypes.
+    V_k      = np.ascontiguousarray(V, dtype=_score_dtype(V))
+    pos_f64  = np.ascontiguousarray(pos_m, dtype=np.float64)
+    fm_bool  = np.ascontiguousarray(feasible_mask, dtype=np.bool_)
+    seed_arr = np.asarray(seeds, dtype=np.int64)
+    tabu_sz  = int(cfg.tabu_size)
+    max_it   = int(cfg.max_iter)
+
+    done = [0, 0]                                      # restarts, iterations
+    solve_seeds = _discrete_solve_serial if serial else _discrete_solve_multi
+
+    def _run_seeds(k_nb: np.ndarray, planned: int) -> tuple[np.ndarray, ...]:
+        k_nb = np.ascontiguousarray(k_nb, dtype=np.int64)
+        if progress is None:
+            # One kernel call advances every restart (see _discrete_solve_multi).
+            return solve_seeds(
+                V_k, pos_f64, k_nb, fm_bool,
+                max_it, seed_arr, tabu_sz,
+            )
+        # Restarts are independent, so one call per seed lands identically.
+        runs = []
+        for r in range(len(seed_arr)):
+            runs.append(solve_seeds(
+                V_k, pos_f64, k_nb, fm_bool,
+                max_it, seed_arr[r:r + 1], tabu_sz,
+            ))
+            done[0] += 1
+            done[1] += int(runs[-1][1][0])
+            progress("seeds", done[0], planned, done[1])
+        return tuple(np.concatenate(col) for col in zip(*runs))
+
+    land, iters, conv, deltas = _run_seeds(nb, len(seed_arr))
+    final_vs = V_k[land]
+    r = int(np.argmax(final_vs))           # first max, as the old seed loop
+    best_V_final   = float(final_vs[r])
+    best_idx       = int(land[r])
+    best_iters     = int(iters[r])
+    best_converged = bool(conv[r])
+    best_delta     = float(deltas[r])
+    all_final_pos  = pos_m[land]
+    seed_land      = land                  # each seed's best landing so far
+
+    # A warm seed is itself a candidate: when no restart climbs above the
+    # previous optimum (tabu moves may walk off a peak) it is kept, and
+    # counts as converged so the stall retry is skipped.
+    if len(warm):
+        w = int(np.argmax(V_k[warm]))
+        if float(V_k[warm[w]]) > best_V_final:
+            best_V_final   = float(V_k[warm[w]])
+            best_idx       = int(warm[w])
+            best_iters     = 0
+            best_converged = True
+            best_delta     = 0.0
 
     # ── Expanded-neighbour retry when solution did not converge ─────────
     # If no restart produced a converged result, try a second pass with
@@ -827,41 +1696,319 @@ def discrete_solve(
     # are queried from the existing KD-tree data.
     if not best_converged and cfg.k_expand_factor > 1:
         k_wide  = min(k * cfg.k_expand_factor, N - 1)
-        nb_wide = _build_neighbour_index(positions, k_wide)
-        for seed in seeds:
-            idx, iters, conv, delta = _run_seed(int(seed), nb_wide)
-            fv = float(V_f64[int(idx)])
-            if fv > best_V_final:
-                best_V_final   = fv
-                best_idx       = int(idx)
-                best_iters     = int(iters)
-                best_converged = bool(conv)
-                best_delta     = float(delta)
+        if neighbours is not None and neighbours.shape[1] >= k_wide:
+            nb_wide = neighbours[:, :k_wide]
+        else:
+            nb_wide = _build_neighbour_index(positions, k_wide,
+                                             pos_m=pos_m, tree=tree)
+        land, iters, conv, deltas = _run_seeds(nb_wide, 2 * len(seed_arr))
+        final_vs = V_k[land]
+        seed_land = np.where(final_vs > V_k[seed_land], land, seed_land)
+        r = int(np.argmax(final_vs))
+        if float(final_vs[r]) > best_V_final:
+            best_V_final   = float(final_vs[r])
+            best_idx       = int(land[r])
+            best_iters     = int(iters[r])
+            best_converged = bool(conv[r])
+            best_delta     = float(deltas[r])
 
     # ── Jitter: std dev of landing positions in metres ──────────────────
     # Measures how much the different restarts disagree about the solution
     # location — a geographic interpretability metric for the UI.
     if len(all_final_pos) > 1:
-        landing = np.array(all_final_pos, dtype=np.float64)   # (R, 2) metres
+        landing = all_final_pos                                # (R, 2) metres
         jitter_m = float(np.std(
             np.sqrt(((landing - landing.mean(axis=0)) ** 2).sum(axis=1))
         ))
     else:
         jitter_m = 0.0
 
-    return best_idx, {
+    convergence = {
         "iterations": best_iters,
         "delta_m":    round(best_delta, 2),
         "converged":  best_converged,
         "jitter_m":   round(jitter_m, 1),
         "n_restarts": len(seeds),
     }
+    if keep_landings:
+        convergence["landings"] = np.asarray(seed_land, dtype=np.int64)
+    return best_idx, convergence
+
+
+def distinct_sites(
+    landings: np.ndarray,      # (R,)   int   — landing parcel per restart
+    V: np.ndarray,             # (N,)         — scored potentials
+    pos_m: np.ndarray,         # (N, 2)       — metre-projected positions
+    k: int,
+    min_separation_m: float = SITE_SEPARATION_M,
+    sigma: float = 1.0,
+) -> list[tuple[int, int, float, dict[str, Any]]]:
+    """
+    Reduce multi-start landings to at most ``k`` sites ``min_separation_m``
+    apart.
+
+    Landing parcels are taken best-V first; one within ``min_separation_m``
+    of an already accepted site is folded into the nearest such site
+    instead of being reported.  Returns ``(parcel index, basin size,
+    spread_m, uncertainty)`` per site, best first — basin size counts the
+    restarts that landed on the site or were folded into it, spread_m is the
+    RMS distance of those landings from the site and uncertainty their
+    sigma-scaled covariance ellipse about it (``mode`` "basin"; zero for a
+    site only one distinct landing reached).  Pure NumPy; O(U × k) for U
+    distinct landings.
+    """
+    uniq, counts = np.unique(np.asarray(landings, dtype=np.int64), return_counts=True)
+    order = np.argsort(-V[uniq], kind="stable")
+    uniq, counts = uniq[order], counts[order]
+
+    sites: list[int] = []
+    members: list[list[int]] = []              # indices into uniq per site
+    for u in range(len(uniq)):
+        if sites:
+            d = np.sqrt(((pos_m[sites] - pos_m[uniq[u]]) ** 2).sum(axis=1))
+            near = int(np.argmin(d))
+            if d[near] < min_separation_m:
+                members[near].append(u)
+                continue
+        if len(sites) < k:
+            sites.append(int(uniq[u]))
+            members.append([u])
+
+    out: list[tuple[int, int, float, dict[str, Any]]] = []
+    for site, mem in zip(sites, members):
+        diff_m = pos_m[uniq[mem]] - pos_m[site]                # (M, 2)
+        w      = counts[mem]
+        spread = float(np.sqrt(((diff_m ** 2).sum(axis=1) * w).sum() / w.sum()))
+        ellipse = _ellipse_from_offsets(diff_m, w / w.sum(), sigma)
+        ellipse["mode"] = "basin"
+        out.append((site, int(w.sum()), spread, ellipse))
+    return out
+
+
+def _grid_tiles(
+    pos_m: np.ndarray,
+    tile_m: float,
+) -> tuple[dict[tuple[int, int], np.ndarray], np.ndarray]:
+    """
+    Partition parcels into a square metre grid.
+
+    Returns ``({(row, col): member indices}, origin)`` where cell (r, c)
+    spans ``origin + [r, c] * tile_m`` to ``origin + [r + 1, c + 1] * tile_m``
+    in (northing, easting).  One argsort — O(N log N), no per-cell scan.
+    """
+    origin = pos_m.min(axis=0)
+    ij     = np.floor((pos_m - origin) / tile_m).astype(np.int64)     # (N, 2)
+    ncols  = int(ij[:, 1].max()) + 1
+    key    = ij[:, 0] * ncols + ij[:, 1]
+    order  = np.argsort(key, kind="stable")
+    keys, starts = np.unique(key[order], return_index=True)
+    bounds = np.append(starts, len(order))
+    tiles  = {
+        (int(kk) // ncols, int(kk) % ncols): order[bounds[t]:bounds[t + 1]]
+        for t, kk in enumerate(keys)
+    }
+    return tiles, origin
+
+
+def _tile_halo(
+    tiles: dict[tuple[int, int], np.ndarray],
+    cell: tuple[int, int],
+    pos_m: np.ndarray,
+    origin: np.ndarray,
+    tile_m: float,
+    halo_m: float,
+) -> np.ndarray:
+    """Parcels of the 8 surrounding cells within ``halo_m`` of ``cell``'s box."""
+    r, c = cell
+    ring = [
+        tiles[(r + dr, c + dc)]
+        for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+        if (dr or dc) and (r + dr, c + dc) in tiles
+    ]
+    if not ring or halo_m <= 0:
+        return np.empty(0, dtype=np.intp)
+    cand = np.concatenate(ring)
+    lo   = origin + np.array([r, c], dtype=np.float64) * tile_m
+    hi   = lo + tile_m
+    p    = pos_m[cand]
+    gap  = np.maximum(np.maximum(lo - p, p - hi), 0.0)             # (M, 2)
+    return cand[(gap ** 2).sum(axis=1) <= halo_m * halo_m]
+
+
+def tiled_discrete_solve(
+    positions: np.ndarray,
+    normed: np.ndarray,
+    weight_vec: np.ndarray,
+    feasible_mask: np.ndarray,
+    hazard_mask: np.ndarray,
+    cfg: SolverConfig,
+    proximity_field: "np.ndarray | None" = None,
+    V: "np.ndarray | None" = None,
+    pos_m: "np.ndarray | None" = None,
+    tile_m: float = TILE_SIZE_M,
+    halo_m: float = TILE_HALO_M,
+    workers: "int | None" = None,
+    progress: "ProgressFn | None" = None,
+) -> tuple[int, dict[str, Any], list[dict[str, Any]]]:
+    """
+    ``discrete_solve`` over a grid of ``tile_m`` × ``tile_m`` tiles.
+
+    Each tile is solved independently on its core parcels plus a halo of
+    neighbouring-tile parcels within ``halo_m`` of its border (clamped to
+    ``tile_m``), so an ascent that starts near a border can cross it.  Tiles
+    run on a thread pool of ``workers`` (default: CPU count, max 8), each
+    tile's restarts on the serial kernel so no two threads launch a prange
+    kernel at once (a lone worker keeps the parallel one).  Each tile
+    builds its own k-NN index, so peak index memory is O(tile size · k)
+    rather than O(N · k) — or O(tile²) on the brute-force tier instead of
+    O(N²).  Potentials ``V`` are scored once globally.
+
+    Tiles with no feasible core parcel, or fewer than 3 parcels including
+    the halo, are skipped.  The global best is the highest-V tile optimum.
+    ``progress`` (optional ``ProgressFn``) is called as each tile finishes
+    with ``("tiles", tiles done, tiles total, iterations so far)``.
+
+    Returns
+    -------
+    best_parcel_index : int
+    convergence_dict  : dict  — the winning tile's discrete_solve dict plus
+                                n_tiles (solved) and tile_m / halo_m
+    tile_optima       : list[dict] — per solved tile: tile (row, col), index,
+                                V, parcel_count (core), halo_count,
+                                in_core (optimum inside the tile's own cell),
+                                converged, iterations
+    """
+    if not (math.isfinite(tile_m) and tile_m > 0):
+        raise ValueError(f"tile_m must be a finite positive number of metres, got {tile_m!r}")
+    if not (math.isfinite(halo_m) and halo_m >= 0):
+        raise ValueError(f"halo_m must be a finite non-negative number of metres, got {halo_m!r}")
+    if V is None:
+        V = _score_all(normed, weight_vec, feasible_mask, hazard_mask, cfg,
+                       proximity_field=proximity_field)
+    if pos_m is None:
+        pos_m = project(positions)
+    halo_m = min(halo_m, tile_m)
+
+    tiles, origin = _grid_tiles(pos_m, tile_m)
+
+    cells = sorted(tiles)
+    done  = [0, 0]                                     # tiles, iterations
+    done_lock = threading.Lock()
+
+    def _tile_done(iterations: int) -> None:
+        if progress is None:
+            return
+        with done_lock:
+            done[0] += 1
+            done[1] += iterations
+            progress("tiles", done[0], len(cells), done[1])
+
+    n_workers = workers or min(8, os.cpu_count() or 1)
+    threaded  = n_workers > 1 and len(cells) > 1
+
+    def _solve_tile(cell: tuple[int, int]) -> "dict[str, Any] | None":
+        core = tiles[cell]
+        if not feasible_mask[core].any():
+            _tile_done(0)
+            return None
+        halo = _tile_halo(tiles, cell, pos_m, origin, tile_m, halo_m)
+        idx  = np.concatenate([core, halo]) if len(halo) else core
+        if len(idx) < 3:
+            _tile_done(0)
+            return None
+        local, conv = discrete_solve(
+            positions[idx], normed[idx], weight_vec,
+            feasible_mask[idx], hazard_mask[idx], cfg,
+            V=V[idx], pos_m=pos_m[idx], serial=threaded,
+        )
+        gi = int(idx[local])
+        _tile_done(conv["iterations"])
+        return {
+            "tile":         [int(cell[0]), int(cell[1])],
+            "index":        gi,
+            "V":            float(V[gi]),
+            "parcel_count": int(len(core)),
+            "halo_count":   int(len(halo)),
+            "in_core":      bool(local < len(core)),
+            "converged":    conv["converged"],
+            "iterations":   conv["iterations"],
+            "_convergence": conv,
+        }
+
+    if threaded:
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            solved = list(pool.map(_solve_tile, cells))
+    else:
+        solved = [_solve_tile(cell) for cell in cells]
+    optima = [t for t in solved if t is not None]
+
+    if not optima:
+        # No tile had both a feasible core and 3+ parcels — solve globally.
+        best_idx, conv = discrete_solve(
+            positions, normed, weight_vec, feasible_mask, hazard_mask, cfg,
+            V=V, pos_m=pos_m,
+        )
+        return best_idx, {**conv, "n_tiles": 0, "tile_m": tile_m, "halo_m": halo_m}, []
+
+    best = max(optima, key=lambda t: t["V"])        # first max in cell order
+    convergence = {
+        **best["_convergence"],
+        "n_tiles": len(optima),
+        "tile_m":  tile_m,
+        "halo_m":  halo_m,
+    }
+    for t in optima:
+        del t["_convergence"]
+    return best["index"], convergence, optima
 
 
 # ---------------------------------------------------------------------------
 #  Step 5 — Confidence ellipse from the 20 lowest-potential parcels
 # ---------------------------------------------------------------------------
 
+def _ellipse_from_offsets(
+    diff_m: np.ndarray,        # (M, 2)  metre offsets from the solution
+    w: np.ndarray,             # (M,)    weights summing to 1
+    sigma: float,
+) -> dict[str, float]:
+    """
+    sigma-scaled axes of the weighted second moment of ``diff_m``.
+
+    theta_deg is the major axis' angle from north toward east (atan2 of its
+    east and north components); radius_m is the RMS of the two semi-axes.
+    """
+    cov = (w[:, None] * diff_m).T @ diff_m              # (2, 2) m²
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)      # ascending
+    eigenvalues = np.maximum(eigenvalues, 0.0)
+    ev  = eigenvectors[:, 1]                             # major axis
+    a_m = sigma * math.sqrt(float(eigenvalues[1]))
+    b_m = sigma * math.sqrt(float(eigenvalues[0]))
+    theta_deg = (
+        math.degrees(math.atan2(float(ev[1]), float(ev[0]))) if a_m > 0 else 0.0
+    )                                                    # no axis for a point
+    radius_m  = math.sqrt((a_m ** 2 + b_m ** 2) / 2.0)
+    return {
+        "radius_m":    round(radius_m, 1),
+        "ellipse_a_m": round(a_m, 1),
+        "ellipse_b_m": round(b_m, 1),
+        "theta_deg":   round(theta_deg, 2),
+    }
+
+
+def _metre_offsets(
+    positions: np.ndarray,
+    pos_m: "np.ndarray | None",
+    idx: np.ndarray,
+    solution_lat: float,
+    solution_lng: float,
+) -> np.ndarray:
+    """(M, 2) metre offsets of parcels ``idx`` from the solution, in the
+    pos_m projection (about the parcels' mean latitude)."""
+    scale = metre_scale(reference_lat(positions))
+    pts_m = pos_m[idx] if pos_m is not None else positions[idx] * scale
+    return pts_m - np.array([solution_lat, solution_lng]) * scale
+
+
 def confidence_ellipse(
     positions: np.ndarray,
     V: np.ndarray,
@@ -869,6 +2016,7 @@ def confidence_ellipse(
     solution_lng: float,
     sigma: float = 1.0,
     n_bottom: int = 20,
+    pos_m: "np.ndarray | None" = None,
 ) -> dict[str, float]:
     """
     Eigen-decomposes the position covariance of the *n_bottom* parcels with
@@ -878,47 +2026,125 @@ def confidence_ellipse(
     most influence on the ellipse shape — the ellipse shows where the solver
     most strongly *rejected* in order to reach its solution.
 
+    The bottom parcels are picked with ``np.argpartition`` (O(N), no full
+    sort) and the covariance is taken over metre offsets from the solution
+    in the ``pos_m`` projection, so both axes come straight from its
+    eigenvalues.
+
     Returns keys: radius_m, ellipse_a_m, ellipse_b_m, theta_deg
     """
-    n_bottom   = min(n_bottom, len(positions))
-    bottom_idx = np.argsort(V)[:n_bottom]
-    bottom_pos = positions[bottom_idx]
+    n_bottom = min(n_bottom, len(positions))
+    if n_bottom < len(positions):
+        bottom_idx = np.argpartition(V, n_bottom - 1)[:n_bottom]
+    else:
+        bottom_idx = np.arange(len(positions))
 
-    inv_scores = 1.0 / (np.abs(V[bottom_idx]) + 1e-9)
+    inv_scores = 1.0 / (np.abs(V[bottom_idx].astype(np.float64)) + 1e-9)
     w = inv_scores / inv_scores.sum()
 
-    center = np.array([solution_lat, solution_lng])
-    diff   = bottom_pos - center                    # (n_bottom, 2)
-    cov    = (w[:, None] * diff).T @ diff           # (2, 2) weighted covariance
-
-    eigenvalues, eigenvectors = np.linalg.eigh(cov)
-    eigenvalues = np.maximum(eigenvalues, 0.0)
+    diff_m = _metre_offsets(positions, pos_m, bottom_idx, solution_lat, solution_lng)
+    return _ellipse_from_offsets(diff_m, w, sigma)
 
-    m_per_deg_lng = M_PER_DEG_LAT * math.cos(math.radians(solution_lat))
-    idx   = np.argsort(eigenvalues)[::-1]
-    ev    = eigenvectors[:, idx[0]]
-    a_deg = sigma * math.sqrt(eigenvalues[idx[0]])
-    b_deg = sigma * math.sqrt(eigenvalues[idx[1]])
 
-    a_m = a_deg * math.sqrt(
-        (M_PER_DEG_LAT * float(ev[0])) ** 2 + (m_per_deg_lng * float(ev[1])) ** 2
+def bootstrap_uncertainty(
+    positions: np.ndarray,     # (N, 2)  lat/lng
+    pos_m: np.ndarray,         # (N, 2)  metre projection
+    normed: np.ndarray,        # (N, F)
+    weight_vec: np.ndarray,    # (F,)
+    feasible_mask: np.ndarray,
+    hazard_mask: np.ndarray,
+    cfg: SolverConfig,
+    V: np.ndarray,             # (N,)    base potentials for weight_vec
+    best_idx: int,
+    neighbours: np.ndarray,    # (N, K) nearest-first, K ≥ cfg.k_neighbours
+    proximity_field: "np.ndarray | None" = None,
+    seed: int = 0,
+) -> dict[str, float]:
+    """
+    Solution-stability ellipse: re-solve ``cfg.bootstrap_samples`` times
+    with perturbed inputs and measure how far the optimum moves.
+
+    Each replicate multiplies every weight by a log-normal factor
+    (sigma = cfg.bootstrap_weight_noise, then renormalised) and draws
+    cfg.n_restarts seeds with replacement from the top half of feasible
+    parcels by the caller's base ``V``.  All replicates are scored by one ``_score_batch``
+    matmul and ascended by one ``_bootstrap_multi`` call over the shared
+    ``neighbours``; a replicate's solution is its best landing under its
+    own V.  The ellipse is the covariance of those solutions about
+    ``best_idx`` in metres — the same keys as ``confidence_ellipse`` plus
+    ``mode``, ``n_boot`` and ``agreement`` (share of replicates landing
+    within SITE_SEPARATION_M of ``best_idx``).  Deterministic for a given
+    ``seed``.
+    """
+    _load_acceleration()
+    rng = np.random.default_rng(seed)
+    B   = max(1, int(cfg.bootstrap_samples))
+    N   = positions.shape[0]
+    k   = min(cfg.k_neighbours, N - 1, neighbours.shape[1])
+
+    # ── Jittered weight columns, renormalised like the constructor ──────
+    W = weight_vec.astype(np.float64)[:, None] * rng.lognormal(
+        0.0, cfg.bootstrap_weight_noise, (len(weight_vec), B),
     )
-    b_m       = b_deg * math.sqrt((M_PER_DEG_LAT ** 2 + m_per_deg_lng ** 2) / 2.0)
-    theta_deg = math.degrees(math.atan2(float(ev[1]), float(ev[0])))
-    radius_m  = math.sqrt((a_m ** 2 + b_m ** 2) / 2.0)
-
-    return {
-        "radius_m":    round(radius_m, 1),
-        "ellipse_a_m": round(a_m, 1),
-        "ellipse_b_m": round(b_m, 1),
-        "theta_deg":   round(theta_deg, 2),
-    }
+    W /= np.maximum(np.abs(W).sum(axis=0, keepdims=True), 1e-12)
+    V_bt = np.ascontiguousarray(_score_batch(
+        normed, W.astype(normed.dtype, copy=False), feasible_mask, hazard_mask,
+        cfg, proximity_field=proximity_field,
+    ).T)                                                   # (B, N)
+
+    # ── Resampled seeds: top half of feasible parcels by base V ─────────
+    pool = np.flatnonzero(feasible_mask)
+    if len(pool) == 0:
+        pool = np.arange(N)
+    pool = pool[np.argsort(-V[pool], kind="stable")][:max(1, len(pool) // 2)]
+    R     = max(1, int(cfg.n_restarts))
+    seeds = rng.choice(pool, size=(B, R), replace=True).astype(np.int64)
+
+    landing = _bootstrap_multi(
+        V_bt, np.ascontiguousarray(pos_m, dtype=np.float64),
+        np.ascontiguousarray(neighbours[:, :k], dtype=np.int64),
+        np.ascontiguousarray(feasible_mask, dtype=np.bool_),
+        int(cfg.max_iter), seeds, int(cfg.tabu_size),
+    )                                                      # (B, R)
+    rows  = np.arange(B)
+    sols  = landing[rows, np.argmax(V_bt[rows[:, None], landing], axis=1)]
+
+    diff_m = _metre_offsets(
+        positions, pos_m, sols,
+        float(positions[best_idx, 0]), float(positions[best_idx, 1]),
+    )
+    out = _ellipse_from_offsets(diff_m, np.full(B, 1.0 / B), cfg.uncertainty_sigma)
+    out.update(
+        mode="bootstrap",
+        n_boot=B,
+        agreement=round(float(np.mean(
+            (diff_m ** 2).sum(axis=1) <= SITE_SEPARATION_M ** 2
+        )), 4),
+    )
+    return out
 
 
 # ---------------------------------------------------------------------------
 #  Public solver class
 # ---------------------------------------------------------------------------
 
+@dataclass
+class _PreparedParcels:
+    """
+    Weight-independent solver inputs, built once per parcel set.
+
+    Shared by every profile in ``CentreOfGravitySolver.solve_batch`` so the
+    normaliser, proximity field and neighbour index are not recomputed.
+    """
+    positions:     np.ndarray            # (N, 2) float64 lat/lng
+    pos_m:         np.ndarray            # (N, 2) float64 metre projection
+    normed:        np.ndarray            # (N, F) float64 | float32
+    feasible_mask: np.ndarray            # (N,)   bool
+    hazard_mask:   np.ndarray            # (N,)   bool
+    proximity:     np.ndarray            # (N,)   soft barrier field, dtype of normed
+    neighbours:    "np.ndarray | None"   # (N, K) int64, widest index needed
+
+
 class CentreOfGravitySolver:
     """
     Discrete k-NN best-neighbour ascent CoG solver.
@@ -932,6 +2158,10 @@ class CentreOfGravitySolver:
     weights      : dict[str, float]   investor weights (need not sum to 1)
     zoning_allow : set[str]           e.g. {'commercial', 'mixed'}
     config       : SolverConfig | None
+    normaliser   : QuantileNormaliser | None
+                   already-fitted normaliser (e.g. from the parcel cache);
+                   the solver then transforms with its bounds instead of
+                   refitting p5/p95.
     """
 
     def __init__(
@@ -940,22 +2170,82 @@ class CentreOfGravitySolver:
         weights: dict[str, float],
         zoning_allow: set[str],
         config: Optional[SolverConfig] = None,
+        normaliser: Optional[QuantileNormaliser] = None,
     ) -> None:
         self.parcels      = parcels
         self.config       = config or SolverConfig()
         self.zoning_allow = {z.lower() for z in zoning_allow}
+        self.normaliser   = normaliser
+        self._cols: "dict[str, Any] | None" = None
 
+        self._weight_by_metric = self._metric_weights(weights)
+        self._metric_keys = list(WEIGHT_TO_METRIC.values())
+
+    @staticmethod
+    def _metric_weights(weights: dict[str, float]) -> dict[str, float]:
+        """Map API weight keys to metric keys, divided by total |weight|."""
         total_w = sum(abs(v) for v in weights.values()) or 1.0
-        self._weight_by_metric: dict[str, float] = {
+        return {
             metric_key: weights.get(api_key, 0.0) / total_w
             for api_key, metric_key in WEIGHT_TO_METRIC.items()
         }
-        self._metric_keys = list(WEIGHT_TO_METRIC.values())
 
     # ------------------------------------------------------------------
 
-    def solve(self) -> CogResult:
-        if not self.parcels:
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: np.ndarray,
+        latlng: np.ndarray,
+        metrics: np.ndarray,
+        hazard: np.ndarray,
+        weights: dict[str, float],
+        zoning_allow: set[str],
+        zoning_idx: Optional[np.ndarray] = None,
+        zoning_vocab: "tuple[str, ...] | None" = None,
+        zoning: "list[str] | None" = None,
+        config: Optional[SolverConfig] = None,
+        normaliser: Optional[QuantileNormaliser] = None,
+    ) -> "CentreOfGravitySolver":
+        """
+        Build a solver from columnar arrays — no per-parcel Python objects.
+
+        Takes the layout returned by ``parcel_domain.fetch_parcel_columns``
+        (and ``parcels_to_columns``), so callers can write
+        ``CentreOfGravitySolver.from_arrays(**cols, weights=..., ...)``.
+        ``metrics`` columns follow ``WEIGHT_TO_METRIC.values()`` order and
+        hold raw (pre-normalisation) values; NaN cells are imputed.
+
+        Zoning is given encoded (``zoning_idx`` + ``zoning_vocab``, see
+        ``encode_zoning``) or as a plain ``zoning`` string list, which is
+        encoded here.
+        """
+        if zoning_idx is None or zoning_vocab is None:
+            if zoning is None:
+                raise ValueError("from_arrays needs zoning_idx + zoning_vocab or zoning")
+            zoning_idx, zoning_vocab = encode_zoning(zoning)
+        solver = cls([], weights, zoning_allow, config, normaliser)
+        solver._cols = {
+            "ids":          np.asarray(ids, dtype=np.int64),
+            "latlng":       np.asarray(latlng, dtype=np.float64),
+            "metrics":      np.asarray(metrics, dtype=np.float64),
+            "zoning_idx":   np.asarray(zoning_idx, dtype=np.int16),
+            "zoning_vocab": tuple(zoning_vocab),
+            "hazard":       np.asarray(hazard, dtype=np.bool_),
+        }
+        return solver
+
+    def _columns(self) -> dict[str, Any]:
+        """Columnar view of the input (converted once from ``parcels``)."""
+        if self._cols is None:
+            self._cols = parcels_to_columns(self.parcels, self._metric_keys)
+        return self._cols
+
+    def _prepare(self, build_neighbours: bool = False) -> _PreparedParcels:
+        """Run pre-flight checks and build the weight-independent inputs."""
+        cols = self._columns()
+        N    = int(cols["ids"].shape[0])
+        if N == 0:
             raise CogValidationError(
                 "No parcels supplied to solver.",
                 code="INSUFFICIENT_PARCELS",
@@ -963,7 +2253,6 @@ class CentreOfGravitySolver:
             )
 
         # ── Pre-flight: parcel count ────────────────────────────────────
-        N = len(self.parcels)
         if N < 3:
             raise CogValidationError(
                 f"Too few parcels ({N}) — need at least 3 for a meaningful solve.",
@@ -972,96 +2261,324 @@ class CentreOfGravitySolver:
             )
 
         # ── Pre-flight: zoning feasibility ─────────────────────────────
-        feasible_count = sum(
-            1 for p in self.parcels if p.zoning.lower() in self.zoning_allow
+        # Lookup-table gather over the categorical codes — no string work
+        # per parcel.
+        feasible_mask = zoning_feasible_mask(
+            cols["zoning_idx"], cols["zoning_vocab"], self.zoning_allow,
         )
-        if feasible_count == 0:
-            parcel_zonings = sorted({p.zoning.lower() for p in self.parcels})
+        if not feasible_mask.any():
             raise CogValidationError(
                 "All parcels are excluded by the current zoning filter. "
                 "Allow at least one zoning category.",
                 code="ALL_ZONING_FILTERED",
                 details={
                     "zoning_allow":   sorted(self.zoning_allow),
-                    "parcel_zonings": parcel_zonings,
+                    "parcel_zonings": zoning_present(
+                        cols["zoning_idx"], cols["zoning_vocab"],
+                    ),
                 },
             )
 
         cfg = self.config
 
-        # --- Step 2: Normalise ---
-        normaliser = QuantileNormaliser(self._metric_keys)
-        normed     = normaliser.fit_transform(self.parcels)       # (N, F) float64
-
-        # Optional float32 downcast — halves memory and speeds matmul on SIMD.
-        # Accuracy loss is negligible: [0,1] values retain 7 decimal digits.
+        # --- Step 2: Normalise (transform-only when bounds are supplied) ---
+        # use_float32 normalises straight into a float32 matrix — halves
+        # memory and speeds the matmul on SIMD.  Accuracy loss is
+        # negligible: [0,1] values retain 7 decimal digits (bench_cog.py
+        # float32 checks the landings against float64).
         dtype = np.float32 if cfg.use_float32 else np.float64
-        if cfg.use_float32:
-            normed = normed.astype(np.float32, copy=False)
-
-        positions = np.array(
-            [[p.lat, p.lng] for p in self.parcels], dtype=np.float64
-        )
-        feasible_mask = np.array(
-            [p.zoning.lower() in self.zoning_allow for p in self.parcels],
-            dtype=np.bool_,
-        )
-        hazard_mask = np.array(
-            [bool(p.hazard_flag) for p in self.parcels], dtype=np.bool_
-        )
-        weight_vec = np.array(
-            [self._weight_by_metric.get(k, 0.0) for k in self._metric_keys],
-            dtype=dtype,
-        )
+        normaliser = self.normaliser
+        if normaliser is not None and normaliser.is_fitted:
+            normed = normaliser.transform(cols["metrics"], dtype=dtype)   # (N, F)
+        else:
+            normaliser = QuantileNormaliser(self._metric_keys)
+            normed     = normaliser.fit_transform(cols["metrics"], dtype=dtype)
 
-        # --- Steps 3+4: Compute soft barrier field, score all parcels,
-        #     then run the multi-start tabu-enhanced discrete solver ---
+        positions   = cols["latlng"]
+        hazard_mask = cols["hazard"]
 
         # Soft barrier proximity field — graduated repulsion that decreases
         # exponentially with distance to the nearest hazard/infeasible parcel.
         # Computed once; shared by _score_all and discrete_solve so the same
         # V surface drives both the confidence ellipse and the inner loop.
-        prox = _compute_proximity_field(
-            positions, hazard_mask, feasible_mask, cfg.hazard_decay_m
+        pos_m = project(positions)
+        prox  = _compute_proximity_field(
+            positions, hazard_mask, feasible_mask, cfg.hazard_decay_m,
+            pos_m=pos_m, cutoff=cfg.proximity_cutoff, dtype=dtype,
         )
 
-        V = _score_all(normed, weight_vec, feasible_mask, hazard_mask, cfg,
-                       proximity_field=prox)
-        best_idx, convergence = discrete_solve(
-            positions, normed, weight_vec, feasible_mask, hazard_mask, cfg,
-            proximity_field=prox,
+        # Widest index any pass can ask for: discrete_solve slices k and
+        # k × k_expand_factor columns from it instead of rebuilding.
+        neighbours = None
+        if build_neighbours:
+            k_wide = min(
+                cfg.k_neighbours * max(1, cfg.k_expand_factor), N - 1
+            )
+            neighbours = _build_neighbour_index(positions, k_wide, pos_m=pos_m)
+
+        return _PreparedParcels(
+            positions=positions,
+            pos_m=pos_m,
+            normed=normed,
+            feasible_mask=feasible_mask,
+            hazard_mask=hazard_mask,
+            proximity=prox,
+            neighbours=neighbours,
         )
 
-        solution_lat = float(positions[best_idx, 0])
-        solution_lng = float(positions[best_idx, 1])
-
-        # --- Step 5: Confidence ellipse from bottom-20 parcels ---
-        unc = confidence_ellipse(
-            positions, V,
-            solution_lat, solution_lng,
-            sigma=cfg.uncertainty_sigma,
+    def _weight_vector(self, weight_by_metric: dict[str, float], dtype) -> np.ndarray:
+        return np.array(
+            [weight_by_metric.get(k, 0.0) for k in self._metric_keys],
+            dtype=dtype,
         )
 
+    def _result(
+        self,
+        prep: _PreparedParcels,
+        V: np.ndarray,
+        best_idx: int,
+        convergence: dict[str, Any],
+        parcels_out: "list[dict[str, Any]] | None",
+        weight_vec: "np.ndarray | None" = None,
+    ) -> CogResult:
+        """
+        Ellipse + [0, 1] score normalisation shared by solve/solve_batch.
+        ``weight_vec`` (with ``prep.neighbours``) enables the bootstrap
+        ellipse when cfg.uncertainty_mode asks for it.
+        """
+        cfg = self.config
+        solution_lat = float(prep.positions[best_idx, 0])
+        solution_lng = float(prep.positions[best_idx, 1])
+
+        # --- Step 5: Confidence ellipse — bottom-20 parcels or bootstrap ---
+        if (cfg.uncertainty_mode == "bootstrap" and weight_vec is not None
+                and prep.neighbours is not None):
+            unc = bootstrap_uncertainty(
+                prep.positions, prep.pos_m, prep.normed, weight_vec,
+                prep.feasible_mask, prep.hazard_mask, cfg, V, best_idx,
+                prep.neighbours, proximity_field=prep.proximity,
+            )
+        else:
+            unc = confidence_ellipse(
+                prep.positions, V,
+                solution_lat, solution_lng,
+                sigma=cfg.uncertainty_sigma, pos_m=prep.pos_m,
+            )
+
         # Normalise scores to [0, 1] for the API response
         v_min  = V.min()
         v_max  = V.max()
         v_span = (v_max - v_min) if (v_max - v_min) > 1e-9 else 1.0
         scores_norm = (V - v_min) / v_span
 
-        for ni, parcel in enumerate(self.parcels):
-            parcel.score    = round(float(scores_norm[ni]), 4)
-            parcel.feasible = bool(feasible_mask[ni])
-
+        if parcels_out is None:
+            cols = self._columns()
+            zoning = np.asarray(cols["zoning_vocab"], dtype=object)[cols["zoning_idx"]]
+            parcels_out = [
+                {
+                    "id":       int(pid),
+                    "lat":      float(lat),
+                    "lng":      float(lng),
+                    "score":    round(float(score), 4),
+                    "feasible": bool(feas),
+                    "zoning":   str(zoning),
+                }
+                for pid, (lat, lng), score, feas, zoning in zip(
+                    cols["ids"].tolist(), prep.positions.tolist(),
+                    scores_norm.tolist(), prep.feasible_mask.tolist(),
+                    zoning.tolist(),
+                )
+            ]
+
+        cols = self._columns()
         return CogResult(
             lat=round(solution_lat, 7),
             lng=round(solution_lng, 7),
             uncertainty=unc,
             convergence=convergence,
             potential=round(float(scores_norm[best_idx]), 4),
-            feasible=bool(feasible_mask[best_idx]),
-            parcels=[p.to_dict() for p in self.parcels],
+            feasible=bool(prep.feasible_mask[best_idx]),
+            parcels=parcels_out,
+            parcel_arrays={
+                "ids":          cols["ids"],
+                "latlng":       prep.positions,
+                "scores":       scores_norm,
+                "feasible":     prep.feasible_mask,
+                "zoning_idx":   cols["zoning_idx"],
+                "zoning_vocab": cols["zoning_vocab"],
+            },
         )
 
+    def solve(
+        self,
+        include_parcels: bool = True,
+        progress: Optional[ProgressFn] = None,
+        top_k: int = 0,
+        min_separation_m: float = SITE_SEPARATION_M,
+    ) -> CogResult:
+        """
+        Run the full solve.  ``include_parcels=False`` leaves
+        ``CogResult.parcels`` empty (use ``parcel_arrays`` instead), skipping
+        the per-parcel dict construction.  ``progress`` is passed to
+        ``discrete_solve`` (restart-by-restart reporting).
+
+        ``top_k`` > 0 also fills ``CogResult.sites`` with up to ``top_k``
+        candidate sites at least ``min_separation_m`` apart, best first:
+        lat, lng, potential, feasible, basin_size (restarts that landed
+        there), spread_m and uncertainty (the covariance ellipse of those
+        landings about the site — how stable the site is across restarts).
+        They come from the same multi-start run — restarts are raised to
+        ``top_k × SITE_SEEDS_PER_SITE`` if cfg.n_restarts is lower — reduced
+        by ``distinct_sites``.
+        """
+        cfg  = self.config
+        prep = self._prepare(build_neighbours=cfg.uncertainty_mode == "bootstrap")
+        weight_vec = self._weight_vector(self._weight_by_metric, prep.normed.dtype)
+        if top_k > 0:
+            cfg = replace(cfg, n_restarts=max(cfg.n_restarts, top_k * SITE_SEEDS_PER_SITE))
+
+        # --- Steps 3+4: Score all parcels against the soft barrier field,
+        #     then run the multi-start tabu-enhanced discrete solver ---
+        V = _score_all(prep.normed, weight_vec, prep.feasible_mask,
+                       prep.hazard_mask, cfg, proximity_field=prep.proximity)
+        best_idx, convergence = discrete_solve(
+            prep.positions, prep.normed, weight_vec,
+            prep.feasible_mask, prep.hazard_mask, cfg,
+            proximity_field=prep.proximity, V=V, neighbours=prep.neighbours,
+            pos_m=prep.pos_m, progress=progress, keep_landings=top_k > 0,
+        )
+        landings = convergence.pop("landings", None)
+
+        result = self._result(
+            prep, V, best_idx, convergence,
+            parcels_out=None if include_parcels else [],
+            weight_vec=weight_vec,
+        )
+        if landings is not None:
+            scores = result.parcel_arrays["scores"]
+            result.sites = [
+                {
+                    "lat":         round(float(prep.positions[j, 0]), 7),
+                    "lng":         round(float(prep.positions[j, 1]), 7),
+                    "potential":   round(float(scores[j]), 4),
+                    "feasible":    bool(prep.feasible_mask[j]),
+                    "basin_size":  basin,
+                    "spread_m":    round(spread, 1),
+                    "uncertainty": ellipse,
+                }
+                for j, basin, spread, ellipse in distinct_sites(
+                    landings, V, prep.pos_m, top_k, min_separation_m,
+                    sigma=cfg.uncertainty_sigma,
+                )
+            ]
+        for parcel, out in zip(self.parcels, result.parcels):
+            parcel.score    = out["score"]
+            parcel.feasible = out["feasible"]
+        return result
+
+    def solve_tiled(
+        self,
+        tile_m: float = TILE_SIZE_M,
+        halo_m: float = TILE_HALO_M,
+        workers: Optional[int] = None,
+        include_parcels: bool = True,
+        progress: Optional[ProgressFn] = None,
+    ) -> CogResult:
+        """
+        Full solve via ``tiled_discrete_solve`` for parcel sets too large for
+        one neighbour index.  ``CogResult.tiles`` lists every tile's local
+        optimum (lat, lng, normalised potential, parcel / halo counts),
+        best first.  ``progress`` reports tile by tile.  The ellipse is
+        always the bottom-20 one: there is no global neighbour index to
+        bootstrap over, so cfg.uncertainty_mode "bootstrap" is rejected.
+        """
+        if self.config.uncertainty_mode == "bootstrap":
+            raise ValueError("bootstrap uncertainty is not supported for tiled solves")
+        prep = self._prepare()
+        cfg  = self.config
+        weight_vec = self._weight_vector(self._weight_by_metric, prep.normed.dtype)
+
+        V = _score_all(prep.normed, weight_vec, prep.feasible_mask,
+                       prep.hazard_mask, cfg, proximity_field=prep.proximity)
+        best_idx, convergence, optima = tiled_discrete_solve(
+            prep.positions, prep.normed, weight_vec,
+            prep.feasible_mask, prep.hazard_mask, cfg,
+            V=V, pos_m=prep.pos_m,
+            tile_m=tile_m, halo_m=halo_m, workers=workers, progress=progress,
+        )
+
+        result = self._result(
+            prep, V, best_idx, convergence,
+            parcels_out=None if include_parcels else [],
+        )
+        scores_norm = result.parcel_arrays["scores"]
+        result.tiles = [
+            {
+                "tile":         t["tile"],
+                "lat":          round(float(prep.positions[t["index"], 0]), 7),
+                "lng":          round(float(prep.positions[t["index"], 1]), 7),
+                "potential":    round(float(scores_norm[t["index"]]), 4),
+                "parcel_count": t["parcel_count"],
+                "halo_count":   t["halo_count"],
+                "in_core":      t["in_core"],
+                "converged":    t["converged"],
+            }
+            for t in sorted(optima, key=lambda t: -t["V"])
+        ]
+        return result
+
+    def solve_batch(
+        self,
+        weights_list: list[dict[str, float]],
+        include_parcels: bool = False,
+        progress: Optional[ProgressFn] = None,
+    ) -> list[CogResult]:
+        """
+        Solve one parcel set for several investor weight vectors.
+
+        The parcel matrix, proximity field and widest neighbour index are
+        built once; every profile is scored by a single (N,F)@(F,P) matmul
+        and ``discrete_solve`` then runs per profile on the shared structures.
+        The ``weights`` passed to the constructor are ignored here.
+
+        ``include_parcels`` — when False (default) each ``CogResult.parcels``
+        is empty, keeping the response O(P) rather than O(P·N).
+        ``progress`` is called as ``("profiles", done, total, iterations)``
+        after each profile.
+        """
+        prep = self._prepare(build_neighbours=True)
+        cfg  = self.config
+
+        weight_mat = np.stack(
+            [
+                self._weight_vector(self._metric_weights(w), prep.normed.dtype)
+                for w in weights_list
+            ],
+            axis=1,
+        )                                                    # (F, P)
+        V_all = _score_batch(prep.normed, weight_mat, prep.feasible_mask,
+                             prep.hazard_mask, cfg, proximity_field=prep.proximity)
+
+        results: list[CogResult] = []
+        iterations = 0
+        for pi in range(weight_mat.shape[1]):
+            V = np.ascontiguousarray(V_all[:, pi])
+            best_idx, convergence = discrete_solve(
+                prep.positions, prep.normed, weight_mat[:, pi],
+                prep.feasible_mask, prep.hazard_mask, cfg,
+                proximity_field=prep.proximity,
+                V=V, neighbours=prep.neighbours, pos_m=prep.pos_m,
+            )
+            results.append(self._result(
+                prep, V, best_idx, convergence,
+                parcels_out=None if include_parcels else [],
+                weight_vec=weight_mat[:, pi],
+            ))
+            if progress is not None:
+                iterations += convergence["iterations"]
+                progress("profiles", pi + 1, weight_mat.shape[1], iterations)
+        return results
+
 
 # ---------------------------------------------------------------------------
 #  DB loader  —  called by main.py's /api/cog/solve endpoint
@@ -1133,3 +2650,70 @@ def parcels_from_db(
         ))
 
     return parcels
+
+
+def parcels_to_columns(
+    parcels: list[Parcel],
+    metric_keys: "list[str] | None" = None,
+) -> dict[str, Any]:
+    """
+    Convert a Parcel list to the columnar layout consumed by
+    ``CentreOfGravitySolver.from_arrays`` (see
+    ``parcel_domain.fetch_parcel_columns``).  Missing / non-numeric metric
+    values become NaN and are imputed by the normaliser.
+    """
+    keys = list(metric_keys or WEIGHT_TO_METRIC.values())
+    N    = len(parcels)
+    return {
+        "ids":     np.fromiter((int(p.id) for p in parcels), dtype=np.int64, count=N),
+        "latlng":  np.array([[p.lat, p.lng] for p in parcels],
+                            dtype=np.float64).reshape(N, 2),
+        "metrics": np.array(
+            [[_to_float_nan(p.metrics.get(k)) for k in keys] for p in parcels],
+            dtype=np.float64,
+        ).reshape(N, len(keys)),
+        **dict(zip(("zoning_idx", "zoning_vocab"),
+                   encode_zoning([p.zoning for p in parcels]))),
+        "hazard":  np.fromiter((bool(p.hazard_flag) for p in parcels),
+                               dtype=np.bool_, count=N),
+    }
+
+
+# ── Categorical zoning ─────────────────────────────────────────────────────
+#
+# Zoning is held as small-int codes into a per-area vocabulary (in first-seen
+# order, original spelling).  A zoning_allow set then becomes a (V,) bool
+# lookup table built from V vocabulary strings, and feasibility for all N
+# parcels is one gather — lut[codes] — instead of N set lookups.
+
+def encode_zoning(zoning: "list[str] | np.ndarray") -> tuple[np.ndarray, tuple[str, ...]]:
+    """Encode zoning strings as ``(int16 codes (N,), vocabulary)``."""
+    lookup: dict[str, int] = {}
+    codes = np.fromiter(
+        (lookup.setdefault(str(z), len(lookup)) for z in zoning),
+        dtype=np.int16, count=len(zoning),
+    )
+    return codes, tuple(lookup)
+
+
+def zoning_feasible_mask(
+    zoning_idx: np.ndarray,
+    zoning_vocab: "tuple[str, ...] | list[str]",
+    zoning_allow: "set[str] | list[str]",
+) -> np.ndarray:
+    """(N,) bool feasibility mask: case-insensitive ``lut[codes]`` gather."""
+    allow = {z.lower() for z in zoning_allow}
+    lut   = np.fromiter(
+        (v.lower() in allow for v in zoning_vocab),
+        dtype=np.bool_, count=len(zoning_vocab),
+    )
+    return lut[zoning_idx]
+
+
+def zoning_present(
+    zoning_idx: np.ndarray,
+    zoning_vocab: "tuple[str, ...] | list[str]",
+) -> list[str]:
+    """Sorted lower-case zoning codes that occur in ``zoning_idx``."""
+    counts = np.bincount(zoning_idx, minlength=len(zoning_vocab))
+    return sorted({zoning_vocab[i].lower() for i in np.flatnonzero(counts)})
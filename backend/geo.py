@@ -0,0 +1,112 @@
+"""
+geo.py
+======
+Vectorised geodesy shared by every distance computation in the backend.
+
+Two distance models, one constant set
+--------------------------------------
+  project / metre_scale   Equirectangular lat/lng → metres about a reference
+                          latitude (by default the points' mean latitude).
+                          Exact enough within one metro area and cheap: one
+                          (N, 2) multiply.  The CoG solver projects each
+                          parcel set once (ParcelCacheEntry.pos_m) and every
+                          KD-tree, proximity field, seed spread, ascent step
+                          and ellipse reuses that array.
+  haversine_km            Great-circle distance for point-to-point queries
+                          that may span provinces (area lookup, matching
+                          properties, amenity distances).
+
+Both take scalars or NumPy arrays (broadcast) and return the matching shape;
+scalar inputs give a Python float.
+
+Public API
+----------
+  EARTH_RADIUS_KM, M_PER_DEG_LAT
+  reference_lat(latlng)                          -> float
+  metre_scale(ref_lat)                           -> (2,) ndarray
+  project(latlng, ref_lat=None, dtype=float64)   -> (N, 2) ndarray
+  haversine_km(lat1, lng1, lat2, lng2)           -> float | ndarray
+  bbox_around(lat, lng, radius_km)               -> (lat_min, lng_min, lat_max, lng_max)
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import numpy as np
+
+EARTH_RADIUS_KM: float = 6371.0
+M_PER_DEG_LAT:   float = 111_320.0     # metres per degree of latitude
+
+
+# ---------------------------------------------------------------------------
+#  Equirectangular projection
+# ---------------------------------------------------------------------------
+
+def reference_lat(latlng: np.ndarray) -> float:
+    """Mean latitude of an (N, 2) lat/lng array — the default projection origin."""
+    return float(np.mean(np.asarray(latlng)[:, 0]))
+
+
+def metre_scale(ref_lat: float) -> np.ndarray:
+    """(2,) metres per degree of (lat, lng) at ``ref_lat``."""
+    return np.array(
+        [M_PER_DEG_LAT, M_PER_DEG_LAT * math.cos(math.radians(ref_lat))],
+        dtype=np.float64,
+    )
+
+
+def project(
+    latlng: Any,
+    ref_lat: "float | None" = None,
+    dtype: Any = np.float64,
+) -> np.ndarray:
+    """
+    Equirectangular lat/lng → metre projection about ``ref_lat`` (default:
+    the points' mean latitude).  Accepts an (N, 2) or (2,) array-like and
+    returns a new array of the same shape in ``dtype``.
+
+    Points projected about the same ``ref_lat`` share one metre frame, so to
+    place query points in a parcel set's frame pass
+    ``ref_lat=reference_lat(positions)``.
+    """
+    pts = np.asarray(latlng, dtype=np.float64)
+    if ref_lat is None:
+        ref_lat = reference_lat(pts.reshape(-1, 2))
+    out = pts * metre_scale(ref_lat)
+    return out if dtype is np.float64 else out.astype(dtype, copy=False)
+
+
+# ---------------------------------------------------------------------------
+#  Great-circle distance
+# ---------------------------------------------------------------------------
+
+def haversine_km(lat1: Any, lng1: Any, lat2: Any, lng2: Any) -> Any:
+    """
+    Great-circle distance in km.  Arguments broadcast like NumPy arrays, so
+    one origin against M candidates is ``haversine_km(lat, lng, lats, lngs)``.
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = np.radians(np.subtract(lng2, lng1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    d = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return float(d) if np.ndim(d) == 0 else d
+
+
+# ---------------------------------------------------------------------------
+#  Bounding box
+# ---------------------------------------------------------------------------
+
+def bbox_around(
+    lat: float, lng: float, radius_km: float,
+) -> tuple[float, float, float, float]:
+    """(lat_min, lng_min, lat_max, lng_max) enclosing a radius about a point."""
+    lat_span = radius_km * 1000.0 / M_PER_DEG_LAT
+    lng_span = radius_km * 1000.0 / max(
+        M_PER_DEG_LAT * math.cos(math.radians(lat)), 1e-9,
+    )
+    return (lat - lat_span, lng - lng_span, lat + lat_span, lng + lng_span)
+
@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for the backend — picked up automatically when gunicorn is
+started from backend/ (render.yaml, Procfile).
+
+Database initialisation runs once, in the master before any worker forks,
+as ``flask --app main init-db`` in a child process (so the master never
+imports the app, scipy or numba).  Workers then import main with
+``DB_INIT_AT_IMPORT=0`` and are ready to serve without touching the DB.
+Set ``COG_LAZY_ACCEL=1`` as well to defer the solver's scipy / numba imports
+to the first CoG request.
+
+The CoG solver process pool (cog_executor.py) is per worker, not shared:
+each gunicorn worker starts its own ``COG_SOLVER_PROCESSES`` solver
+processes on its first solve, so a host runs workers × COG_SOLVER_PROCESSES
+of them.  Size the two together for the available cores (or set
+``COG_SOLVER_PROCESSES=0`` to solve on the worker's request thread).
+"""
+
+import os
+import subprocess
+import sys
+
+os.environ.setdefault("DB_INIT_AT_IMPORT", "0")
+
+
+def on_starting(server):
+    """Initialise the database once per deploy, before workers start."""
+    if os.environ["DB_INIT_AT_IMPORT"] != "0":
+        return                                   # workers initialise on import
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "main", "init-db"], cwd=here,
+    )
+    if proc.returncode != 0:
+        server.log.warning("DB init failed (exit %s); starting workers anyway",
+                           proc.returncode)
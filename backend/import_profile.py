@@ -0,0 +1,108 @@
+"""
+import_profile.py
+=================
+Where the backend's start-up time goes, for ``/api/cog/acceleration``.
+
+``importtime_summary(module)`` runs ``python -X importtime -c "import
+<module>"`` in a child process — with import-time DB initialisation off
+(``DB_INIT_AT_IMPORT=0``) and the caller's ``COG_LAZY_ACCEL`` setting — and
+reduces CPython's per-module report to the total and the most expensive
+top-level packages.  The child costs a second or two, so the summary is
+computed on request and cached for the life of the process.
+
+Public API
+----------
+  importtime_summary(module="main", top=15, refresh=False) -> dict
+  parse_importtime(report, module, top=15)                  -> dict
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any
+
+IMPORTTIME_TIMEOUT_S: float = 120.0
+
+# "import time:       123 |       4567 |   package.module"
+_LINE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+_cache: dict[str, dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def parse_importtime(report: str, module: str, top: int = 15) -> dict[str, Any]:
+    """
+    Summarise a ``-X importtime`` report: ``total_ms`` (cumulative time of
+    ``module``), ``modules`` (how many were imported) and ``top`` — the
+    ``top`` top-level packages by cumulative time, each
+    ``{name, self_ms, cumulative_ms}``.  A package imported at several
+    depths keeps its largest cumulative time.
+    """
+    total_us = 0
+    count    = 0
+    roots: dict[str, tuple[int, int]] = {}
+    for line in report.splitlines():
+        m = _LINE.match(line)
+        if m is None:
+            continue
+        self_us, cum_us, name = int(m.group(1)), int(m.group(2)), m.group(4)
+        count += 1
+        if name == module:
+            total_us = cum_us
+            continue
+        if "." in name:
+            continue
+        prev = roots.get(name)
+        if prev is None or cum_us > prev[1]:
+            roots[name] = (self_us, cum_us)
+
+    ranked = sorted(roots.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+    return {
+        "module":   module,
+        "total_ms": round(total_us / 1000, 1),
+        "modules":  count,
+        "top": [
+            {"name": name, "self_ms": round(s / 1000, 1),
+             "cumulative_ms": round(c / 1000, 1)}
+            for name, (s, c) in ranked
+        ],
+    }
+
+
+def importtime_summary(
+    module: str = "main", top: int = 15, refresh: bool = False,
+) -> dict[str, Any]:
+    """
+    ``parse_importtime`` of a fresh interpreter importing ``module`` from
+    this directory, plus ``wall_s`` (child run time) and ``lazy_accel``.
+    On failure returns ``{"module", "error"}`` (not cached).
+    """
+    with _lock:
+        if not refresh and module in _cache:
+            return _cache[module]
+
+        env = dict(os.environ, DB_INIT_AT_IMPORT="0")
+        here = os.path.dirname(os.path.abspath(__file__))
+        t0 = time.perf_counter()
+        try:
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=here, env=env, capture_output=True, text=True,
+                timeout=IMPORTTIME_TIMEOUT_S,
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            return {"module": module, "error": str(exc)}
+        if proc.returncode != 0:
+            tail = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+            return {"module": module, "error": f"import failed: {tail[0]}"}
+
+        summary = parse_importtime(proc.stderr, module, top)
+        summary["wall_s"]     = round(time.perf_counter() - t0, 3)
+        summary["lazy_accel"] = env.get("COG_LAZY_ACCEL", "0") == "1"
+        _cache[module] = summary
+        return summary
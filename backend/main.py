@@ -3,6 +3,14 @@ _venv_py = _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), "venv", "
 if _os.path.exists(_venv_py) and _os.path.abspath(sys.executable) != _os.path.abspath(_venv_py):
     _os.execv(_venv_py, [_venv_py] + sys.argv)
 
+from time import perf_counter as _perf_counter
+_MAIN_T0 = _perf_counter()
+# Start-up phases of this process, reported by /api/cog/acceleration:
+#   imports_s   the module's top-level imports
+#   module_s    the whole module (routes, app set-up, any DB init)
+#   db_init     {ran, ok, seconds, trigger} once initialisation has run
+_STARTUP = {'db_init': {'ran': False}}
+
 from flask import Flask, jsonify, request, send_file, Response
 from flask_cors import CORS
 from app_config import Config
@@ -12,28 +20,41 @@ from sqlalchemy import func, desc, and_, or_, text, inspect
 from datetime import datetime, date
 import os
 import tempfile
+import numpy as np
 from werkzeug.utils import secure_filename
 from cog_solver import (
-    CentreOfGravitySolver, SolverConfig,
+    SolverConfig,
     parcels_from_db, Parcel,
     WEIGHT_TO_METRIC,
-    _score_all, _build_neighbour_index, discrete_solve,
+    _score_all, discrete_solve,
     CogValidationError, validate_weights,
-    acceleration_info, warmup_jit,
+    acceleration_info, warmup_jit, LAZY_ACCEL,
+    parcels_to_columns, zoning_feasible_mask, zoning_present,
+    TILE_SIZE_M, TILE_HALO_M, SITE_SEPARATION_M,
 )
-from parcel_cache import parcel_cache, populate_from_parcels
-from parcel_domain import (
-    fetch_feasible_parcels,
-    fetch_all_parcels,
-    snapshots_to_parcels,
-    parcels_to_numpy,   # available for future vectorised endpoints
+from cog_payload import (
+    BINARY_MIMETYPE,
+    encode_binary,
+    parcel_columns,
+    parcels_as_columnar,
+    parcels_as_objects,
+    requested_format,
 )
+from geo import bbox_around, haversine_km
+from import_profile import importtime_summary
+from parcel_cache import parcel_cache, populate_from_columns
+from cog_executor import solver_executor, SolverBusy
+from cog_jobs import job_queue, JobError, JobQueueFull, JOB_TIMEOUT_S
+from cog_result_cache import CachedResult, result_cache, result_key
+from parcel_domain import fetch_parcel_columns, parcel_data_version
 
 try:
     from models import Property  # legacy optional model (may not exist in cleanup builds)
 except Exception:
     Property = None
 
+_STARTUP['imports_s'] = round(_perf_counter() - _MAIN_T0, 3)
+
 # ---------------------------------------------------------------------------
 #  CoG error helper
 # ---------------------------------------------------------------------------
@@ -52,19 +73,54 @@ def _cog_error(message: str, code: str, status: int = 400, **details):
         'details': details or {},
     }), status
 
+def _cog_busy_error(busy):
+    """429 SOLVER_BUSY when every solver process and queue slot is taken."""
+    resp, status = _cog_error(
+        "The CoG solver is busy. Please retry in a few seconds.",
+        "SOLVER_BUSY",
+        429,
+        max_concurrent=busy.limit,
+        queue_depth=busy.queue_depth,
+    )
+    resp.headers['Retry-After'] = '2'
+    return resp, status
+
+
+def _cog_timeout_error(area_id):
+    """504 SOLVER_TIMEOUT when a pooled solve outlives COG_SOLVER_TIMEOUT_S."""
+    return _cog_error(
+        "The CoG solve took too long and was abandoned.",
+        "SOLVER_TIMEOUT",
+        504,
+        area_id=area_id,
+        timeout_s=solver_executor.timeout_s,
+    )
+
 app = Flask(__name__)
 app.config.from_object(Config)
 db.init_app(app)
 
 # Pre-compile Numba JIT kernels in a background thread so the first CoG
-# solve request is not delayed by ~2 s of LLVM compilation.
+# solve request is not delayed by ~2 s of LLVM compilation (or load them from
+# the cog_kernels build bundle).  Under COG_LAZY_ACCEL the solver imports
+# scipy / numba on first use instead, and kernels compile on first call.
 import threading as _threading
-_threading.Thread(target=warmup_jit, daemon=True, name="numba-warmup").start()
-_accel = acceleration_info()
-app.logger.info(
-    "CoG solver acceleration: tier=%s (%s)",
-    _accel["tier"], _accel["tier_label"],
-)
+
+def _warmup_kernels():
+    warmup_jit()
+    kernels = acceleration_info()["kernels"]
+    app.logger.info(
+        "CoG solver kernels: %s in %ss",
+        kernels["source"], kernels.get("load_s"),
+    )
+
+if not LAZY_ACCEL:
+    _threading.Thread(target=_warmup_kernels, daemon=True, name="numba-warmup").start()
+    _accel = acceleration_info()
+    app.logger.info(
+        "CoG solver acceleration: tier=%s (%s)",
+        _accel["tier"], _accel["tier_label"],
+    )
 # Restrict CORS in production to known frontend domain; allow all in dev
 FrontendOrigin = os.getenv('FRONTEND_ORIGIN', 'https://digital-estate.vercel.app')
 is_prod = os.getenv('FLASK_ENV') == 'production'
@@ -119,6 +175,235 @@ def api_health():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# ---- Centre-of-Gravity shared loaders ----
+_DEFAULT_ZONING_ALLOW = ['residential', 'commercial', 'mixed', 'industrial', 'retail']
+
+
+def _area_centroid(area):
+    """Resolve an area's (lat, lng) from stored coordinates or lat/lng columns."""
+    area_lat, area_lng = -26.1076, 28.0567   # safe fallback (Sandton)
+    if area.coordinates:
+        try:
+            parts = str(area.coordinates).split(',')
+            area_lat, area_lng = float(parts[0].strip()), float(parts[1].strip())
+        except Exception:
+            pass
+
+    # Check for latitude/longitude columns (metrics schema)
+    for lat_col in ('latitude', 'lat'):
+        v = getattr(area, lat_col, None)
+        if v is not None:
+            try:
+                area_lat = float(v)
+            except Exception:
+                pass
+            break
+    for lng_col in ('longitude', 'lng'):
+        v = getattr(area, lng_col, None)
+        if v is not None:
+            try:
+                area_lng = float(v)
+            except Exception:
+                pass
+            break
+    return area_lat, area_lng
+
+
+# Parcel cap per solve.  Tiled solves (solver.tiled) bound neighbour-index
+# memory by tile size, so they may load metro-scale parcel sets.
+_COG_PARCEL_LIMIT = 2000
+_COG_TILED_PARCEL_LIMIT = 100_000
+
+# Most candidate sites a solve may ask for (solver.top_k).
+_MAX_TOP_K = 10
+
+
+def _load_cog_columns(area, area_id, zoning_allow, limit=_COG_PARCEL_LIMIT):
+    """
+    Load the solver's columnar parcel arrays for one area.
+
+    Returns ``(cols, data_source)`` using the first tier that has data:
+    parcel_snapshots → legacy Property rows → synthetic parcels built from
+    the latest area_statistics row.  ``cols`` is the
+    ``fetch_parcel_columns`` layout accepted by
+    ``CentreOfGravitySolver.from_arrays`` and ``populate_from_columns``.
+    """
+    area_lat, area_lng = _area_centroid(area)
+
+    # ── Fetch latest area statistics (used as fallback metrics) ──────────
+    area_stats = (
+        AreaStatistics.query
+        .filter(AreaStatistics.area_id == area_id)
+        .order_by(AreaStatistics.created_at.desc())
+        .first()
+    )
+
+    # ── Tier 1: parcel_snapshots table (fast, indexed, per-parcel metrics) ─
+    # Uses ix_ps_area_zoning_safe (partial, non-hazard) or
+    # ix_ps_area_zoning_hazard depending on the exclude_hazard flag.
+    # Columnar Core SELECT — no ORM rows or Parcel objects are created.
+    cols = fetch_parcel_columns(
+        area_id,
+        zoning_allow=zoning_allow,
+        exclude_hazard=True,   # skip hazard parcels by default
+        limit=limit,
+    )
+    if len(cols['ids']):
+        return cols, 'real'
+
+    # ── Tier 2: legacy Property rows (no per-parcel metrics) ──────────
+    # Uses area-level statistics to fill metric values for every parcel.
+    properties = (
+        Property.query
+        .filter(Property.area_id == area_id)
+        .limit(500)
+        .all()
+    ) if Property is not None else []
+    if properties:
+        parcels = parcels_from_db(properties, area_stats, area_lat, area_lng)
+        return parcels_to_columns(parcels), 'real'
+
+    # ── Tier 3: synthetic parcels from area_statistics ────────────
+    # Graceful degradation: still returns a meaningful CoG when no
+    # per-parcel data exists at all.
+    rng = np.random.default_rng(int(area_id))
+    zoning_choices = list(zoning_allow)
+
+    def _fs(attr, fallback, jitter=0.0):
+        v = float(getattr(area_stats, attr) or fallback) if area_stats else fallback
+        return v + float(rng.uniform(-jitter, jitter))
+
+    parcels = [
+        Parcel(
+            id=-(i + 1),
+            lat=area_lat + float(rng.uniform(-0.023, 0.023)),
+            lng=area_lng + float(rng.uniform(-0.023, 0.023)),
+            zoning=zoning_choices[i % len(zoning_choices)],
+            hazard_flag=False,
+            metrics={
+                'rental_yield':   _fs('rental_yield',    6.5,     1.0),
+                'price_per_m2':   _fs('price_per_sqm',   18000.0, 2000.0),
+                'vacancy':        _fs('vacancy_rate',    8.0,     2.0),
+                'transit_score':  _fs('transport_score', 55.0,    10.0),
+                'footfall_score': _fs('amenities_score', 55.0,    10.0),
+            },
+        )
+        for i in range(40)
+    ]
+    return parcels_to_columns(parcels), 'synthetic_from_area_stats'
+
+
+def _refresh_parcel_cache(area_id, stale):
+    """
+    Stale-while-revalidate reload for parcel_cache (runs on its refresh
+    thread): re-run the load that produced ``stale`` with the same zoning
+    filter and store the result.  Returns None if the area is gone.
+    """
+    with app.app_context():
+        area = Area.query.get(area_id)
+        if not area:
+            return None
+        zoning_allow = (
+            set(stale.zoning_allow) if stale.zoning_allow is not None
+            else set(_DEFAULT_ZONING_ALLOW)
+        )
+        version = parcel_cache.current_version(area_id)
+        cols, _ = _load_cog_columns(area, area_id, zoning_allow)
+        return populate_from_columns(area_id, cols, zoning_allow, version)
+
+
+def _probe_parcel_version(area_id):
+    """parcel_cache version probe: ``_cog_data_version`` in an app context."""
+    with app.app_context():
+        return _cog_data_version(area_id)
+
+
+parcel_cache.set_refresher(_refresh_parcel_cache)
+parcel_cache.set_version_probe(_probe_parcel_version)
+# Memoised solve results are derived from the area's parcels.
+parcel_cache.add_invalidation_listener(result_cache.invalidate_area)
+
+
+_UNCERTAINTY_MODES = ('bottom', 'bootstrap')
+
+
+def _solver_config_from(solver_opts):
+    """Build a SolverConfig from the optional ``solver`` request overrides."""
+    mode = solver_opts.get('uncertainty', 'bottom')
+    if mode not in _UNCERTAINTY_MODES:
+        raise _CogFailure(
+            f"solver.uncertainty must be one of {list(_UNCERTAINTY_MODES)}",
+            "INVALID_REQUEST", 400, uncertainty=mode,
+        )
+    return SolverConfig(
+        max_iter=int(solver_opts.get('max_iter', 200)),
+        tolerance=float(solver_opts.get('tolerance', 5e-6)),
+        alpha0=float(solver_opts.get('alpha0', 5e-4)),
+        damp_beta=float(solver_opts.get('damp_beta', 3e6)),
+        uncertainty_mode=mode,
+    )
+
+
+def _cog_format_from(body):
+    """
+    Validated ``format`` option for endpoints returning per-parcel scores.
+    Returns ``(fmt, None)`` or ``(None, error_response)``.
+    """
+    try:
+        return requested_format(body, request.args), None
+    except ValueError as exc:
+        return None, _cog_error(str(exc), "INVALID_FORMAT", 400)
+
+
+# Most previous landings a preview may pass back as warm-start seeds.
+_MAX_WARM_LANDINGS = 16
+
+
+def _cog_previous_from(body):
+    """
+    Warm-start points from a preview body's ``previous`` — the last result's
+    ``{lat, lng}`` and optionally its ``landings`` ([[lat, lng], ...]).
+    Returns ``(points, None)`` — an (M, 2) list, previous optimum first, or
+    None when absent — or ``(None, error_response)``.
+    """
+    prev = body.get('previous')
+    if prev is None:
+        return None, None
+
+    def _pair(p):
+        if (isinstance(p, (list, tuple)) and len(p) == 2
+                and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in p)):
+            return [float(p[0]), float(p[1])]
+        return None
+
+    head = _pair([prev.get('lat'), prev.get('lng')]) if isinstance(prev, dict) else None
+    landings = prev.get('landings', []) if isinstance(prev, dict) else None
+    tail = [_pair(p) for p in landings] if isinstance(landings, list) else [None]
+    if head is None or None in tail or len(tail) > _MAX_WARM_LANDINGS:
+        return None, _cog_error(
+            "previous must be {lat, lng} with optional landings "
+            f"(at most {_MAX_WARM_LANDINGS} [lat, lng] pairs)",
+            "INVALID_REQUEST",
+            400,
+        )
+    return [head] + tail, None
+
+
+def _cog_parcels_response(payload, cols, fmt):
+    """
+    Respond with ``payload`` plus the per-parcel ``cols``
+    (cog_payload.parcel_columns) encoded as ``fmt``: JSON objects (default),
+    JSON columnar arrays, or the binary layout with ``payload`` as header.
+    """
+    if fmt == 'binary':
+        return Response(encode_binary(payload, cols), mimetype=BINARY_MIMETYPE)
+    if fmt == 'columnar':
+        payload['parcels'] = parcels_as_columnar(cols)
+    else:
+        payload['parcels'] = parcels_as_objects(cols)
+    return jsonify(payload)
+
+
 # ---- Centre-of-Gravity solver endpoint ----
 @app.route('/api/cog/solve', methods=['POST'])
 def cog_solve():
@@ -143,8 +428,15 @@ def cog_solve():
           "max_iter": 200,
           "tolerance": 5e-6,
           "alpha0": 5e-4,
-          "damp_beta": 3e6
-      }
+          "damp_beta": 3e6,
+          "tiled": false,        // grid-tiled solve for metro-scale areas
+          "tile_m": 2000,        //   tile edge in metres
+          "halo_m": 250,         //   cross-border halo in metres
+          "top_k": 0,            // candidate sites to return (0-10)
+          "min_separation_m": 500, //   minimum spacing between sites
+          "uncertainty": "bottom"  // or "bootstrap" (see below)
+      },
+      "format": "objects"        // optional: objects | columnar | binary
     }
 
     Response
@@ -159,210 +451,634 @@ def cog_solve():
       "feasible": bool,
       "parcels": [ { id, lat, lng, score, feasible, zoning }, ... ]
     }
+
+    With "solver.tiled" up to 100 000 parcels are loaded (instead of 2000),
+    the parcel cache is bypassed, and the response adds "tiles": each tile's
+    local optimum { tile, lat, lng, potential, parcel_count, halo_count,
+    in_core, converged }, best first.
+
+    With "solver.top_k" the response adds "sites": up to top_k distinct
+    local optima at least min_separation_m apart, best first — { lat, lng,
+    potential, feasible, basin_size, spread_m, uncertainty }, where
+    basin_size counts the restarts that landed there and uncertainty is the
+    ellipse of those landings about the site ({ mode: "basin", … }).  They
+    come from the same multi-start run (restarts are raised to 4 per site);
+    the top-level lat / lng is the first site.
+
+    "uncertainty" is by default the ellipse of the 20 lowest-scoring parcels
+    about the solution.  With "solver.uncertainty": "bootstrap" it is the
+    spread of the solution over 32 re-solves with jittered weights and
+    resampled seeds, and adds { mode, n_boot, agreement } where agreement is
+    the share of re-solves landing within 500 m of the solution.  Tiled
+    solves do not support it (400 INVALID_REQUEST).
+
+    With "format": "columnar" ``parcels`` is an object of flat arrays; with
+    "binary" the response is application/vnd.digitalestate.cog+binary (see
+    cog_payload.py) whose JSON header carries the scalar fields above.
+
+    The solve itself runs on the solver process pool (cog_executor.py).
+    When every process and queue slot is taken the endpoint answers
+    429 SOLVER_BUSY with a Retry-After header; a solve that outlives
+    COG_SOLVER_TIMEOUT_S answers 504 SOLVER_TIMEOUT.
     """
     try:
         body = request.get_json(force=True, silent=True) or {}
-        area_id = body.get('area_id')
-        if not area_id:
-            return jsonify({'success': False, 'error': 'area_id required'}), 400
+        fmt, fmt_error = _cog_format_from(body)
+        if fmt_error:
+            return fmt_error
+        try:
+            spec = _cog_solve_spec(body)
+            # Memoised on the canonical inputs and revalidated against the
+            # area's current parcel data version (see _cog_solve_key).
+            key    = _cog_solve_key(spec)
+            cached = result_cache.get(key, parcel_cache.current_version(spec['area_id']))
+            hit    = cached is not None
+            if not hit:
+                cached = _cog_solve_run(spec)
+                result_cache.put(key, cached)
+        except _CogFailure as f:
+            return f.response()
+        except SolverBusy as busy:
+            return _cog_busy_error(busy)
+        except TimeoutError:
+            return _cog_timeout_error(spec['area_id'])
+        payload = dict(cached.payload, cache_hit=hit)
+        return _cog_parcels_response(payload, cached.parcel_cols, fmt)
 
-        raw_weights = body.get('weights', {
-            'rentalYield': 25, 'pricePerSqm': 25,
-            'vacancy': 20, 'transitProximity': 15, 'footfall': 15,
-        })
-        constraints = body.get('constraints', {})
-        solver_opts = body.get('solver', {})
+    except CogValidationError as ve:
+        return _cog_error(str(ve), ve.code, 422, **ve.details)
+    except Exception as e:
+        import traceback
+        app.logger.exception("Unhandled error in /cog/solve for area_id=%s", body.get('area_id'))
+        return _cog_error(
+            "An unexpected error occurred. Please try again.",
+            "SOLVER_FAILED",
+            500,
+        )
 
-        # ── Validate weight vector ────────────────────────────────────────
-        ok, err_msg, err_code, err_details = validate_weights(raw_weights)
-        if not ok:
-            return _cog_error(err_msg, err_code, 400, **err_details)
 
-        # Default zoning: allow all unless specified
-        zoning_allow = set(constraints.get(
-            'zoning_allow',
-            ['residential', 'commercial', 'mixed', 'industrial', 'retail']
-        ))
+class _CogFailure(Exception):
+    """
+    A CoG request that cannot be served, raised by the shared solve helpers
+    and rendered by ``response()``: a ``_cog_error`` body when ``code`` is
+    set, else the legacy ``{'success': False, 'error': ...}`` shape.
+    """
 
-        # Load real data from DB
-        area = Area.query.get(area_id)
-        if not area:
-            return jsonify({'success': False, 'error': 'Area not found'}), 404
+    def __init__(self, message, code=None, status=400, **details):
+        super().__init__(message)
+        self.message = message
+        self.code    = code
+        self.status  = status
+        self.details = details
+
+    def response(self):
+        if self.code is None:
+            return jsonify({'success': False, 'error': self.message}), self.status
+        return _cog_error(self.message, self.code, self.status, **self.details)
+
+
+def _cog_solver_failure(se, area_id, **details):
+    """Map a solver exception (other than busy / timeout) to a _CogFailure."""
+    if isinstance(se, CogValidationError):
+        return _CogFailure(str(se), se.code, 422, **details, **se.details)
+    import numpy as _np
+    if isinstance(se, _np.linalg.LinAlgError):
+        return _CogFailure(
+            "Numerical error in solver (degenerate parcel distribution).",
+            "SOLVER_NUMERICAL_ERROR",
+            500,
+            internal=str(se),
+        )
+    app.logger.exception("Unexpected solver error for area_id=%s", area_id)
+    return _CogFailure(
+        "Solver failed unexpectedly. Please try again.",
+        "SOLVER_FAILED",
+        500,
+    )
 
-        # Resolve area centroid from stored coordinates or statistics
-        area_lat, area_lng = -26.1076, 28.0567   # safe fallback (Sandton)
-        if area.coordinates:
-            try:
-                parts = str(area.coordinates).split(',')
-                area_lat, area_lng = float(parts[0].strip()), float(parts[1].strip())
-            except Exception:
-                pass
 
-        # Check for latitude/longitude columns (metrics schema)
-        for lat_col in ('latitude', 'lat'):
-            v = getattr(area, lat_col, None)
-            if v is not None:
-                try:
-                    area_lat = float(v)
-                except Exception:
-                    pass
-                break
-        for lng_col in ('longitude', 'lng'):
-            v = getattr(area, lng_col, None)
-            if v is not None:
-                try:
-                    area_lng = float(v)
-                except Exception:
-                    pass
-                break
+def _is_finite_number(value, minimum, inclusive=True):
+    """True for a finite int / float (not bool) >= ``minimum`` (> if not ``inclusive``)."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    if not np.isfinite(value):
+        return False
+    return value >= minimum if inclusive else value > minimum
 
-        # ── Fetch latest area statistics (used as fallback metrics) ──────────
-        area_stats = (
-            AreaStatistics.query
-            .filter(AreaStatistics.area_id == area_id)
-            .order_by(AreaStatistics.created_at.desc())
-            .first()
+
+def _cog_solve_spec(body):
+    """
+    Validate a /api/cog/solve body (minus ``format``) into the spec that
+    ``_cog_solve_run`` executes.  Raises _CogFailure.
+    """
+    area_id = body.get('area_id')
+    if not area_id:
+        raise _CogFailure('area_id required')
+
+    raw_weights = body.get('weights', {
+        'rentalYield': 25, 'pricePerSqm': 25,
+        'vacancy': 20, 'transitProximity': 15, 'footfall': 15,
+    })
+    constraints = body.get('constraints', {})
+    solver_opts = body.get('solver', {})
+
+    # ── Validate weight vector ────────────────────────────────────────
+    ok, err_msg, err_code, err_details = validate_weights(raw_weights)
+    if not ok:
+        raise _CogFailure(err_msg, err_code, 400, **err_details)
+
+    # Default zoning: allow all unless specified
+    zoning_allow = set(constraints.get('zoning_allow', _DEFAULT_ZONING_ALLOW))
+
+    area = Area.query.get(area_id)
+    if not area:
+        raise _CogFailure('Area not found', status=404)
+
+    tiled = bool(solver_opts.get('tiled', False))
+    top_k = solver_opts.get('top_k', 0)
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or not 0 <= top_k <= _MAX_TOP_K:
+        raise _CogFailure(
+            f"solver.top_k must be an integer from 0 to {_MAX_TOP_K}",
+            "INVALID_REQUEST", 400, top_k=top_k, maximum=_MAX_TOP_K,
+        )
+    if top_k and tiled:
+        raise _CogFailure(
+            "solver.top_k cannot be combined with solver.tiled — tiled solves "
+            "report each tile's optimum in 'tiles'",
+            "INVALID_REQUEST", 400,
+        )
+    if tiled and solver_opts.get('uncertainty') == 'bootstrap':
+        raise _CogFailure(
+            "solver.uncertainty 'bootstrap' cannot be combined with "
+            "solver.tiled — tiled solves report the bottom-20 ellipse",
+            "INVALID_REQUEST", 400,
+        )
+    tile_m = solver_opts.get('tile_m', TILE_SIZE_M)
+    if tiled and not _is_finite_number(tile_m, minimum=0.0, inclusive=False):
+        raise _CogFailure(
+            "solver.tile_m must be a positive number of metres",
+            "INVALID_REQUEST", 400, tile_m=tile_m,
+        )
+    halo_m = solver_opts.get('halo_m', TILE_HALO_M)
+    if tiled and not _is_finite_number(halo_m, minimum=0.0):
+        raise _CogFailure(
+            "solver.halo_m must be a non-negative number of metres",
+            "INVALID_REQUEST", 400, halo_m=halo_m,
+        )
+    min_sep = solver_opts.get('min_separation_m', SITE_SEPARATION_M)
+    if not isinstance(min_sep, (int, float)) or isinstance(min_sep, bool) or min_sep < 0:
+        raise _CogFailure(
+            "solver.min_separation_m must be a non-negative number of metres",
+            "INVALID_REQUEST", 400, min_separation_m=min_sep,
+        )
+    return {
+        'area':         area,
+        'area_id':      area_id,
+        'weights':      raw_weights,
+        'zoning_allow': zoning_allow,
+        'config':       _solver_config_from(solver_opts),
+        'tiled':        tiled,
+        'tile_m':       float(tile_m) if tiled else None,
+        'halo_m':       float(halo_m) if tiled else None,
+        'top_k':        top_k,
+        'min_separation_m': float(min_sep) if top_k else None,
+    }
+
+
+def _cog_solve_key(spec, data_version=None):
+    """
+    result_cache key for a ``_cog_solve_spec``: area, weights normalised as
+    the solver does, sorted zoning_allow, every SolverConfig field and the
+    tiling and top-K options.  /api/cog/solve passes no data version: its
+    results carry the version they were solved at instead, checked by
+    ``result_cache.get`` and by the parcel_cache invalidation listener.
+    """
+    return result_key(
+        spec['area_id'], 'solve', spec['weights'], spec['zoning_allow'],
+        spec['config'], data_version,
+        tiled=spec['tiled'], tile_m=spec['tile_m'], halo_m=spec['halo_m'],
+        top_k=spec['top_k'], min_separation_m=spec['min_separation_m'],
+    )
+
+
+def _cog_solve_run(spec, progress=None, wait=None, timeout=None):
+    """
+    Load parcels and solve one ``_cog_solve_spec``; return a CachedResult
+    whose payload is the /api/cog/solve response minus ``parcels``.
+    Raises _CogFailure, SolverBusy or TimeoutError.
+    """
+    area_id, zoning_allow, tiled = spec['area_id'], spec['zoning_allow'], spec['tiled']
+
+    # Load real data from DB (version first: a racing write is caught later)
+    version = parcel_cache.current_version(area_id)
+    cols, data_source = _load_cog_columns(
+        spec['area'], area_id, zoning_allow,
+        limit=_COG_TILED_PARCEL_LIMIT if tiled else _COG_PARCEL_LIMIT,
+    )
+    n_parcels = len(cols['ids'])
+
+    # ── Populate parcel cache (used by /cog/preview) ──────────────────
+    # populate_from_columns fits the QuantileNormaliser once so that
+    # preview requests for this area skip all DB I/O and normalisation;
+    # the solver below reuses the same fitted bounds (transform only).
+    # Tiled solves skip the cache: a metro-scale entry would exceed the
+    # byte budget, and the solver fits its own normaliser.
+    cache_entry = None if tiled else populate_from_columns(
+        area_id, cols, zoning_allow, version,
+    )
+
+    # ── Guard: must have at least 3 parcels ────────────────────────────
+    if n_parcels < 3:
+        raise _CogFailure(
+            f"Area has too few parcels ({n_parcels}) for a meaningful solve.",
+            "INSUFFICIENT_PARCELS",
+            422,
+            parcel_count=n_parcels,
+            minimum=3,
+            data_source=data_source,
         )
 
-        # ── Tier 1: parcel_snapshots table (fast, indexed, per-parcel metrics) ─
-        # Uses ix_ps_area_zoning_safe (partial, non-hazard) or
-        # ix_ps_area_zoning_hazard depending on the exclude_hazard flag.
-        snap_rows = fetch_feasible_parcels(
-            area_id,
-            zoning_allow=zoning_allow,
-            exclude_hazard=True,   # skip hazard parcels by default
-            limit=2000,
+    # ── Guard: at least 1 parcel must pass the zoning filter ───────────
+    if not zoning_feasible_mask(cols['zoning_idx'], cols['zoning_vocab'], zoning_allow).any():
+        raise _CogFailure(
+            "All parcels are excluded by the current zoning filter. "
+            "Allow at least one zoning category.",
+            "ALL_ZONING_FILTERED",
+            422,
+            zoning_allow=sorted(zoning_allow),
+            parcel_zonings=zoning_present(cols['zoning_idx'], cols['zoning_vocab']),
         )
-        if snap_rows:
-            parcels = snapshots_to_parcels(snap_rows)
-            data_source = 'real'
 
-        else:
-            # ── Tier 2: legacy Property rows (no per-parcel metrics) ──────────
-            # Uses area-level statistics to fill metric values for every parcel.
-            properties = (
-                Property.query
-                .filter(Property.area_id == area_id)
-                .limit(500)
-                .all()
-            ) if Property is not None else []
-            if properties:
-                parcels = parcels_from_db(properties, area_stats, area_lat, area_lng)
-                data_source = 'real'
+    # Parcel dicts are built by the caller only if the objects format asks.
+    mode_opts = {'include_parcels': False}
+    if tiled:
+        mode_opts.update(tile_m=spec['tile_m'], halo_m=spec['halo_m'])
+    elif spec['top_k']:
+        mode_opts.update(top_k=spec['top_k'], min_separation_m=spec['min_separation_m'])
 
-            else:
-                # ── Tier 3: synthetic parcels from area_statistics ────────────
-                # Graceful degradation: still returns a meaningful CoG when no
-                # per-parcel data exists at all.
-                import numpy as np
-                rng = np.random.default_rng(int(area_id))
-                zoning_choices = list(zoning_allow)
-
-                def _fs(attr, fallback, jitter=0.0):
-                    v = float(getattr(area_stats, attr) or fallback) if area_stats else fallback
-                    return v + float(rng.uniform(-jitter, jitter))
-
-                parcels = [
-                    Parcel(
-                        id=-(i + 1),
-                        lat=area_lat + float(rng.uniform(-0.023, 0.023)),
-                        lng=area_lng + float(rng.uniform(-0.023, 0.023)),
-                        zoning=zoning_choices[i % len(zoning_choices)],
-                        hazard_flag=False,
-                        metrics={
-                            'rental_yield':   _fs('rental_yield',    6.5,     1.0),
-                            'price_per_m2':   _fs('price_per_sqm',   18000.0, 2000.0),
-                            'vacancy':        _fs('vacancy_rate',    8.0,     2.0),
-                            'transit_score':  _fs('transport_score', 55.0,    10.0),
-                            'footfall_score': _fs('amenities_score', 55.0,    10.0),
-                        },
-                    )
-                    for i in range(40)
-                ]
-                data_source = 'synthetic_from_area_stats'
+    try:
+        # Runs on the solver process pool; inputs go via shared memory.
+        result = solver_executor.run(
+            cols, spec['weights'], zoning_allow,
+            config=spec['config'],
+            normaliser=cache_entry.normaliser() if cache_entry else None,
+            mode='tiled' if tiled else 'solve',
+            progress=progress, wait=wait, timeout=timeout,
+            **mode_opts,
+        )
+    except (SolverBusy, TimeoutError):
+        raise
+    except Exception as se:
+        raise _cog_solver_failure(se, area_id) from se
+
+    parcel_cols = parcel_columns(**result.parcel_arrays)
+    payload = {
+        'success': True,
+        'lat': result.lat,
+        'lng': result.lng,
+        'uncertainty': result.uncertainty,
+        'convergence': result.convergence,
+        'potential': result.potential,
+        'feasible': result.feasible,
+        'parcel_count': int(parcel_cols['ids'].shape[0]),
+        'data_source': data_source,
+    }
+    if result.tiles is not None:
+        payload['tiles'] = result.tiles
+    if result.sites is not None:
+        payload['sites'] = result.sites
+    return CachedResult(int(area_id), payload, parcel_cols, data_version=version)
 
-        # ── Populate parcel cache (used by /cog/preview) ──────────────────
-        # populate_from_parcels fits the QuantileNormaliser once so that
-        # preview requests for this area skip all DB I/O and normalisation.
-        populate_from_parcels(area_id, parcels)
 
-        # ── Guard: must have at least 3 parcels ────────────────────────────
-        if len(parcels) < 3:
-            return _cog_error(
-                f"Area has too few parcels ({len(parcels)}) for a meaningful solve.",
-                "INSUFFICIENT_PARCELS",
-                422,
-                parcel_count=len(parcels),
-                minimum=3,
-                data_source=data_source,
+# ── Centre-of-Gravity BATCH endpoint ──────────────────────────────────────
+_MAX_BATCH_PROFILES = 16
+
+
+def _batch_profiles_from(body):
+    """
+    Resolve the request's profile list to ``[(key, weights), ...]``.
+
+    Accepts ``profiles`` (keys into _INVESTOR_PROFILES and/or
+    ``{key, weights}`` objects) or ``weights`` (a bare list of weight dicts).
+    Defaults to every investor profile.
+    """
+    known = {p['key']: p['weights'] for p in _INVESTOR_PROFILES}
+    if 'weights' in body:
+        raw = body.get('weights')
+        if not isinstance(raw, list):
+            raise CogValidationError(
+                "weights must be a list of weight objects",
+                code="INVALID_WEIGHTS",
             )
+        return [(f'profile_{i}', w) for i, w in enumerate(raw)]
 
-        # ── Guard: at least 1 parcel must pass the zoning filter ───────────
-        _zoning_lower = {z.lower() for z in zoning_allow}
-        feasible_count = sum(1 for p in parcels if p.zoning.lower() in _zoning_lower)
-        if feasible_count == 0:
-            return _cog_error(
-                "All parcels are excluded by the current zoning filter. "
-                "Allow at least one zoning category.",
-                "ALL_ZONING_FILTERED",
-                422,
-                zoning_allow=sorted(zoning_allow),
-                parcel_zonings=sorted({p.zoning.lower() for p in parcels}),
+    raw = body.get('profiles') or list(known)
+    if not isinstance(raw, list):
+        raise CogValidationError(
+            "profiles must be a list", code="INVALID_WEIGHTS",
+        )
+    out = []
+    for i, item in enumerate(raw):
+        if isinstance(item, str):
+            if item not in known:
+                raise CogValidationError(
+                    f"Unknown investor profile: {item}",
+                    code="INVALID_WEIGHTS",
+                    details={'profile': item, 'expected_keys': sorted(known)},
+                )
+            out.append((item, known[item]))
+        elif isinstance(item, dict):
+            out.append((str(item.get('key', f'profile_{i}')), item.get('weights')))
+        else:
+            raise CogValidationError(
+                "profiles entries must be profile keys or {key, weights} objects",
+                code="INVALID_WEIGHTS",
             )
+    return out
+
+
+@app.route('/api/cog/solve-batch', methods=['POST'])
+def cog_solve_batch():
+    """
+    POST /api/cog/solve-batch
+
+    Solve one area for several investor weight vectors in a single request.
+    The parcel matrix, proximity field and neighbour index are built once
+    and shared; all profiles are scored with one (N,F)@(F,P) matmul.
 
-        # Build solver config from optional overrides
-        cfg = SolverConfig(
-            max_iter=int(solver_opts.get('max_iter', 200)),
-            tolerance=float(solver_opts.get('tolerance', 5e-6)),
-            alpha0=float(solver_opts.get('alpha0', 5e-4)),
-            damp_beta=float(solver_opts.get('damp_beta', 3e6)),
+    Body (JSON)
+    -----------
+    {
+      "area_id": <int>,
+      "profiles": ["balanced", "valueInvestor",
+                   {"key": "custom", "weights": { ... }}],   // optional
+      "weights":  [ { "rentalYield": 30, ... }, ... ],       // alternative
+      "constraints": { "zoning_allow": [...] },              // optional
+      "solver": { "max_iter": 200, ... },                    // optional
+      "include_parcels": false                               // optional
+    }
+
+    ``profiles`` defaults to every entry of /api/profiles.
+
+    Response
+    --------
+    {
+      "success": true,
+      "results": [ { key, lat, lng, uncertainty, convergence,
+                     potential, feasible, [parcels] }, ... ],
+      "parcel_count": int,
+      "data_source": str
+    }
+    """
+    try:
+        body = request.get_json(force=True, silent=True) or {}
+        try:
+            spec    = _cog_batch_spec(body)
+            cached  = _cog_batch_run(spec)
+        except _CogFailure as f:
+            return f.response()
+        except SolverBusy as busy:
+            return _cog_busy_error(busy)
+        except TimeoutError:
+            return _cog_timeout_error(spec['area_id'])
+        return jsonify(cached.payload)
+
+    except CogValidationError as ve:
+        return _cog_error(str(ve), ve.code, 422, **ve.details)
+    except Exception:
+        app.logger.exception("Unhandled error in /cog/solve-batch for area_id=%s", body.get('area_id'))
+        return _cog_error(
+            "An unexpected error occurred. Please try again.",
+            "SOLVER_FAILED",
+            500,
+        )
+
+
+def _cog_batch_spec(body):
+    """Validate a /api/cog/solve-batch body into a ``_cog_batch_run`` spec."""
+    area_id = body.get('area_id')
+    if not area_id:
+        raise _CogFailure('area_id required')
+
+    try:
+        profiles = _batch_profiles_from(body)
+    except CogValidationError as ve:
+        raise _CogFailure(str(ve), ve.code, 400, **ve.details)
+    if not profiles or len(profiles) > _MAX_BATCH_PROFILES:
+        raise _CogFailure(
+            f"Batch must contain between 1 and {_MAX_BATCH_PROFILES} profiles.",
+            "INVALID_WEIGHTS",
+            400,
+            profile_count=len(profiles),
+            maximum=_MAX_BATCH_PROFILES,
         )
+    for key, weights in profiles:
+        ok, err_msg, err_code, err_details = validate_weights(weights)
+        if not ok:
+            raise _CogFailure(f"{key}: {err_msg}", err_code, 400,
+                              profile=key, **err_details)
+
+    constraints  = body.get('constraints', {})
+    solver_opts  = body.get('solver', {})
+
+    area = Area.query.get(area_id)
+    if not area:
+        raise _CogFailure('Area not found', status=404)
 
-        solver = CentreOfGravitySolver(
-            parcels=parcels,
-            weights=raw_weights,
-            zoning_allow=zoning_allow,
-            config=cfg,
+    return {
+        'area':            area,
+        'area_id':         area_id,
+        'profiles':        profiles,
+        'zoning_allow':    set(constraints.get('zoning_allow', _DEFAULT_ZONING_ALLOW)),
+        'config':          _solver_config_from(solver_opts),
+        'include_parcels': bool(body.get('include_parcels', False)),
+    }
+
+
+def _cog_batch_run(spec, progress=None, wait=None, timeout=None):
+    """
+    Load parcels and solve one ``_cog_batch_spec``; return a CachedResult
+    whose payload is the full /api/cog/solve-batch response.
+    Raises _CogFailure, SolverBusy or TimeoutError.
+    """
+    area_id, zoning_allow = spec['area_id'], spec['zoning_allow']
+    profiles, include_parcels = spec['profiles'], spec['include_parcels']
+
+    version = parcel_cache.current_version(area_id)
+    cols, data_source = _load_cog_columns(spec['area'], area_id, zoning_allow)
+    cache_entry = populate_from_columns(area_id, cols, zoning_allow, version)
+
+    try:
+        results = solver_executor.run(
+            cols, profiles[0][1], zoning_allow,
+            config=spec['config'],
+            normaliser=cache_entry.normaliser(),
+            mode='batch',
+            progress=progress, wait=wait, timeout=timeout,
+            weights_list=[w for _, w in profiles],
+            include_parcels=include_parcels,
         )
+    except (SolverBusy, TimeoutError):
+        raise
+    except Exception as se:
+        raise _cog_solver_failure(se, area_id, data_source=data_source) from se
+
+    out = []
+    for (key, _), result in zip(profiles, results):
+        item = {
+            'key':         key,
+            'lat':         result.lat,
+            'lng':         result.lng,
+            'uncertainty': result.uncertainty,
+            'convergence': result.convergence,
+            'potential':   result.potential,
+            'feasible':    result.feasible,
+        }
+        if include_parcels:
+            item['parcels'] = result.parcels
+        out.append(item)
+
+    return CachedResult(int(area_id), {
+        'success':      True,
+        'results':      out,
+        'parcel_count': len(cols['ids']),
+        'data_source':  data_source,
+    })
+
+
+# ── Centre-of-Gravity async JOBS ──────────────────────────────────────────
+# Tiers 2–3 can only be revalidated as well as their tables are stamped:
+# a legacy Property model without ``updated_at`` cannot reveal in-place
+# price edits, so its fingerprint also rolls over every this many seconds —
+# the short TTL caches had before data versioning.
+_UNSTAMPED_DATA_TTL_S = float(os.getenv('COG_UNSTAMPED_DATA_TTL_S', '300'))
 
+
+def _cog_data_version(area_id):
+    """
+    Fingerprint of every input ``_load_cog_columns`` may read for an area:
+    parcel_snapshots rows, plus the latest area_statistics row (id, created
+    and updated stamps) and, when there are no snapshots, the legacy
+    Property rows used by tier 2 — count, max id and max updated_at, or a
+    ``_UNSTAMPED_DATA_TTL_S`` time bucket where the model has no such column.
+    """
+    version = parcel_data_version(area_id)
+    stats = (
+        db.session.query(AreaStatistics.id, AreaStatistics.created_at,
+                         AreaStatistics.updated_at)
+        .filter(AreaStatistics.area_id == area_id)
+        .order_by(AreaStatistics.created_at.desc())
+        .first()
+    )
+    parts = [f"ps={version}", f"st={stats[0]}@{stats[1]}/{stats[2]}" if stats else "st=-"]
+    if version.startswith('0:') and Property is not None:
+        stamp_col = getattr(Property, 'updated_at', None)
+        count, max_id, stamp = db.session.query(
+            func.count(Property.id), func.max(Property.id),
+            func.max(stamp_col) if stamp_col is not None else text('NULL'),
+        ).filter(Property.area_id == area_id).one()
+        if stamp_col is None and count:
+            stamp = f"t{int(datetime.now().timestamp() // _UNSTAMPED_DATA_TTL_S)}"
+        parts.append(f"pr={count}:{max_id or 0}:{stamp or '-'}")
+    return ';'.join(parts)
+
+
+def _cog_job_run(runner, spec, progress):
+    """Job-thread body: re-bind the area in a fresh app context and solve."""
+    with app.app_context():
+        area = Area.query.get(spec['area_id'])
+        if not area:
+            raise JobError('Area not found', 'AREA_NOT_FOUND', 404)
         try:
-            result = solver.solve()
-        except CogValidationError as ve:
-            return _cog_error(str(ve), ve.code, 422, **ve.details)
-        except Exception as se:
-            import numpy as _np
-            if isinstance(se, _np.linalg.LinAlgError):
+            return runner(
+                dict(spec, area=area), progress=progress,
+                wait=JOB_TIMEOUT_S, timeout=JOB_TIMEOUT_S,
+            )
+        except _CogFailure as f:
+            raise JobError(f.message, f.code or 'INVALID_REQUEST', f.status, f.details)
+        except SolverBusy as busy:
+            raise JobError(
+                "The CoG solver stayed busy; resubmit the job.",
+                "SOLVER_BUSY", 429,
+                {'max_concurrent': busy.limit, 'queue_depth': busy.queue_depth},
+            )
+        except TimeoutError:
+            raise JobError(
+                "The CoG solve took too long and was abandoned.",
+                "SOLVER_TIMEOUT", 504, {'timeout_s': JOB_TIMEOUT_S},
+            )
+
+
+@app.route('/api/cog/jobs', methods=['POST'])
+def cog_job_submit():
+    """
+    POST /api/cog/jobs
+
+    Enqueue a solve that may outlive the request timeout.
+
+    Body (JSON)
+    -----------
+    { "kind": "solve" | "batch",     // optional, default "solve"
+      ...                            // the /api/cog/solve or
+    }                                // /api/cog/solve-batch body
+
+    Response — 202 Accepted (200 if the result was already cached)
+    --------
+    { "success": true, "job": { job_id, kind, area_id, status, cached,
+                                progress, ... },
+      "poll": "/api/cog/jobs/<job_id>" }
+
+    Results are cached by a hash of (area_id, weights, zoning_allow,
+    solver config, parcel data version); an identical submission returns a
+    finished job at once, and one matching a pending job returns that job.
+    429 SOLVER_BUSY when COG_JOB_QUEUE jobs are already pending.
+    """
+    try:
+        body = request.get_json(force=True, silent=True) or {}
+        kind = body.get('kind', 'solve')
+        try:
+            if kind == 'solve':
+                spec   = _cog_solve_spec(body)
+                runner = _cog_solve_run
+                key    = _cog_solve_key(spec, _cog_data_version(spec['area_id']))
+            elif kind == 'batch':
+                spec   = _cog_batch_spec(body)
+                runner = _cog_batch_run
+                key    = result_key(
+                    spec['area_id'], 'batch', spec['profiles'], spec['zoning_allow'],
+                    spec['config'], _cog_data_version(spec['area_id']),
+                    include_parcels=spec['include_parcels'],
+                )
+            else:
                 return _cog_error(
-                    "Numerical error in solver (degenerate parcel distribution).",
-                    "SOLVER_NUMERICAL_ERROR",
-                    500,
-                    internal=str(se),
+                    f"Unknown job kind: {kind}.", "INVALID_JOB_KIND", 400,
+                    kind=kind, allowed=['solve', 'batch'],
                 )
-            app.logger.exception("Unexpected solver error for area_id=%s", area_id)
-            return _cog_error(
-                "Solver failed unexpectedly. Please try again.",
-                "SOLVER_FAILED",
-                500,
+        except _CogFailure as f:
+            return f.response()
+
+        try:
+            job = job_queue.submit(
+                kind, spec['area_id'], key,
+                lambda progress: _cog_job_run(runner, spec, progress),
+            )
+        except JobQueueFull as full:
+            resp, status = _cog_error(
+                "Too many CoG jobs are pending. Please retry shortly.",
+                "SOLVER_BUSY",
+                429,
+                max_pending=full.limit,
             )
+            resp.headers['Retry-After'] = '5'
+            return resp, status
 
-        return jsonify({
-            'success': True,
-            'lat': result.lat,
-            'lng': result.lng,
-            'uncertainty': result.uncertainty,
-            'convergence': result.convergence,
-            'potential': result.potential,
-            'feasible': result.feasible,
-            'parcels': result.parcels,
-            'parcel_count': len(result.parcels),
-            'data_source': data_source,
-        })
+        poll = f"/api/cog/jobs/{job.job_id}"
+        resp = jsonify({'success': True, 'job': job.to_dict(), 'poll': poll})
+        resp.headers['Location'] = poll
+        return resp, (200 if job.finished else 202)
 
-    except CogValidationError as ve:
-        return _cog_error(str(ve), ve.code, 422, **ve.details)
-    except Exception as e:
-        import traceback
-        app.logger.exception("Unhandled error in /cog/solve for area_id=%s", body.get('area_id'))
+    except Exception:
+        app.logger.exception("Unhandled error in /cog/jobs for area_id=%s", body.get('area_id'))
         return _cog_error(
             "An unexpected error occurred. Please try again.",
             "SOLVER_FAILED",
@@ -370,6 +1086,36 @@ def cog_solve():
         )
 
 
+@app.route('/api/cog/jobs/<job_id>', methods=['GET'])
+def cog_job_status(job_id):
+    """
+    GET /api/cog/jobs/<job_id>[?format=objects|columnar|binary]
+
+    While queued / running: { "success": true, "job": { status, progress:
+    { stage, done, total, iterations }, elapsed_s, ... } } — stage is
+    "loading", then "seeds" (restart k of n), "tiles" or "profiles".
+
+    Once done: the /api/cog/solve (or /api/cog/solve-batch) response with
+    the "job" object added; ``format`` applies to solve jobs as on
+    /api/cog/solve.  A failed job carries ``job.error`` { error, code,
+    status, details }.
+    """
+    fmt, fmt_error = _cog_format_from({})
+    if fmt_error:
+        return fmt_error
+    job = job_queue.get(job_id)
+    if job is None:
+        return _cog_error("Job not found or expired.", "JOB_NOT_FOUND", 404, job_id=job_id)
+
+    status = job.to_dict()
+    if job.status != 'done':
+        return jsonify({'success': True, 'job': status})
+    payload = dict(job.result.payload, job=status)
+    if job.kind == 'solve':
+        return _cog_parcels_response(payload, job.result.parcel_cols, fmt)
+    return jsonify(payload)
+
+
 # ── Centre-of-Gravity PREVIEW endpoint ────────────────────────────────────
 @app.route('/api/cog/preview', methods=['POST'])
 def cog_preview():
@@ -399,7 +1145,10 @@ def cog_preview():
     {
       "area_id": <int>,
       "weights": { "rentalYield": 30, ... },
-      "constraints": { "zoning_allow": ["commercial", "mixed"] }
+      "constraints": { "zoning_allow": ["commercial", "mixed"] },
+      "previous": { "lat": float, "lng": float,      // optional warm start:
+                    "landings": [[lat, lng], ...] }  //   the last response
+      "format": "objects"   // optional: objects | columnar | binary
     }
 
     Response
@@ -409,9 +1158,20 @@ def cog_preview():
       "lat": float,
       "lng": float,
       "potential": float,
+      "iterations": int,
+      "landings": [[lat, lng], ...],   (distinct restart landings, best first)
       "parcels": [ { id, lat, lng, score, feasible } ],
-      "cache_hit": bool
+      "cache_hit": bool,
+      "cache_stale": bool   (served past the cache TTL; a refresh is running)
     }
+
+    "format" selects the ``parcels`` encoding exactly as for /cog/solve.
+
+    Warm start: during a slider drag pass the previous response's lat, lng
+    and landings back as "previous" (or a /cog/solve lat / lng).  The
+    restarts then resume from those parcels instead of fresh seeds, so
+    successive 5-iteration previews keep climbing toward the /cog/solve
+    optimum, and the previous optimum is kept when no restart beats it.
     """
     try:
         body = request.get_json(force=True, silent=True) or {}
@@ -424,85 +1184,37 @@ def cog_preview():
             'vacancy': 20, 'transitProximity': 15, 'footfall': 15,
         })
         zoning_allow = set(
-            body.get('constraints', {}).get(
-                'zoning_allow',
-                ['residential', 'commercial', 'mixed', 'industrial', 'retail'],
-            )
+            body.get('constraints', {}).get('zoning_allow', _DEFAULT_ZONING_ALLOW)
         )
+        fmt, fmt_error = _cog_format_from(body)
+        if fmt_error:
+            return fmt_error
+        previous, prev_error = _cog_previous_from(body)
+        if prev_error:
+            return prev_error
 
         # ── 1. Try cache first ──────────────────────────────────────────
-        import numpy as np
         entry    = parcel_cache.get(area_id)
         cache_hit = entry is not None
 
         if not cache_hit:
             # Cache miss: run a minimal load exactly like /cog/solve does,
-            # then populate_from_parcels so subsequent previews are fast.
-            area = Area.query.get(area_id)
-            if not area:
+            # then populate_from_columns so subsequent previews are fast.
+            # get_or_load is single-flight: concurrent misses for this area
+            # wait on one load instead of each querying the database.
+            def _load_area():
+                area = Area.query.get(area_id)
+                if not area:
+                    return None
+                version = parcel_cache.current_version(area_id)
+                cols, _ = _load_cog_columns(area, area_id, zoning_allow)
+                return populate_from_columns(area_id, cols, zoning_allow, version)
+
+            entry = parcel_cache.get_or_load(area_id, _load_area)
+            if entry is None:
                 return jsonify({'success': False, 'error': 'Area not found'}), 404
 
-            area_lat, area_lng = -26.1076, 28.0567
-            if area.coordinates:
-                try:
-                    parts = str(area.coordinates).split(',')
-                    area_lat = float(parts[0].strip())
-                    area_lng = float(parts[1].strip())
-                except Exception:
-                    pass
-
-            area_stats = (
-                AreaStatistics.query
-                .filter(AreaStatistics.area_id == area_id)
-                .order_by(AreaStatistics.created_at.desc())
-                .first()
-            )
-
-            snap_rows = fetch_feasible_parcels(
-                area_id, zoning_allow=zoning_allow,
-                exclude_hazard=True, limit=2000,
-            )
-            if snap_rows:
-                raw_parcels = snapshots_to_parcels(snap_rows)
-            else:
-                props = (
-                    Property.query
-                    .filter(Property.area_id == area_id)
-                    .limit(500)
-                    .all()
-                ) if Property is not None else []
-                if props:
-                    raw_parcels = parcels_from_db(props, area_stats, area_lat, area_lng)
-                else:
-                    rng = np.random.default_rng(int(area_id))
-                    zc  = list(zoning_allow)
-
-                    def _fs2(attr, fb, jit=0.0):
-                        v = float(getattr(area_stats, attr) or fb) if area_stats else fb
-                        return v + float(rng.uniform(-jit, jit))
-
-                    raw_parcels = [
-                        Parcel(
-                            id=-(i + 1),
-                            lat=area_lat + float(rng.uniform(-0.023, 0.023)),
-                            lng=area_lng + float(rng.uniform(-0.023, 0.023)),
-                            zoning=zc[i % len(zc)],
-                            hazard_flag=False,
-                            metrics={
-                                'rental_yield':   _fs2('rental_yield',    6.5,     1.0),
-                                'price_per_m2':   _fs2('price_per_sqm',   18000.0, 2000.0),
-                                'vacancy':        _fs2('vacancy_rate',    8.0,     2.0),
-                                'transit_score':  _fs2('transport_score', 55.0,    10.0),
-                                'footfall_score': _fs2('amenities_score', 55.0,    10.0),
-                            },
-                        )
-                        for i in range(40)
-                    ]
-
-            entry = populate_from_parcels(area_id, raw_parcels)
-
         # ── 2. Build weight vector from cache entry key order ───────────
-        import numpy as np
         total_w = sum(abs(v) for v in raw_weights.values()) or 1.0
         weight_vec = np.array(
             [
@@ -531,50 +1243,61 @@ def cog_preview():
                 "ALL_ZONING_FILTERED",
                 422,
                 zoning_allow=sorted(zoning_allow),
-                parcel_zonings=sorted(set(entry.zoning_codes)),
+                parcel_zonings=entry.parcel_zonings(),
             )
 
         # ── 4. Score all parcels (one matrix multiply, ~10 µs) ─────────
+        # The soft barrier field is cached on the entry per zoning filter,
+        # so preview scores the same V surface /cog/solve does.
         from cog_solver import SolverConfig as _SC, K_NEIGHBOURS
         cfg_preview = _SC(max_iter=5, k_neighbours=min(K_NEIGHBOURS, entry.n_parcels - 1))
+        prox = entry.proximity_field(zoning_allow, cfg_preview)
         V = _score_all(
             entry.normed, weight_vec,
             feasible_mask, entry.hazard_flags,
-            cfg_preview,
+            cfg_preview, proximity_field=prox,
         )
 
         # ── 5. Shallow discrete solve (max 5 iterations) ────────────────
-        best_idx, _ = discrete_solve(
+        # Reuses V and the cached metre projection + k-NN index, so no
+        # KD-tree work happens on the request path.  A "previous" result
+        # is snapped to parcels and used as warm-start seeds.
+        k_wide = cfg_preview.k_neighbours * cfg_preview.k_expand_factor
+        warm = entry.nearest(previous) if previous is not None else None
+        best_idx, convergence = discrete_solve(
             entry.positions, entry.normed, weight_vec,
             feasible_mask, entry.hazard_flags,
             cfg_preview,
+            proximity_field=prox,
+            V=V,
+            neighbours=entry.neighbour_index(k_wide),
+            pos_m=entry.pos_m,
+            tree=entry.kdtree,
+            keep_landings=True,
+            warm_start=warm,
         )
+        landings = np.unique(convergence['landings'])
+        landings = landings[np.argsort(-V[landings], kind='stable')]
 
         # ── 6. Normalise scores to [0, 1] ───────────────────────────────
         v_min   = float(V.min())
         v_span  = float(V.max() - v_min) or 1.0
         scores_norm = (V - v_min) / v_span
 
-        parcels_out = [
-            {
-                'id':       int(entry.parcel_ids[i]),
-                'lat':      float(entry.positions[i, 0]),
-                'lng':      float(entry.positions[i, 1]),
-                'score':    round(float(scores_norm[i]), 4),
-                'feasible': bool(feasible_mask[i]),
-                'zoning':   entry.zoning_codes[i],
-            }
-            for i in range(entry.n_parcels)
-        ]
-
-        return jsonify({
+        parcel_cols = parcel_columns(
+            entry.parcel_ids, entry.positions, scores_norm, feasible_mask,
+            entry.zoning_idx, entry.zoning_vocab,
+        )
+        return _cog_parcels_response({
             'success':   True,
             'lat':       round(float(entry.positions[best_idx, 0]), 7),
             'lng':       round(float(entry.positions[best_idx, 1]), 7),
             'potential': round(float(scores_norm[best_idx]), 4),
-            'parcels':   parcels_out,
+            'iterations': convergence['iterations'],
+            'landings':  np.round(entry.positions[landings], 7).tolist(),
             'cache_hit': cache_hit,
-        })
+            'cache_stale': entry.stale,
+        }, parcel_cols, fmt)
 
     except CogValidationError as ve:
         return _cog_error(str(ve), ve.code, 422, **ve.details)
@@ -590,28 +1313,60 @@ def cog_preview():
 # ── Cache stats endpoint (dev / health tool) ──────────────────────────────
 @app.route('/api/cog/cache-stats', methods=['GET'])
 def cog_cache_stats():
-    """Return current parcel-cache statistics (hit rate, entry count, etc.)."""
-    return jsonify({'success': True, 'cache': parcel_cache.stats()})
+    """
+    Return current parcel-cache statistics: hit rate, entry count, resident
+    bytes against the byte budget, and per-area entry sizes; the solve
+    result memo (hits, misses, invalidations); the solver process pool's
+    load (in flight, completed, rejected as busy) and the async job queue.
+    """
+    return jsonify({
+        'success':  True,
+        'cache':    parcel_cache.stats(),
+        'results':  result_cache.stats(),
+        'executor': solver_executor.stats(),
+        'jobs':     job_queue.stats(),
+    })
 
 
 # ── Acceleration info endpoint (dev / monitoring tool) ──────────────────
 @app.route('/api/cog/acceleration', methods=['GET'])
 def cog_acceleration():
-    """Report which computation backend the solver is using."""
-    return jsonify({'success': True, 'acceleration': acceleration_info()})
+    """
+    Report which computation backend the solver is using and this process's
+    start-up phases.  ``?importtime=1`` adds a ``python -X importtime``
+    summary of importing main (measured once in a child process, then
+    cached).
+    """
+    payload = {
+        'success':      True,
+        'acceleration': acceleration_info(),
+        'startup':      _STARTUP,
+    }
+    if request.args.get('importtime', '').lower() in ('1', 'true', 'yes'):
+        payload['importtime'] = importtime_summary('main')
+    return jsonify(payload)
 
 
 # ── CoG Matching Properties endpoint ─────────────────────────────────────────
-import math as _math
-
-def _haversine_km(lat1, lng1, lat2, lng2):
-    """Return great-circle distance in km between two (lat, lng) points."""
-    R = 6371.0
-    phi1, phi2 = _math.radians(lat1), _math.radians(lat2)
-    dphi  = _math.radians(lat2 - lat1)
-    dlam  = _math.radians(lng2 - lng1)
-    a = _math.sin(dphi / 2) ** 2 + _math.cos(phi1) * _math.cos(phi2) * _math.sin(dlam / 2) ** 2
-    return R * 2 * _math.atan2(_math.sqrt(a), _math.sqrt(1 - a))
+def _area_latlngs(rows, coords_of):
+    """
+    Parse each row's "lat,lng" coordinates string; rows that do not parse
+    are skipped.  Returns (rows, lats, lngs) aligned for one vectorised
+    ``haversine_km`` call.
+    """
+    kept, lats, lngs = [], [], []
+    for r in rows:
+        try:
+            parts = [p.strip() for p in str(coords_of(r)).split(',')]
+            if len(parts) < 2:
+                continue
+            a_lat, a_lng = float(parts[0]), float(parts[1])
+        except (TypeError, ValueError):
+            continue
+        kept.append(r)
+        lats.append(a_lat)
+        lngs.append(a_lng)
+    return kept, lats, lngs
 
 
 @app.route('/api/cog/matching-properties', methods=['POST'])
@@ -649,17 +1404,12 @@ def cog_matching_properties():
 
         # 2. Determine which area IDs are within radius; record distance
         area_dist = {}
-        for a in areas:
-            try:
-                parts = a.coordinates.split(',')
-                if len(parts) < 2:
-                    continue
-                a_lat, a_lng = float(parts[0]), float(parts[1])
-                d = _haversine_km(cog_lat, cog_lng, a_lat, a_lng)
+        areas, lats, lngs = _area_latlngs(areas, lambda a: a.coordinates)
+        if areas:
+            dists = haversine_km(cog_lat, cog_lng, np.asarray(lats), np.asarray(lngs))
+            for a, d in zip(areas, dists):
                 if d <= radius_km:
-                    area_dist[a.id] = {'name': a.name, 'distance_km': round(d, 2)}
-            except Exception:
-                continue
+                    area_dist[a.id] = {'name': a.name, 'distance_km': round(float(d), 2)}
 
         if not area_dist:
             return jsonify({'success': True, 'count': 0, 'properties': [],
@@ -1489,7 +2239,6 @@ def areas_nearest():
 
     Uses Python-side Haversine so it works on both SQLite and PostgreSQL.
     """
-    import math
     try:
         try:
             lat = float(request.args['lat'])
@@ -1513,27 +2262,14 @@ def areas_nearest():
         with db.engine.connect() as conn:
             rows = conn.execute(sql).mappings().all()
 
-        def haversine(lat1, lng1, lat2, lng2):
-            R = 6371.0  # Earth radius km
-            dlat = math.radians(lat2 - lat1)
-            dlng = math.radians(lng2 - lng1)
-            a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng/2)**2
-            return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
         best = None
         best_dist = float('inf')
-        for r in rows:
-            try:
-                parts = [p.strip() for p in str(r['coordinates']).split(',')]
-                if len(parts) != 2:
-                    continue
-                a_lat, a_lng = float(parts[0]), float(parts[1])
-                dist = haversine(lat, lng, a_lat, a_lng)
-                if dist < best_dist:
-                    best_dist = dist
-                    best = {'row': r, 'lat': a_lat, 'lng': a_lng, 'dist_km': dist}
-            except Exception:
-                continue
+        rows, lats, lngs = _area_latlngs(rows, lambda r: r['coordinates'])
+        if rows:
+            dists = haversine_km(lat, lng, np.asarray(lats), np.asarray(lngs))
+            i = int(np.argmin(dists))
+            best_dist = float(dists[i])
+            best = {'row': rows[i], 'lat': lats[i], 'lng': lngs[i], 'dist_km': best_dist}
 
         if best is None or best_dist > radius_km:
             return jsonify({'success': False, 'error': 'No area found within radius', 'radius_km': radius_km}), 404
@@ -3257,12 +3993,15 @@ def initialize_database():
             print(f"Database initialization error: {e}")
             raise  # propagate so _initialize_with_retry can retry on transient SSL errors
 
-def _initialize_with_retry(max_attempts=3, delay=3):
+def _initialize_with_retry(max_attempts=3, delay=3, trigger='import'):
     """Call initialize_database() with retry on transient Postgres SSL/network errors."""
     import time
+    t0 = time.perf_counter()
+    _STARTUP['db_init'] = {'ran': True, 'ok': False, 'trigger': trigger}
     for attempt in range(1, max_attempts + 1):
         try:
             initialize_database()
+            _STARTUP['db_init'].update(ok=True, seconds=round(time.perf_counter() - t0, 3))
             return
         except Exception as exc:
             msg = str(exc)
@@ -3287,9 +4026,24 @@ def _initialize_with_retry(max_attempts=3, delay=3):
                 delay *= 2  # exponential backoff
             else:
                 print(f"❌ DB init failed after {attempt} attempt(s): {exc}")
+                _STARTUP['db_init']['seconds'] = round(time.perf_counter() - t0, 3)
                 return
 
-_initialize_with_retry()
+# DB initialisation runs here unless DB_INIT_AT_IMPORT=0, in which case run
+# it once with ``flask --app main init-db`` — gunicorn.conf.py does that
+# before forking, so workers and serverless cold starts skip it.
+DB_INIT_AT_IMPORT = os.getenv('DB_INIT_AT_IMPORT', '1') != '0'
+if DB_INIT_AT_IMPORT:
+    _initialize_with_retry()
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Ensure core tables and dev seed data (the import-time DB init)."""
+    if not _STARTUP['db_init']['ran']:
+        _initialize_with_retry(trigger='cli')
+    if not _STARTUP['db_init']['ok']:
+        sys.exit(1)
 
 # ================= MATERIALIZED VIEW MAINTENANCE ENDPOINT ==================
 
@@ -4801,13 +5555,12 @@ def area_amenity_density(area_id):
             # Could check memcached or db here if desired
             pass
         
-        # Build bbox from area coordinates (simple approach: ±0.02 degrees ≈ 2km)
+        # Build bbox from area coordinates: ±2 km about the area centre
         lat, lng = area.get_coordinates()
         if not (lat and lng):
             return jsonify({'success': False, 'error': 'Area has no coordinates'}), 400
         
-        span = 0.02  # degrees
-        bbox = (lat - span, lng - span, lat + span, lng + span)
+        bbox = bbox_around(lat, lng, 2.0)
         
         # Compute densities from Overpass
         amenities = compute_amenity_density(area_id, bbox)
@@ -4828,6 +5581,8 @@ def area_amenity_density(area_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+_STARTUP['module_s'] = round(_perf_counter() - _MAIN_T0, 3)
+
 if __name__ == '__main__':
     debug_mode = os.getenv('FLASK_ENV') != 'production'
     port = int(os.getenv('PORT', 5050))
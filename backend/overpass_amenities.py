@@ -8,7 +8,8 @@ from OpenStreetMap, normalizes per km², and scores 0-100.
 import requests
 import logging
 from typing import Dict, List, Optional, Tuple, Any
-from math import radians, sin, cos, sqrt, atan2
+
+from geo import bbox_around, haversine_km
 
 logger = logging.getLogger(__name__)
 
@@ -24,22 +25,13 @@ AMENITY_QUERIES = {
 }
 
 
-def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Distance in km between two lat/lng points."""
-    R = 6371.0  # Earth radius km
-    lat1, lng1, lat2, lng2 = map(radians, [lat1, lng1, lat2, lng2])
-    dlat = lat2 - lat1
-    dlng = lng2 - lng1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlng / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c
-
-
-def area_from_bbox(lat_min: float, lat_max: float, lng_min: float, lng_max: float) -> float:
-    """Approximate area in km² for a lat/lng bbox (simple spherical model)."""
-    # Distance in degrees per km at equator ≈ 0.009
-    lat_span_km = haversine_distance(lat_min, 0, lat_max, 0)
-    lng_span_km = haversine_distance(0, lng_min, 0, lng_max)
+def area_from_bbox(lat_min: float, lng_min: float, lat_max: float, lng_max: float) -> float:
+    """Approximate area in km² for a (lat_min, lng_min, lat_max, lng_max) bbox."""
+    # Width measured along the mid-latitude, where a degree of longitude
+    # spans cos(lat) of its equatorial length.
+    mid_lat = (lat_min + lat_max) / 2
+    lat_span_km = haversine_km(lat_min, lng_min, lat_max, lng_min)
+    lng_span_km = haversine_km(mid_lat, lng_min, mid_lat, lng_max)
     return lat_span_km * lng_span_km
 
 
@@ -187,11 +179,8 @@ def update_area_amenities_from_osm(db_session: Any, area_id: int,
     """
     from area_models import AreaAmenity
     
-    # Build bbox: approximate ±radius_km around center
-    lat_span = radius_km / 111.0  # 1 degree ≈ 111 km
-    lng_span = radius_km / (111.0 * cos(radians(lat)))
-    
-    bbox = (lat - lat_span, lng - lng_span, lat + lat_span, lng + lng_span)
+    # Build bbox: ±radius_km around center
+    bbox = bbox_around(lat, lng, radius_km)
     
     # Clear old amenities for this area (optional)
     db_session.query(AreaAmenity).filter_by(area_id=area_id).delete()
@@ -200,7 +189,7 @@ def update_area_amenities_from_osm(db_session: Any, area_id: int,
     for amenity_type in AMENITY_QUERIES.keys():
         amenities = query_overpass(bbox, amenity_type)
         for entry in amenities[:50]:  # Cap at 50 per type to avoid bloat
-            dist_km = haversine_distance(lat, lng, entry['lat'], entry['lng'])
+            dist_km = haversine_km(lat, lng, entry['lat'], entry['lng'])
             amenity = AreaAmenity(
                 area_id=area_id,  # type: ignore
                 amenity_type=amenity_type,  # type: ignore
@@ -1,7 +1,8 @@
 """
 parcel_cache.py
 ===============
-Thread-safe in-memory LRU cache of pre-processed parcel arrays.
+Thread-safe LRU cache of pre-processed parcel arrays, shared across worker
+processes through memory-mapped .npy files.
 
 Purpose
 -------
@@ -12,8 +13,11 @@ that a preview request only needs to:
 
   1. Build a weight vector  (~1 µs)
   2. Recompute feasible_mask from zoning_allow  (~1 µs for N=2000)
-  3. Run _score_all (one matrix multiply)  (~10 µs for N=2000)
+  3. Run _score_all (one matrix multiply)  (~10 µs for N=2000) with the
+     soft barrier field cached on the entry for this zoning filter
   4. Run discrete_solve with max_iter=5  (~100 µs for N=2000, k=20)
+     against the cached metre projection and k-NN index — no KD-tree
+     build or query on the request path.
 
 Total estimated preview latency: 10–30 ms round-trip on Render's free tier.
 
@@ -21,38 +25,134 @@ Cache design
 ------------
 * Key   : area_id  (int or str — hashed to int on insert)
 * Value : ParcelCacheEntry dataclass (see below)
-* Size  : max MAX_ENTRIES areas (LRU eviction)
-* TTL   : entries expire after TTL_SECONDS (default 5 min)
+* Size  : max MAX_ENTRIES areas and MAX_BYTES of array data (LRU eviction;
+          whichever bound is hit first — see ParcelCacheEntry.nbytes)
+* Version: each entry carries the ``data_version`` of the rows it was
+          built from (parcel_domain.parcel_data_version — one index-only
+          aggregate).  With a probe registered (``set_version_probe``) ``get``
+          re-reads the area's version at most every REVALIDATE_SECONDS and
+          drops the area's older copies — entry, shared copy and, through
+          the invalidation listeners, derived results — as soon as it
+          differs, so new ETL data is picked up within seconds and unchanged
+          areas are never reloaded on a timer.  An entry stamped with a
+          version other than the last probe is re-probed at once before
+          anything is dropped: the probe may be the side that is behind
+* TTL   : entries expire after TTL_SECONDS (default 6 h — only a backstop
+          now that entries are revalidated); an expired entry is still
+          served, flagged ``stale``, for up to STALE_SECONDS more while one
+          background refresh per area reloads it (needs a refresher — see
+          ``set_refresher``)
+* Miss  : ``get_or_load`` is single-flight per area — concurrent misses
+          wait on one loader call instead of each querying Postgres
 * Lock  : threading.RLock() — safe for Gunicorn threaded workers
 
+Cross-process sharing
+---------------------
+Gunicorn starts several worker processes, each with its own module-level
+``parcel_cache``.  So that one worker's populate warms every worker, ``put``
+also writes the entry's arrays to ``COG_CACHE_DIR`` (default
+``$TMPDIR/digitalestate_cog_cache``; set it to an empty string to disable):
+
+  COG_CACHE_DIR/
+    area_<id>.json           small index: area_id, version, data_version,
+                             created_at (wall clock), metric_keys,
+                             normaliser_state and the shape/dtype of every
+                             array
+    area_<id>/<version>/     positions.npy, normed.npy, hazard_flags.npy,
+                             parcel_ids.npy, zoning_idx.npy, pos_m.npy,
+                             neighbours.npy  (zoning_vocab lives in the
+                             index file)
+
+The index file is written last and swapped in with ``os.replace``, so a
+reader never sees a half-written version.  ``get`` in any worker consults
+the index — one ``os.stat``, reparsed only when the file changed — and on
+a version it has not seen maps the arrays with
+``np.load(mmap_mode="c")`` — every worker reads the same page-cache pages
+(copy-on-write, never copied unless written).  The KD-tree is not stored;
+``ParcelCacheEntry.neighbour_index`` rebuilds it lazily if a wider index is
+ever requested.  ``invalidate`` deletes the index file, which every worker
+sees on its next ``get``.  Any filesystem error degrades to the per-process
+cache and is counted in ``stats()["shared_errors"]``.
+
 Public API
 ----------
   get(area_id)                -> ParcelCacheEntry | None
+  get_or_load(area_id, loader) -> ParcelCacheEntry | None
+  set_refresher(fn)           -> None   (fn(area_id, stale_entry) → entry)
+  set_version_probe(fn)       -> None   (fn(area_id) → data version str)
+  current_version(area_id)    -> str | None  (probe, at most every
+                                             REVALIDATE_SECONDS per area)
+  add_invalidation_listener(fn) -> None (fn(area_id) on invalidate)
   put(area_id, entry)         -> None
   invalidate(area_id)         -> None
   populate_from_parcels(area_id, parcel_list) -> ParcelCacheEntry
-  stats()                     -> dict   (for /api/health debugging)
+  populate_from_columns(area_id, cols, zoning_allow=None,
+                        data_version=None) -> ParcelCacheEntry
+  stats()                     -> dict   (for /api/health debugging;
+                                         includes the shared store's areas)
 """
 
 from __future__ import annotations
 
+import json
+import os
+import shutil
+import sys
+import tempfile
 import time
 import threading
+import uuid
 from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
 
 from cog_solver import (
     WEIGHT_TO_METRIC,
+    K_NEIGHBOURS,
     QuantileNormaliser,
     Parcel,
+    SolverConfig,
+    _build_kdtree,
+    _build_neighbour_index,
+    _compute_proximity_field,
+    nearest_parcels,
+    encode_zoning,
+    parcels_to_columns,
+    zoning_feasible_mask,
+    zoning_present,
 )
+from geo import project
 
 # ── Config ─────────────────────────────────────────────────────────────────
 MAX_ENTRIES: int   = 50      # maximum number of areas cached at once
-TTL_SECONDS: float = 300.0   # 5 minutes
+# Byte budget for cached array data (0 disables byte-based eviction).  A
+# 2000-parcel area is ~1 MB with its neighbour index, a synthetic one ~20 kB,
+# so this rather than MAX_ENTRIES is the bound that tracks real memory use.
+MAX_BYTES: int     = int(os.getenv("COG_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTL_SECONDS: float = float(os.getenv("COG_CACHE_TTL_S", str(6 * 3600)))
+STALE_SECONDS: float = 3600.0   # serve-stale window past TTL while refreshing
+# Minimum interval between data-version probes for one area.
+REVALIDATE_SECONDS: float = float(os.getenv("COG_CACHE_REVALIDATE_S", "30"))
+
+# Directory for the cross-process array store ("" disables sharing).
+SHARED_DIR: str = os.getenv(
+    "COG_CACHE_DIR", os.path.join(tempfile.gettempdir(), "digitalestate_cog_cache")
+)
+
+# Superseded version directories are removed once older than this, which
+# leaves a concurrent writer time to swap its own index in first.
+_VERSION_GRACE_SECONDS: float = 60.0
+
+# Widest neighbour index any solve pass asks for by default: the first pass
+# uses K_NEIGHBOURS columns, the stall retry K_NEIGHBOURS × k_expand_factor.
+NEIGHBOUR_K_MAX: int = K_NEIGHBOURS * SolverConfig().k_expand_factor
+
+# Soft barrier fields kept per entry — one per zoning filter a client has
+# previewed with (see ParcelCacheEntry.proximity_field).
+MAX_PROXIMITY_FIELDS: int = 8
 
 
 # ── Cache entry ────────────────────────────────────────────────────────────
@@ -67,97 +167,820 @@ class ParcelCacheEntry:
     area_id        : int
     positions      : float64 (N, 2)   — [[lat, lng], ...]
     normed         : float64 (N, F)   — quantile-normalised metric matrix
-    zoning_codes   : list[str] (N,)   — for recomputing feasible_mask
+    zoning_idx     : int16   (N,)     — categorical zoning codes into
+                                        zoning_vocab; feasible_mask is a
+                                        lookup-table gather over these
+    zoning_vocab   : tuple[str, ...]  — zoning code strings (V,)
     hazard_flags   : bool    (N,)     — for recomputing hazard_mask
     parcel_ids     : int64   (N,)     — original DB / synthetic ids
     parcel_latlng  : float64 (N, 2)   — same as positions, kept for JSON
     metric_keys    : tuple[str, ...]  — column order of normed
-    created_at     : float            — time.monotonic() at creation
+    normaliser_state: dict            — QuantileNormaliser.to_state() of the
+                                        fit that produced normed
+    pos_m          : float64 (N, 2)   — metre-projected positions
+    kdtree         : scipy KDTree | None — built over pos_m
+    neighbours     : int64   (N, K)   — nearest-first k-NN index, K = widest
+                                        k requested so far; narrower k is a
+                                        column slice (see neighbour_index)
+    proximity      : dict             — soft barrier fields by (zoning_allow,
+                                        decay, cut-off); see proximity_field.
+                                        Per process, never shared
+    zoning_allow   : tuple[str] | None — zoning filter the rows were loaded
+                                        with (None = unfiltered); a refresh
+                                        reloads the same slice
+    created_at     : float            — time.monotonic() at creation (for
+                                        entries loaded from the shared store,
+                                        back-dated to the writer's wall time)
     hit_count      : int              — for stats / LRU tie-breaking
+    shared_version : str | None       — version directory this entry was
+                                        written to / mapped from
+    data_version   : str | None       — parcel data version the rows were
+                                        read at (None = never revalidated)
+    stale          : bool             — set when served past TTL_SECONDS
+                                        while a refresh is pending
     """
     area_id:       int
     positions:     np.ndarray   # (N, 2) float64
     normed:        np.ndarray   # (N, F) float64
-    zoning_codes:  list[str]
+    zoning_idx:    np.ndarray   # (N,) int16
+    zoning_vocab:  tuple[str, ...]
     hazard_flags:  np.ndarray   # (N,) bool
     parcel_ids:    np.ndarray   # (N,) int64
     metric_keys:   tuple[str, ...]
+    normaliser_state: dict[str, Any] = field(default_factory=dict)
+    pos_m:         np.ndarray | None = None   # (N, 2) float64
+    kdtree:        Any = None
+    neighbours:    np.ndarray | None = None   # (N, K) int64
+    proximity:     dict[tuple, np.ndarray] = field(default_factory=dict, repr=False)
+    zoning_allow:  tuple[str, ...] | None = None
     created_at:    float = field(default_factory=time.monotonic)
     hit_count:     int   = 0
+    shared_version: str | None = None
+    data_version:  str | None = None
+    stale:         bool  = False
 
     @property
     def n_parcels(self) -> int:
         return int(self.positions.shape[0])
 
+    @property
+    def zoning_codes(self) -> list[str]:
+        """Per-parcel zoning strings, decoded from zoning_idx (for JSON)."""
+        return np.asarray(self.zoning_vocab, dtype=object)[self.zoning_idx].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by this entry's arrays: positions, normed, hazard_flags,
+        parcel_ids and the zoning codes + vocabulary, plus the derived pos_m
+        and neighbours index (the largest array at k = 60) and any cached
+        proximity fields.  Recomputed on each call since neighbour_index()
+        and proximity_field() grow the entry in place.
+        """
+        total = (
+            self.positions.nbytes + self.normed.nbytes
+            + self.hazard_flags.nbytes + self.parcel_ids.nbytes
+            + self.zoning_idx.nbytes
+            + sum(sys.getsizeof(z) for z in self.zoning_vocab)
+        )
+        if self.pos_m is not None:
+            total += self.pos_m.nbytes
+        if self.neighbours is not None:
+            total += self.neighbours.nbytes
+        total += sum(p.nbytes for p in list(self.proximity.values()))
+        return int(total)
+
     def is_expired(self) -> bool:
         return (time.monotonic() - self.created_at) > TTL_SECONDS
 
+    def is_servable_stale(self) -> bool:
+        """Past TTL but still inside the stale-while-revalidate window."""
+        return (time.monotonic() - self.created_at) <= TTL_SECONDS + STALE_SECONDS
+
     def feasible_mask(self, zoning_allow: set[str]) -> np.ndarray:
-        """Recompute (N,) bool mask from the cached zoning_codes."""
-        lower = {z.lower() for z in zoning_allow}
-        return np.array([z in lower for z in self.zoning_codes], dtype=bool)
+        """Recompute (N,) bool mask — a (V,) lookup table gathered by code."""
+        return zoning_feasible_mask(self.zoning_idx, self.zoning_vocab, zoning_allow)
+
+    def parcel_zonings(self) -> list[str]:
+        """Sorted lower-case zoning codes present (for error details)."""
+        return zoning_present(self.zoning_idx, self.zoning_vocab)
+
+    def normaliser(self) -> QuantileNormaliser | None:
+        """Rebuild the fitted normaliser so callers can transform, not refit."""
+        if not self.normaliser_state:
+            return None
+        return QuantileNormaliser.from_state(self.normaliser_state)
+
+    def neighbour_index(self, k: int) -> np.ndarray:
+        """
+        Return the (N, k) nearest-first neighbour index for this area.
+
+        A column slice of the cached matrix when it is wide enough; otherwise
+        the matrix is rebuilt once at the wider k from the cached KD-tree and
+        kept for subsequent calls.
+        """
+        k = min(k, self.n_parcels - 1)
+        if self.neighbours is None or self.neighbours.shape[1] < k:
+            if self.pos_m is None:
+                self.pos_m = project(self.positions)
+            if self.kdtree is None:
+                self.kdtree = _build_kdtree(self.pos_m)
+            self.neighbours = _build_neighbour_index(
+                self.positions, k, pos_m=self.pos_m, tree=self.kdtree,
+            )
+        return self.neighbours[:, :k]
+
+    def nearest(self, points: Any) -> np.ndarray:
+        """
+        Indices of the parcels nearest each ``[lat, lng]`` in ``points``,
+        through the cached KD-tree (built once if the entry came from the
+        shared store without one).
+        """
+        if self.pos_m is None:
+            self.pos_m = project(self.positions)
+        if self.kdtree is None:
+            self.kdtree = _build_kdtree(self.pos_m)
+        return nearest_parcels(self.positions, points, pos_m=self.pos_m, tree=self.kdtree)
+
+    def proximity_field(
+        self, zoning_allow: set[str], cfg: SolverConfig,
+    ) -> np.ndarray:
+        """
+        Return the (N,) soft barrier field for ``zoning_allow`` under
+        ``cfg``'s decay and cut-off — the same field the full solve builds,
+        so preview scores match /cog/solve.
+
+        Barriers are this entry's hazard parcels plus those ``zoning_allow``
+        excludes, so the field is cached per (zoning_allow, decay, cut-off);
+        the MAX_PROXIMITY_FIELDS most recent are kept.
+        """
+        key = (
+            tuple(sorted(z.lower() for z in zoning_allow)),
+            float(cfg.hazard_decay_m), float(cfg.proximity_cutoff),
+        )
+        prox = self.proximity.get(key)
+        if prox is None:
+            if self.pos_m is None:
+                self.pos_m = project(self.positions)
+            prox = _compute_proximity_field(
+                self.positions, self.hazard_flags,
+                self.feasible_mask(zoning_allow), cfg.hazard_decay_m,
+                pos_m=self.pos_m, cutoff=cfg.proximity_cutoff,
+            )
+            while len(self.proximity) >= MAX_PROXIMITY_FIELDS:
+                self.proximity.pop(next(iter(self.proximity)), None)
+            self.proximity[key] = prox
+        return prox
+
+
+# ── Shared array store ─────────────────────────────────────────────────────
+
+# Array fields persisted per entry.  zoning_vocab is small and goes in the
+# index file.
+_SHARED_ARRAYS: tuple[str, ...] = (
+    "positions", "normed", "hazard_flags", "parcel_ids", "zoning_idx",
+    "pos_m", "neighbours",
+)
+
+
+class _SharedArrayStore:
+    """
+    mmap'd .npy files under one directory, shared by every worker process.
+
+    Not locked itself.  _ParcelLRUCache calls ``read_index`` / ``load`` /
+    ``publish`` / ``remove`` under its own RLock; the slow disk work —
+    ``stage`` (writing the arrays), ``remove_stale_versions`` and ``prune``
+    — runs outside it.  Cross-process consistency relies on the atomic
+    ``os.replace`` of the per-area index file.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root   = root
+        self.errors = 0
+        # Parsed index per area, keyed by the file's stat signature.
+        self._index_memo: dict[int, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _index_path(self, key: int) -> str:
+        return os.path.join(self.root, f"area_{key}.json")
+
+    def _area_dir(self, key: int) -> str:
+        return os.path.join(self.root, f"area_{key}")
+
+    # ── Read ────────────────────────────────────────────────────────────
+
+    def read_index(self, key: int) -> dict[str, Any] | None:
+        """
+        The area's index, reparsed only when the file's (mtime_ns, size,
+        inode) changed since the last read — ``get`` calls this on every
+        hit under the cache lock, so the common case is one ``os.stat``.
+        Every writer swaps in a new file with ``os.replace``, so a new
+        version always shows up as a new inode.
+        """
+        path = self._index_path(key)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._index_memo.pop(key, None)
+            return None
+        except OSError:
+            self.errors += 1
+            return None
+        sig  = (st.st_mtime_ns, st.st_size, st.st_ino)
+        memo = self._index_memo.get(key)
+        if memo is not None and memo[0] == sig:
+            return memo[1]
+        try:
+            with open(path, encoding="utf-8") as fh:
+                index = json.load(fh)
+        except FileNotFoundError:
+            self._index_memo.pop(key, None)
+            return None
+        except (OSError, ValueError):
+            self.errors += 1
+            return None
+        self._index_memo[key] = (sig, index)
+        return index
+
+    def load(self, key: int, index: dict[str, Any]) -> ParcelCacheEntry | None:
+        """Map the arrays of ``index``'s version; None if they are gone."""
+        vdir = os.path.join(self._area_dir(key), index["version"])
+        arrays: dict[str, np.ndarray | None] = {}
+        try:
+            for name in _SHARED_ARRAYS:
+                spec = index["arrays"].get(name)
+                if spec is None:
+                    arrays[name] = None
+                    continue
+                arr = np.load(os.path.join(vdir, f"{name}.npy"), mmap_mode="c")
+                if list(arr.shape) != spec["shape"] or arr.dtype.str != spec["dtype"]:
+                    self.errors += 1
+                    return None
+                # Plain ndarray view over the mapping (numba does not type
+                # np.memmap subclasses the same way as ndarray).
+                arrays[name] = np.asarray(arr)
+        except FileNotFoundError:
+            # Superseded and cleaned up between reading the index and here.
+            return None
+        except (OSError, ValueError, KeyError):
+            self.errors += 1
+            return None
+
+        age = max(0.0, time.time() - float(index["created_at"]))
+        return ParcelCacheEntry(
+            area_id=key,
+            positions=arrays["positions"],
+            normed=arrays["normed"],
+            zoning_idx=arrays["zoning_idx"],
+            zoning_vocab=tuple(index["zoning_vocab"]),
+            hazard_flags=arrays["hazard_flags"],
+            parcel_ids=arrays["parcel_ids"],
+            metric_keys=tuple(index["metric_keys"]),
+            normaliser_state=index["normaliser_state"],
+            pos_m=arrays["pos_m"],
+            kdtree=None,
+            neighbours=arrays["neighbours"],
+            zoning_allow=(
+                tuple(index["zoning_allow"]) if index.get("zoning_allow") is not None else None
+            ),
+            created_at=time.monotonic() - age,
+            shared_version=index["version"],
+            data_version=index.get("data_version"),
+        )
+
+    def areas(self) -> list[int]:
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return []
+        return sorted(
+            int(n[5:-5]) for n in names
+            if n.startswith("area_") and n.endswith(".json") and n[5:-5].isdigit()
+        )
+
+    # ── Write ───────────────────────────────────────────────────────────
+
+    def stage(self, key: int, entry: ParcelCacheEntry) -> dict[str, Any] | None:
+        """
+        Write ``entry``'s arrays to a fresh version directory and the index
+        to a temporary file beside the live one, then re-point the entry's
+        arrays at the mapped files so this worker shares the same pages as
+        every reader.  Touches nothing a reader can see, so it runs without
+        the cache lock; ``publish`` swaps the index in.  Returns the index
+        (with its ``_tmp`` path) or None on failure.
+        """
+        version = uuid.uuid4().hex[:12]
+        vdir    = os.path.join(self._area_dir(key), version)
+        values  = {
+            "positions":    entry.positions,
+            "normed":       entry.normed,
+            "hazard_flags": entry.hazard_flags,
+            "parcel_ids":   entry.parcel_ids,
+            "zoning_idx":   entry.zoning_idx,
+            "pos_m":        entry.pos_m,
+            "neighbours":   entry.neighbours,
+        }
+        index: dict[str, Any] = {
+            "area_id":          key,
+            "version":          version,
+            "data_version":     entry.data_version,
+            "created_at":       time.time() - (time.monotonic() - entry.created_at),
+            "metric_keys":      list(entry.metric_keys),
+            "normaliser_state": entry.normaliser_state,
+            "zoning_vocab":     list(entry.zoning_vocab),
+            "zoning_allow":     (
+                list(entry.zoning_allow) if entry.zoning_allow is not None else None
+            ),
+            "arrays":           {},
+        }
+        tmp = f"{self._index_path(key)}.{os.getpid()}.{version}.tmp"
+        try:
+            os.makedirs(vdir, exist_ok=True)
+            for name, arr in values.items():
+                if arr is None:
+                    continue
+                arr = np.ascontiguousarray(arr)
+                np.save(os.path.join(vdir, f"{name}.npy"), arr, allow_pickle=False)
+                index["arrays"][name] = {"shape": list(arr.shape), "dtype": arr.dtype.str}
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(index, fh)
+        except (OSError, ValueError, TypeError):
+            self.errors += 1
+            self._discard(tmp, vdir)
+            return None
+
+        mapped = self.load(key, index)
+        if mapped is not None:
+            entry.positions    = mapped.positions
+            entry.normed       = mapped.normed
+            entry.hazard_flags = mapped.hazard_flags
+            entry.parcel_ids   = mapped.parcel_ids
+            entry.zoning_idx   = mapped.zoning_idx
+            entry.pos_m        = mapped.pos_m
+            entry.neighbours   = mapped.neighbours
+        return dict(index, _tmp=tmp)
+
+    def publish(self, key: int, staged: dict[str, Any], entry: ParcelCacheEntry) -> bool:
+        """
+        Swap a ``stage``d index in with ``os.replace`` — one rename, done
+        under the cache lock.  Fails (and cleans up) if an ``invalidate``
+        removed the version directory after it was staged.
+        """
+        vdir = os.path.join(self._area_dir(key), staged["version"])
+        try:
+            if not os.path.isdir(vdir):
+                raise FileNotFoundError(vdir)
+            os.replace(staged["_tmp"], self._index_path(key))
+        except OSError:
+            self.errors += 1
+            self._discard(staged["_tmp"], vdir)
+            return False
+        entry.shared_version = staged["version"]
+        return True
+
+    def _discard(self, tmp: str, vdir: str) -> None:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        shutil.rmtree(vdir, ignore_errors=True)
+
+    def remove_stale_versions(self, key: int, keep: str) -> None:
+        # Unlinking files another worker still has mapped is safe on POSIX:
+        # the pages live until the last mapping is closed.
+        area_dir = self._area_dir(key)
+        cutoff   = time.time() - _VERSION_GRACE_SECONDS
+        try:
+            names = os.listdir(area_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(area_dir, name)
+            try:
+                if name != keep and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
+
+    def remove(self, key: int) -> None:
+        self._index_memo.pop(key, None)
+        try:
+            os.unlink(self._index_path(key))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            self.errors += 1
+        shutil.rmtree(self._area_dir(key), ignore_errors=True)
+
+    def prune(self, max_entries: int, max_bytes: int = 0) -> None:
+        """
+        Drop the least recently written areas until at most ``max_entries``
+        remain and (if ``max_bytes``) their arrays fit in ``max_bytes``.
+        The most recent area is always kept.
+        """
+        sizes: dict[int, int] = {}
+        mtimes: dict[int, float] = {}
+        for k in self.areas():
+            index = self.read_index(k)
+            if index is None:
+                continue
+            sizes[k] = sum(
+                int(np.prod(spec["shape"])) * np.dtype(spec["dtype"]).itemsize
+                for spec in index.get("arrays", {}).values()
+            )
+            try:
+                mtimes[k] = os.path.getmtime(self._index_path(k))
+            except OSError:
+                mtimes[k] = 0.0
+
+        order = sorted(sizes, key=mtimes.__getitem__)     # oldest first
+        total = sum(sizes.values())
+        while len(order) > 1 and (
+            len(order) > max_entries or (max_bytes and total > max_bytes)
+        ):
+            k = order.pop(0)
+            total -= sizes[k]
+            self.remove(k)
 
 
 # ── LRU cache ──────────────────────────────────────────────────────────────
 
+def _outdated(entry: ParcelCacheEntry | None, version: str | None) -> bool:
+    """True if ``entry`` was stamped with a data version other than ``version``."""
+    return (
+        entry is not None and version is not None
+        and entry.data_version is not None
+        and entry.data_version != version
+    )
+
+
 class _ParcelLRUCache:
-    """OrderedDict-backed LRU with TTL expiry and a threading.RLock."""
+    """
+    OrderedDict-backed LRU with TTL expiry and a threading.RLock, backed by
+    an optional cross-process _SharedArrayStore.
+    """
 
-    def __init__(self, max_size: int = MAX_ENTRIES) -> None:
+    def __init__(
+        self,
+        max_size:   int = MAX_ENTRIES,
+        max_bytes:  int = MAX_BYTES,
+        shared_dir: str | None = SHARED_DIR,
+    ) -> None:
         self._store: OrderedDict[int, ParcelCacheEntry] = OrderedDict()
         self._lock  = threading.RLock()
         self._max   = max_size
+        self._max_bytes = max_bytes
+        self._evictions = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+        # Data-version revalidation: last probed version per area and the
+        # time.monotonic() of the probe.
+        self._version_probe: Callable[[int], str] | None = None
+        self._versions: dict[int, tuple[str, float]] = {}
+        self._version_checks = 0
+        self._version_changes = 0
+        self._version_errors = 0
+        # Single-flight: one Future per area with a load / refresh running.
+        self._inflight: dict[int, Future] = {}
+        self._refresher: Callable[[int, ParcelCacheEntry], ParcelCacheEntry | None] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._invalidation_listeners: list[Callable[[int], None]] = []
         self._hits  = 0
         self._misses = 0
+        self._shared: _SharedArrayStore | None = None
+        if shared_dir:
+            try:
+                self._shared = _SharedArrayStore(shared_dir)
+            except OSError:
+                self._shared = None
 
     # ── Public ──────────────────────────────────────────────────────────
 
     def get(self, area_id: int | str) -> ParcelCacheEntry | None:
         key = int(area_id)
+        version = self.current_version(key)
         with self._lock:
             entry = self._store.get(key)
+            if self._shared is not None:
+                entry = self._sync_shared(key, entry)
+            mismatch = _outdated(entry, version)
+        if mismatch:
+            # The entry may be the newer side (another worker probed the
+            # change first and republished): probe again now rather than
+            # wait out REVALIDATE_SECONDS, and only drop what the fresh
+            # version contradicts.
+            version, fresh = self._revalidate(key, force=True)
+            if not fresh:
+                with self._lock:
+                    self._misses += 1
+                return None
+        with self._lock:
+            entry = self._store.get(key)
+            if self._shared is not None:
+                entry = self._sync_shared(key, entry)
+            if _outdated(entry, version):
+                # Built from older rows (e.g. mapped from another worker's
+                # store before it saw the change).
+                self._version_changes += 1
+                self._drop_outdated(key, version)
+                entry = None
             if entry is None:
                 self._misses += 1
                 return None
             if entry.is_expired():
-                del self._store[key]
-                self._misses += 1
-                return None
+                if self._refresher is not None and entry.is_servable_stale():
+                    # Stale-while-revalidate: serve it, reload in background.
+                    entry.stale = True
+                    self._stale_hits += 1
+                    self._schedule_refresh(key, entry)
+                else:
+                    self._store.pop(key, None)
+                    if self._shared is not None:
+                        self._shared.remove(key)
+                    self._misses += 1
+                    return None
             # Move to end (most-recently used)
             self._store.move_to_end(key)
             entry.hit_count += 1
             self._hits += 1
             return entry
 
+    def get_or_load(
+        self,
+        area_id: int | str,
+        loader: Callable[[], ParcelCacheEntry | None],
+        timeout: float | None = 30.0,
+    ) -> ParcelCacheEntry | None:
+        """
+        ``get``, and on a miss run ``loader`` once per area: concurrent
+        callers missing the same area block on the first caller's load (or
+        on a pending refresh) instead of each querying the database.
+
+        ``loader`` must store what it builds (populate_from_columns does)
+        and return it, or return None if the area has no data.  Its
+        exceptions are re-raised in every waiting caller.
+        """
+        key = int(area_id)
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._inflight[key] = fut
+        if not owner:
+            return fut.result(timeout=timeout)
+
+        try:
+            entry = loader()
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(entry)
+            return entry
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def set_refresher(
+        self,
+        refresher: Callable[[int, ParcelCacheEntry], ParcelCacheEntry | None] | None,
+    ) -> None:
+        """
+        Register the background reload used for stale entries.  Called as
+        ``refresher(area_id, stale_entry)`` on a worker thread; it must store
+        and return the fresh entry, or return None to drop the area.
+        Without a refresher expired entries are evicted as before.
+        """
+        with self._lock:
+            self._refresher = refresher
+
+    def set_version_probe(self, probe: Callable[[int], str] | None) -> None:
+        """
+        Register ``probe(area_id) -> str``, the area's current parcel data
+        version (main.py wraps parcel_domain.parcel_data_version).  It should
+        cost one indexed query; ``current_version`` calls it at most every
+        REVALIDATE_SECONDS per area (``get`` calls it again at once when an
+        entry's version disagrees).  Without a probe entries are only
+        expired by TTL.
+        """
+        with self._lock:
+            self._version_probe = probe
+            self._versions.clear()
+
+    def current_version(self, area_id: int | str) -> str | None:
+        """
+        The area's parcel data version, probed if the last probe is older
+        than REVALIDATE_SECONDS.  A version different from the previous probe
+        drops the area's entry and shared copy unless another worker already
+        rebuilt them at that version, and (through the listeners) its
+        memoised solve results.  None without a probe; if the probe raises,
+        the last known version (or None) is returned and the error counted.
+
+        Loaders read this *before* querying the rows and pass it to
+        ``populate_from_columns``: a write racing the load then leaves the
+        entry with an older version, which the next probe catches.
+        """
+        return self._revalidate(int(area_id))[0]
+
+    def add_invalidation_listener(self, listener: Callable[[int], None]) -> None:
+        """
+        Call ``listener(area_id)`` whenever an area is invalidated — here, or
+        (seen on the next ``get``) by another worker through the shared
+        store.  Used to drop results derived from the area's parcels.
+        """
+        with self._lock:
+            self._invalidation_listeners.append(listener)
+
     def put(self, area_id: int | str, entry: ParcelCacheEntry) -> None:
+        """
+        Store ``entry`` here and in the shared store.  The arrays are written
+        to disk before the lock is taken and old versions / areas are pruned
+        after it is released, so concurrent ``get`` calls only wait for the
+        index swap and the in-memory insert.
+        """
         key = int(area_id)
+        shared = self._shared
+        staged = shared.stage(key, entry) if shared is not None else None
         with self._lock:
-            if key in self._store:
-                del self._store[key]
-            self._store[key] = entry
-            self._store.move_to_end(key)
-            # Evict oldest if over capacity
-            while len(self._store) > self._max:
-                self._store.popitem(last=False)
+            published = staged is not None and shared.publish(key, staged, entry)
+            self._insert(key, entry)
+        if published:
+            shared.remove_stale_versions(key, keep=staged["version"])
+            shared.prune(self._max, self._max_bytes)
 
     def invalidate(self, area_id: int | str) -> None:
         key = int(area_id)
         with self._lock:
             self._store.pop(key, None)
+            if self._shared is not None:
+                self._shared.remove(key)
+            self._notify_invalidated(key)
 
     def stats(self) -> dict[str, Any]:
         with self._lock:
+            entry_sizes = [
+                {"area_id": k, "n_parcels": e.n_parcels, "nbytes": e.nbytes}
+                for k, e in self._store.items()
+            ]
             return {
                 "entries":     len(self._store),
                 "max_entries": self._max,
+                "bytes_resident": sum(e["nbytes"] for e in entry_sizes),
+                "max_bytes":   self._max_bytes,
+                "evictions":   self._evictions,
+                "entry_sizes": entry_sizes,
                 "hits":        self._hits,
                 "misses":      self._misses,
                 "hit_rate":    round(
                     self._hits / max(1, self._hits + self._misses), 3
                 ),
                 "areas_cached": list(self._store.keys()),
+                "stale_hits":   self._stale_hits,
+                "refreshes":    self._refreshes,
+                "refresh_errors": self._refresh_errors,
+                "ttl_seconds":  TTL_SECONDS,
+                "revalidate_seconds": REVALIDATE_SECONDS,
+                "version_checks":  self._version_checks,
+                "version_changes": self._version_changes,
+                "version_errors":  self._version_errors,
+                "refreshing":   list(self._inflight.keys()),
+                "shared_dir":   self._shared.root if self._shared else None,
+                "shared_areas": self._shared.areas() if self._shared else [],
+                "shared_errors": self._shared.errors if self._shared else 0,
             }
 
+    # ── Internal ────────────────────────────────────────────────────────
+
+    def _insert(self, key: int, entry: ParcelCacheEntry) -> None:
+        if key in self._store:
+            del self._store[key]
+        self._store[key] = entry
+        self._store.move_to_end(key)
+        # Evict least-recently used until under both the entry and the byte
+        # budget; the entry just inserted is always kept.
+        total = sum(e.nbytes for e in self._store.values()) if self._max_bytes else 0
+        while len(self._store) > 1 and (
+            len(self._store) > self._max
+            or (self._max_bytes and total > self._max_bytes)
+        ):
+            _, evicted = self._store.popitem(last=False)
+            total -= evicted.nbytes if self._max_bytes else 0
+            self._evictions += 1
+
+    def _schedule_refresh(self, key: int, stale: ParcelCacheEntry) -> None:
+        """Start one background refresh for ``key`` unless one is running."""
+        if key in self._inflight:
+            return
+        fut: Future = Future()
+        self._inflight[key] = fut
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="parcel-cache-refresh",
+            )
+        self._executor.submit(self._run_refresh, key, stale, fut)
+
+    def _run_refresh(self, key: int, stale: ParcelCacheEntry, fut: Future) -> None:
+        entry = None
+        try:
+            entry = self._refresher(key, stale)
+            with self._lock:
+                self._refreshes += 1
+                if entry is None:
+                    self.invalidate(key)
+        except Exception:
+            # Keep serving the stale entry; the next get past the window
+            # evicts it, and the next stale hit retries the refresh.
+            with self._lock:
+                self._refresh_errors += 1
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_result(entry)
+
+    def _revalidate(self, key: int, force: bool = False) -> tuple[str | None, bool]:
+        """
+        ``current_version`` with the interval optional: ``(version, fresh)``
+        where ``fresh`` says the probe actually ran and succeeded.
+        """
+        with self._lock:
+            probe = self._version_probe
+            known = self._versions.get(key)
+        if probe is None:
+            return None, False
+        if (
+            not force and known is not None
+            and time.monotonic() - known[1] < REVALIDATE_SECONDS
+        ):
+            return known[0], False
+
+        # Outside the lock: the probe is a database round trip.
+        try:
+            version = str(probe(key))
+        except Exception:
+            with self._lock:
+                self._version_errors += 1
+            return (known[0] if known is not None else None), False
+
+        with self._lock:
+            self._version_checks += 1
+            self._versions[key] = (version, time.monotonic())
+            if known is not None and known[0] != version:
+                self._version_changes += 1
+                self._drop_outdated(key, version)
+        return version, True
+
+    def _drop_outdated(self, key: int, version: str) -> None:
+        """
+        The area's data changed to ``version``: drop the local entry and the
+        shared copy unless they are already stamped with it (another worker
+        reloaded first), and tell the listeners.  Caller holds the lock.
+        """
+        if _outdated(self._store.get(key), version):
+            self._store.pop(key, None)
+        if self._shared is not None:
+            index = self._shared.read_index(key)
+            if index is not None and index.get("data_version") != version:
+                self._shared.remove(key)
+        self._notify_invalidated(key)
+
+    def _notify_invalidated(self, key: int) -> None:
+        for listener in list(self._invalidation_listeners):
+            try:
+                listener(key)
+            except Exception:
+                pass                  # a listener must not break the cache
+
+    def _sync_shared(
+        self, key: int, entry: ParcelCacheEntry | None,
+    ) -> ParcelCacheEntry | None:
+        """
+        Reconcile the local entry with the shared index: drop it if another
+        worker invalidated the area, map the newer version if one was
+        written, otherwise keep the local object (and its lazily built
+        KD-tree / wider neighbour index).
+        """
+        index = self._shared.read_index(key)
+        if index is None:
+            if entry is not None and entry.shared_version is None:
+                return entry          # never made it to disk — local only
+            if self._store.pop(key, None) is not None:
+                self._notify_invalidated(key)
+            return None
+        if entry is not None and entry.shared_version == index.get("version"):
+            return entry
+        mapped = self._shared.load(key, index)
+        if mapped is None:
+            self._store.pop(key, None)
+            return None
+        self._insert(key, mapped)
+        return mapped
+
 
 # Module-level singleton — import this everywhere
 parcel_cache = _ParcelLRUCache()
@@ -173,14 +996,38 @@ def populate_from_parcels(
     Fit-transform a list of cog_solver.Parcel objects into a
     ParcelCacheEntry and store it in the cache.
 
-    Called by both /cog/solve and /cog/preview (on cache miss) so that the
-    first request for an area pays the normalisation cost once and all
-    subsequent preview requests are free.
+    Thin wrapper over ``populate_from_columns`` for the Parcel-based
+    loaders (legacy Property rows, synthetic parcels).
+    """
+    return populate_from_columns(
+        area_id, parcels_to_columns(parcel_list, list(WEIGHT_TO_METRIC.values()))
+    )
+
+
+def populate_from_columns(
+    area_id: int | str,
+    cols: dict[str, Any],
+    zoning_allow: set[str] | list[str] | None = None,
+    data_version: str | None = None,
+) -> ParcelCacheEntry:
+    """
+    Fit-transform columnar parcel arrays into a ParcelCacheEntry and store
+    it in the cache.
+
+    Called by /cog/solve, /cog/solve-batch and /cog/preview (on cache miss)
+    so that the first request for an area pays the normalisation cost once
+    and all subsequent preview requests are free.
 
     Parameters
     ----------
-    area_id     : area primary key
-    parcel_list : raw Parcel objects (metrics in pre-normalised units)
+    area_id : area primary key
+    cols    : ``parcel_domain.fetch_parcel_columns`` / ``parcels_to_columns``
+              layout — ids, latlng, metrics (raw), zoning_idx +
+              zoning_vocab (or a plain ``zoning`` string list), hazard
+    zoning_allow : zoning filter ``cols`` was loaded with, recorded so a
+              stale-while-revalidate refresh reloads the same rows
+    data_version : ``parcel_cache.current_version(area_id)`` read before
+              ``cols`` was loaded; None opts the entry out of revalidation
 
     Returns
     -------
@@ -188,25 +1035,45 @@ def populate_from_parcels(
     """
     metric_keys = list(WEIGHT_TO_METRIC.values())
 
-    # Fit & transform — modifies parcel.metrics in place
+    # Fit & transform the raw matrix; the fitted bounds are kept on the
+    # entry so re-solves of this area transform without refitting.
     normaliser = QuantileNormaliser(metric_keys)
-    normed     = normaliser.fit_transform(parcel_list)   # (N, F) float64
+    normed     = normaliser.fit_transform(cols["metrics"])   # (N, F) float64
 
-    positions = np.array(
-        [[p.lat, p.lng] for p in parcel_list], dtype=np.float64
-    )
-    zoning_codes = [p.zoning for p in parcel_list]
-    hazard_flags = np.array([bool(p.hazard_flag) for p in parcel_list], dtype=bool)
-    parcel_ids   = np.array([int(p.id) for p in parcel_list], dtype=np.int64)
+    positions    = np.asarray(cols["latlng"], dtype=np.float64)
+    if "zoning_idx" in cols:
+        zoning_idx   = np.asarray(cols["zoning_idx"], dtype=np.int16)
+        zoning_vocab = tuple(cols["zoning_vocab"])
+    else:
+        zoning_idx, zoning_vocab = encode_zoning(cols["zoning"])
+    hazard_flags = np.asarray(cols["hazard"], dtype=bool)
+    parcel_ids   = np.asarray(cols["ids"], dtype=np.int64)
+    n            = int(parcel_ids.shape[0])
+
+    # Spatial structures are weight-independent: build them once per area so
+    # slider-drag previews only pay for the matmul and the ascent.
+    pos_m      = project(positions)
+    kdtree     = _build_kdtree(pos_m)
+    neighbours = _build_neighbour_index(
+        positions, min(NEIGHBOUR_K_MAX, n - 1),
+        pos_m=pos_m, tree=kdtree,
+    ) if n > 1 else None
 
     entry = ParcelCacheEntry(
         area_id=int(area_id),
         positions=positions,
         normed=normed,
-        zoning_codes=zoning_codes,
+        zoning_idx=zoning_idx,
+        zoning_vocab=zoning_vocab,
         hazard_flags=hazard_flags,
         parcel_ids=parcel_ids,
         metric_keys=tuple(metric_keys),
+        normaliser_state=normaliser.to_state(),
+        pos_m=pos_m,
+        kdtree=kdtree,
+        neighbours=neighbours,
+        zoning_allow=tuple(sorted(zoning_allow)) if zoning_allow is not None else None,
+        data_version=data_version,
     )
     parcel_cache.put(area_id, entry)
     return entry
@@ -12,6 +12,11 @@ Public surface
   ParcelSnapshot             — SQLAlchemy ORM model (new table).
   fetch_all_parcels          — all parcels for an area.
   fetch_feasible_parcels     — parcels filtered by zoning + hazard flag.
+  fetch_parcel_columns       — columnar hot path: Core SELECT straight into
+                               preallocated NumPy arrays, no ORM objects.
+  parcel_data_version        — count / max id / max updated_at fingerprint
+                               of an area's rows (parcel_cache / result_cache
+                               revalidation).
   parcels_to_numpy           — convert rows to dict-of-NumPy-arrays.
   snapshot_to_parcel         — adapt a single row to cog_solver.Parcel.
   snapshots_to_parcels       — bulk-adapt a row list to [Parcel, ...].
@@ -27,6 +32,9 @@ Index strategy (see also sql/parcel_snapshots_migration.sql)
   ix_ps_area_covering        Covering index carrying all five metric columns
                              so that SELECT … all-columns can be satisfied by
                              an index-only scan with zero heap access.
+  ix_ps_area_version         (area_id, updated_at, id): parcel_data_version's
+                             count / max aggregate as one index-only range
+                             scan — the cache revalidation probe.
 """
 
 from __future__ import annotations
@@ -35,7 +43,7 @@ from datetime import datetime
 from typing import Any
 
 import numpy as np
-from sqlalchemy import Index, text
+from sqlalchemy import Float, Index, cast, func, select, text
 
 from db_core import db
 
@@ -96,6 +104,9 @@ class ParcelSnapshot(db.Model):
             "transit_score",
             "footfall_score",
         ),
+
+        # ── Version probe: count / max(id) / max(updated_at) per area ──────
+        Index("ix_ps_area_version", "area_id", "updated_at", "id"),
     )
 
     id             = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
@@ -286,6 +297,100 @@ def parcels_to_numpy(rows: list[ParcelSnapshot]) -> dict[str, np.ndarray]:
     }
 
 
+# ── Columnar loader (no ORM objects) ──────────────────────────────────────
+
+# Rows are pulled from the cursor in blocks of this size; each block becomes
+# one NumPy conversion instead of one Python object per row.
+_COLUMN_FETCH_BLOCK: int = 512
+
+
+def fetch_parcel_columns(
+    area_id:        int | str,
+    zoning_allow:   set[str] | list[str] | None = None,
+    exclude_hazard: bool = True,
+    limit:          int  = 2000,
+) -> dict[str, Any]:
+    """
+    Columnar equivalent of ``fetch_feasible_parcels`` + ``parcels_to_numpy``.
+
+    Issues a Core ``select()`` of only the ten solver columns (same WHERE
+    clause and therefore the same index choice as fetch_feasible_parcels)
+    and fills arrays preallocated at ``limit`` rows directly from the
+    cursor, then trims them to the row count.  NULL metrics are replaced by
+    ``METRIC_FALLBACKS`` inside the query (COALESCE) and NUMERIC columns are
+    cast to double precision there too, so no Decimal objects are created.
+
+    Returns the ``parcels_to_numpy`` layout, except ``metrics`` is float64
+    so results match the Parcel path bit-for-bit:
+
+      "ids" int64 (N,) · "latlng" float64 (N, 2) · "metrics" float64 (N, 5)
+      "zoning_idx" int16 (N,) · "zoning_vocab" tuple[str] (V,) · "hazard" bool (N,)
+
+    Zoning is encoded as categorical codes into ``zoning_vocab`` by
+    ``cog_solver.encode_zoning``, the same encoder the other column paths use.
+    """
+    from cog_solver import encode_zoning  # local import — see snapshot_to_parcel
+
+    t = ParcelSnapshot.__table__
+    metric_cols = [
+        func.coalesce(cast(t.c[key], Float), METRIC_FALLBACKS[key])
+        for key in METRIC_KEYS
+    ]
+    stmt = select(t.c.id, t.c.lat, t.c.lng, *metric_cols,
+                  t.c.hazard_flag, t.c.zoning_code)
+    stmt = stmt.where(t.c.area_id == area_id)
+    if zoning_allow:
+        stmt = stmt.where(t.c.zoning_code.in_(list(zoning_allow)))
+    if exclude_hazard:
+        # Explicit IS FALSE so Postgres picks up the partial index.
+        stmt = stmt.where(t.c.hazard_flag.is_(False))
+    stmt = stmt.order_by(t.c.id).limit(limit)
+
+    F       = len(METRIC_KEYS)
+    ids     = np.empty(limit, dtype=np.int64)
+    numeric = np.empty((limit, 2 + F), dtype=np.float64)   # lat, lng, metrics
+    hazard  = np.empty(limit, dtype=bool)
+    zoning: list[str] = []
+
+    n = 0
+    result = db.session.execute(stmt)
+    for block in result.partitions(_COLUMN_FETCH_BLOCK):
+        m = len(block)
+        cols = list(zip(*block))                 # transpose block → columns
+        ids[n:n + m]          = cols[0]
+        numeric[n:n + m, :]   = np.array(cols[1:3 + F], dtype=np.float64).T
+        hazard[n:n + m]       = cols[3 + F]
+        zoning.extend(cols[4 + F])
+        n += m
+
+    zoning_idx, zoning_vocab = encode_zoning(zoning)
+    return {
+        "ids":     ids[:n],
+        "latlng":  np.ascontiguousarray(numeric[:n, :2]),
+        "metrics": np.ascontiguousarray(numeric[:n, 2:]),
+        "zoning_idx":   zoning_idx,
+        "zoning_vocab": zoning_vocab,
+        "hazard":  hazard[:n],
+    }
+
+
+def parcel_data_version(area_id: int | str) -> str:
+    """
+    Cheap fingerprint of an area's parcel_snapshots rows for cache
+    revalidation: ``"<count>:<max id>:<max updated_at>"`` from one aggregate,
+    an index-only scan of ``ix_ps_area_version``.  Any insert, delete or
+    update changes it — ``updated_at`` has ``onupdate`` for the ORM and the
+    ``trg_ps_updated_at`` trigger for bulk SQL (sql/parcel_snapshots_migration.sql).
+    """
+    t = ParcelSnapshot.__table__
+    count, max_id, max_updated = db.session.execute(
+        select(func.count(), func.max(t.c.id), func.max(t.c.updated_at))
+        .where(t.c.area_id == area_id)
+    ).one()
+    stamp = max_updated.isoformat() if hasattr(max_updated, "isoformat") else max_updated
+    return f"{int(count)}:{max_id or 0}:{stamp or '-'}"
+
+
 # ── Adapter: ParcelSnapshot → cog_solver.Parcel ───────────────────────────
 
 def snapshot_to_parcel(row: ParcelSnapshot) -> Any:
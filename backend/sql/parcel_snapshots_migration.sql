@@ -107,6 +107,12 @@ CREATE INDEX IF NOT EXISTS ix_ps_area_covering
         footfall_score
     );
 
+-- Version probe — parcel_data_version() reads count(*), max(id) and
+-- max(updated_at) per area on every cache revalidation; with this index that
+-- is one index-only range scan.
+CREATE INDEX IF NOT EXISTS ix_ps_area_version
+    ON parcel_snapshots (area_id, updated_at, id);
+
 
 -- -----------------------------------------------------------------------------
 -- 4. Optional: BRIN index on created_at for time-range admin queries
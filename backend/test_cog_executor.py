@@ -0,0 +1,180 @@
+"""
+CoG solver executor checks
+Covers cog_executor._SolverExecutor's admission control and clean-up, in
+both modes:
+
+  1. Inline (max_processes=0): SolverBusy past max(1, P) + queue_depth,
+     slots released after a success or a solver exception, progress
+     reported on the solving thread.
+  2. One worker process: SolverBusy while timed-out solves still hold their
+     slots, stats()["in_flight"] back to 0 once they settle, no
+     shared-memory block left in /dev/shm, progress relayed from the worker,
+     and solver exceptions (CogValidationError) re-raised without breaking
+     the pool.
+
+Run from backend/:  python test_cog_executor.py
+(the test_* functions also run under pytest; the process test starts a
+forkserver / spawn pool, so keep this module importable without side
+effects)
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cog_executor import SolverBusy, _SolverExecutor
+from cog_solver import WEIGHT_TO_METRIC, CogValidationError
+
+_WAIT_S  = 60.0
+_SHM_DIR = "/dev/shm"
+_WEIGHTS = {key: 20 for key in WEIGHT_TO_METRIC}
+_ALLOW   = {"residential"}
+# Large enough that one pooled solve outlives submitting the next two calls.
+_SLOW_N  = 60_000
+
+
+def _cols(n, seed=0):
+    """fetch_parcel_columns-layout arrays for ``n`` random parcels."""
+    rng = np.random.default_rng(seed)
+    return {
+        "ids":          np.arange(n, dtype=np.int64),
+        "latlng":       np.c_[-26.2 + rng.random(n) * 0.2, 28.0 + rng.random(n) * 0.2],
+        "metrics":      rng.random((n, len(WEIGHT_TO_METRIC))),
+        "zoning_idx":   np.zeros(n, dtype=np.int16),
+        "zoning_vocab": ("residential",),
+        "hazard":       np.zeros(n, dtype=bool),
+    }
+
+
+def _shm_blocks():
+    """Names of the multiprocessing.shared_memory blocks, or None off Linux."""
+    if not os.path.isdir(_SHM_DIR):
+        return None
+    return {name for name in os.listdir(_SHM_DIR) if name.startswith("psm_")}
+
+
+def _wait_for(cond):
+    deadline = time.monotonic() + _WAIT_S
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _assert_busy(executor, limit, queue_depth):
+    try:
+        executor.run(_cols(20), _WEIGHTS, _ALLOW)
+    except SolverBusy as busy:
+        assert (busy.limit, busy.queue_depth) == (limit, queue_depth)
+    else:
+        raise AssertionError("expected SolverBusy")
+
+
+# ── Inline ─────────────────────────────────────────────────────────────────
+
+def test_inline_admission_and_release():
+    executor = _SolverExecutor(max_processes=0, queue_depth=1, timeout_s=_WAIT_S)
+    started, release = threading.Semaphore(0), threading.Event()
+
+    def blocking_progress(*report):
+        started.release()
+        assert release.wait(_WAIT_S)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(executor.run(
+            _cols(200), _WEIGHTS, _ALLOW, progress=blocking_progress,
+        )))
+        for _ in range(2)                     # max(1, 0) + queue_depth slots
+    ]
+    for t in threads:
+        t.start()
+    for _ in threads:
+        assert started.acquire(timeout=_WAIT_S)
+    assert executor.stats()["in_flight"] == 2
+    _assert_busy(executor, 1, 1)
+
+    release.set()
+    for t in threads:
+        t.join(_WAIT_S)
+    stats = executor.stats()
+    assert len(results) == 2 and stats["mode"] == "inline"
+    assert (stats["in_flight"], stats["completed"], stats["rejected"]) == (0, 2, 1)
+
+    # A solver exception releases its slot too.
+    try:
+        executor.run(_cols(50), _WEIGHTS, {"industrial"})
+    except CogValidationError:
+        pass
+    else:
+        raise AssertionError("expected CogValidationError")
+    stats = executor.stats()
+    assert (stats["in_flight"], stats["failed"]) == (0, 1)
+    executor.run(_cols(50), _WEIGHTS, _ALLOW)
+    executor.run(_cols(50), _WEIGHTS, _ALLOW)
+    print("inline executor ok")
+
+
+# ── One worker process ─────────────────────────────────────────────────────
+
+def test_process_timeout_releases_slot_and_block():
+    executor = _SolverExecutor(max_processes=1, queue_depth=1, timeout_s=_WAIT_S)
+    try:
+        executor.run(_cols(20), _WEIGHTS, _ALLOW)          # start + warm the pool
+        blocks_before = _shm_blocks()
+
+        # Two solves that outlive their wait hold both slots until they settle.
+        slow = _cols(_SLOW_N)
+        for _ in range(2):
+            try:
+                executor.run(slow, _WEIGHTS, _ALLOW, timeout=0.01)
+            except TimeoutError:
+                pass
+            else:
+                raise AssertionError("expected TimeoutError")
+        assert executor.stats()["in_flight"] == 2
+        _assert_busy(executor, 1, 1)
+
+        _wait_for(lambda: executor.stats()["in_flight"] == 0)
+        stats = executor.stats()
+        assert (stats["completed"], stats["rejected"], stats["failed"]) == (3, 1, 0)
+        if blocks_before is not None:
+            assert _shm_blocks() == blocks_before, _shm_blocks() - blocks_before
+
+        # Progress is relayed from the worker; the final report is complete.
+        reports = []
+        result = executor.run(
+            _cols(20_000), _WEIGHTS, _ALLOW, progress=lambda *r: reports.append(r),
+        )
+        assert reports and reports[-1][0] == "seeds"
+        assert reports[-1][1] == reports[-1][2]
+        plain = executor.run(_cols(20_000), _WEIGHTS, _ALLOW)
+        assert (result.lat, result.lng) == (plain.lat, plain.lng)
+
+        # A solver exception crosses the process boundary intact and the
+        # pool survives it.
+        try:
+            executor.run(_cols(50), _WEIGHTS, {"industrial"})
+        except CogValidationError as exc:
+            assert exc.code
+        else:
+            raise AssertionError("expected CogValidationError")
+        stats = executor.stats()
+        assert stats["pool_started"] and stats["in_flight"] == 0 and stats["failed"] == 1
+        executor.run(_cols(20), _WEIGHTS, _ALLOW)
+        if blocks_before is not None:
+            assert _shm_blocks() == blocks_before
+    finally:
+        executor._reset_pool()
+    print("process executor ok")
+
+
+if __name__ == "__main__":
+    test_inline_admission_and_release()
+    test_process_timeout_releases_slot_and_block()
+    print("all CoG executor checks passed")
@@ -0,0 +1,186 @@
+"""
+CoG job queue checks
+Drives cog_jobs._JobQueue.submit with stub ``run`` callables (no database,
+no solver):
+
+  1. Deduplication: a second submit of a queued / running cache key returns
+     the pending job; once it finishes, the same key is a cached job.
+  2. Admission: JobQueueFull past COG_JOB_QUEUE pending jobs.
+  3. Failures: JobError fields and unexpected exceptions end up on the job,
+     and the key can be resubmitted.
+  4. History: _trim forgets the oldest finished jobs beyond the limit, by
+     finish time, and never a pending one.
+
+Run from backend/:  python test_cog_jobs.py
+(the test_* functions also run under pytest)
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cog_jobs import JobError, JobQueueFull, _JobQueue
+from cog_result_cache import CachedResult, result_cache
+
+_WAIT_S = 5.0
+
+
+def _key():
+    """A cache key no other test (or earlier run) has used."""
+    return uuid.uuid4().hex
+
+
+def _wait_done(job):
+    deadline = time.monotonic() + _WAIT_S
+    while not job.finished:
+        assert time.monotonic() < deadline, f"job {job.job_id} still {job.status}"
+        time.sleep(0.005)
+    return job
+
+
+class _BlockingRun:
+    """Stub ``run``: reports progress, then waits for ``release``."""
+
+    def __init__(self, area_id=1):
+        self.area_id = area_id
+        self.calls   = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, progress):
+        self.calls += 1
+        progress("seeds", 1, 4, 10)
+        self.started.set()
+        assert self.release.wait(_WAIT_S)
+        return CachedResult(area_id=self.area_id, payload={"lat": -26.1})
+
+
+# ── Deduplication and the cached shortcut ──────────────────────────────────
+
+def test_pending_job_deduplicated_then_cached():
+    queue, key, run = _JobQueue(workers=1), _key(), _BlockingRun()
+    first = queue.submit("solve", 1, key, run)
+    assert run.started.wait(_WAIT_S)
+    assert first.status == "running"
+    assert first.progress == {"stage": "seeds", "done": 1, "total": 4, "iterations": 10}
+
+    second = queue.submit("solve", 1, key, run)
+    assert second is first and queue.stats()["deduplicated"] == 1
+
+    run.release.set()
+    _wait_done(first)
+    assert first.status == "done" and not first.cached
+    assert first.result.payload == {"lat": -26.1}
+    assert result_cache.get(key) is first.result
+
+    third = queue.submit("solve", 1, key, run)
+    assert third is not first and third.finished and third.cached
+    assert third.result is first.result
+    assert queue.get(third.job_id) is third
+    stats = queue.stats()
+    assert run.calls == 1
+    assert (stats["submitted"], stats["cache_hits"]) == (3, 1)
+    assert stats["jobs"] == {"done": 2}
+    print("deduplication + cached shortcut ok")
+
+
+# ── Admission ──────────────────────────────────────────────────────────────
+
+def test_queue_full_past_max_pending():
+    queue = _JobQueue(workers=1, max_pending=2)
+    runs  = [_BlockingRun(), _BlockingRun()]
+    keys  = [_key(), _key()]
+    jobs  = [queue.submit("solve", 1, k, r) for k, r in zip(keys, runs)]
+    assert runs[0].started.wait(_WAIT_S)
+    assert [j.status for j in jobs] == ["running", "queued"]
+
+    try:
+        queue.submit("solve", 1, _key(), _BlockingRun())
+    except JobQueueFull as full:
+        assert full.limit == 2
+    else:
+        raise AssertionError("expected JobQueueFull")
+    # A pending key is still deduplicated while the queue is full.
+    assert queue.submit("solve", 1, keys[1], runs[1]) is jobs[1]
+
+    for r in runs:
+        r.release.set()
+    for j in jobs:
+        _wait_done(j)
+    # Room again once they finish.
+    extra = _BlockingRun()
+    extra.release.set()
+    assert _wait_done(queue.submit("solve", 1, _key(), extra)).status == "done"
+    print("queue admission ok")
+
+
+# ── Failures ───────────────────────────────────────────────────────────────
+
+def test_failed_jobs_carry_errors_and_can_retry():
+    queue = _JobQueue(workers=1)
+
+    def structured(progress):
+        raise JobError("No parcels", "NO_PARCELS", 404, {"area_id": 3})
+
+    def unexpected(progress):
+        raise RuntimeError("boom")
+
+    key = _key()
+    job = _wait_done(queue.submit("solve", 3, key, structured))
+    assert job.status == "failed" and job.result is None
+    assert job.error == {"error": "No parcels", "code": "NO_PARCELS",
+                         "status": 404, "details": {"area_id": 3}}
+    assert job.to_dict()["error"]["code"] == "NO_PARCELS"
+
+    other = _wait_done(queue.submit("solve", 3, _key(), unexpected))
+    assert other.error["code"] == "SOLVER_FAILED" and other.error["status"] == 500
+
+    # Failures are not cached and free the key.
+    assert result_cache.get(key) is None
+    run = _BlockingRun(area_id=3)
+    run.release.set()
+    retry = _wait_done(queue.submit("solve", 3, key, run))
+    assert retry is not job and retry.status == "done"
+    assert queue.stats()["failed"] == 2
+    print("job failures ok")
+
+
+# ── History ────────────────────────────────────────────────────────────────
+
+def test_history_trims_oldest_finished_jobs():
+    queue = _JobQueue(workers=1, history=2)
+    pending = _BlockingRun()
+    running = queue.submit("solve", 1, _key(), pending)
+    assert pending.started.wait(_WAIT_S)
+
+    finished = []
+    for _ in range(4):
+        key = _key()
+        result_cache.put(key, CachedResult(area_id=1, payload={}))
+        finished.append(queue.submit("solve", 1, key, pending))
+    assert all(j.cached for j in finished)
+    assert [queue.get(j.job_id) for j in finished] == [None, None] + finished[2:]
+    assert queue.get(running.job_id) is running        # pending jobs are kept
+
+    pending.release.set()
+    _wait_done(running)
+    # The running job finishing pushes the oldest cached one out — history
+    # is by finish time, so the job that just finished stays pollable.
+    assert queue.get(finished[2].job_id) is None
+    assert queue.get(finished[3].job_id) is finished[3]
+    assert queue.get(running.job_id) is running
+    assert queue.stats()["jobs"] == {"done": 2}
+    print("job history ok")
+
+
+if __name__ == "__main__":
+    test_pending_job_deduplicated_then_cached()
+    test_queue_full_past_max_pending()
+    test_failed_jobs_carry_errors_and_can_retry()
+    test_history_trims_oldest_finished_jobs()
+    print("all CoG job queue checks passed")
@@ -0,0 +1,167 @@
+"""
+CoG normaliser checks
+Covers cog_solver.QuantileNormaliser, the fit / transform split the solver
+and parcel cache reuse across requests:
+
+  1. fit / transform / partial_fit: transform reproduces fit_transform from
+     the fitted bounds, clips to [0, 1], flips lower-is-better metrics and
+     imputes missing values; partial_fit folds a batch in by count.
+  2. State: to_state() survives a JSON round-trip and from_state()
+     transforms identically, including a never-observed (NaN) column.
+  3. Write-back: parcel.metrics is only overwritten when asked, through
+     the constructor flag or per call, and ndarray input refuses it.
+
+Run from backend/:  python test_cog_normaliser.py
+(the test_* functions also run under pytest)
+"""
+
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cog_solver import Parcel, QuantileNormaliser
+
+_KEYS = ["rental_yield", "price_per_m2", "footfall_score"]
+
+
+def _parcels(n=40, seed=0, missing=()):
+    """Random parcels; ``missing`` metric keys are left out of every parcel."""
+    rng = np.random.default_rng(seed)
+    return [
+        Parcel(
+            id=i, lat=-26.1, lng=28.0, zoning="residential", hazard_flag=False,
+            metrics={
+                "rental_yield":   float(rng.uniform(4, 12)),
+                "price_per_m2":   float(rng.uniform(8_000, 30_000)),
+                "footfall_score": float(rng.uniform(0, 100)),
+                **{k: None for k in missing},
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def _raw(parcels, keys=_KEYS):
+    return {p.id: [p.metrics[k] for k in keys] for p in parcels}
+
+
+# ── fit / transform / partial_fit ──────────────────────────────────────────
+
+def test_fit_transform_and_partial_fit():
+    parcels = _parcels()
+    raw     = np.array([[p.metrics[k] for k in _KEYS] for p in parcels])
+
+    norm   = QuantileNormaliser(_KEYS)
+    normed = norm.fit_transform(parcels)
+    assert normed.shape == (40, 3) and normed.dtype == np.float64
+    assert normed.min() >= 0.0 and normed.max() <= 1.0
+    assert np.array_equal(norm.transform(parcels), normed)
+    assert np.array_equal(norm.transform(raw), normed)          # matrix input
+    assert norm.transform(parcels, dtype=np.float32).dtype == np.float32
+    assert norm.n_seen_ == 40
+
+    # price_per_m2 is lower-is-better: the cheapest parcel scores highest.
+    cheapest = int(np.argmin(raw[:, 1]))
+    assert normed[cheapest, 1] == normed[:, 1].max() == 1.0
+
+    # A missing value takes the column median.
+    gap = _parcels(1, seed=9)
+    gap[0].metrics["rental_yield"] = None
+    median = norm.median_["rental_yield"]
+    expected = (median - norm.lo_["rental_yield"]) / (
+        norm.hi_["rental_yield"] - norm.lo_["rental_yield"])
+    assert math.isclose(norm.transform(gap)[0, 0], expected)
+
+    try:
+        QuantileNormaliser(_KEYS).transform(parcels)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError before fit")
+
+    # partial_fit merges bounds as a count-weighted mean of the two batches.
+    batch = _parcels(10, seed=1)
+    alone = QuantileNormaliser(_KEYS).fit(batch)
+    lo_before = dict(norm.lo_)
+    norm.partial_fit(batch)
+    assert norm.n_seen_ == 50
+    for k in _KEYS:
+        assert math.isclose(norm.lo_[k], 0.8 * lo_before[k] + 0.2 * alone.lo_[k])
+    assert norm.partial_fit(np.empty((0, 3))).n_seen_ == 50
+    # Unfitted, partial_fit is a plain fit.
+    fresh = QuantileNormaliser(_KEYS).partial_fit(batch)
+    assert fresh.to_state() == alone.to_state()
+    print("fit / transform / partial_fit ok")
+
+
+# ── State ──────────────────────────────────────────────────────────────────
+
+def test_state_round_trip():
+    keys    = _KEYS + ["vacancy"]
+    parcels = _parcels(missing=("vacancy",))
+    norm    = QuantileNormaliser(keys)
+    normed  = norm.fit_transform(parcels)
+    assert math.isnan(norm.median_["vacancy"])
+    assert np.all(normed[:, 3] == 0.5)                 # never observed → neutral
+
+    state    = json.loads(json.dumps(norm.to_state(), allow_nan=False))
+    restored = QuantileNormaliser.from_state(state)
+    assert restored.is_fitted and restored.n_seen_ == 40
+    assert math.isnan(restored.median_["vacancy"])
+    assert np.array_equal(restored.transform(parcels), normed)
+    other = _parcels(15, seed=3, missing=("vacancy",))
+    assert np.array_equal(restored.transform(other), norm.transform(other))
+    print("state round-trip ok")
+
+
+# ── Write-back ─────────────────────────────────────────────────────────────
+
+def test_write_back_only_when_asked():
+    # Default: Parcel objects are left raw.
+    parcels = _parcels()
+    before  = _raw(parcels)
+    QuantileNormaliser(_KEYS).fit_transform(parcels)
+    assert _raw(parcels) == before
+
+    # Constructor flag, through fit_transform and transform.
+    for method in ("fit_transform", "transform"):
+        parcels = _parcels()
+        norm    = QuantileNormaliser(_KEYS, write_back=True).fit(_parcels())
+        normed  = getattr(norm, method)(parcels)
+        assert _raw(parcels) == {p.id: list(normed[i]) for i, p in enumerate(parcels)}
+
+    # Per-call flag, both ways round.
+    parcels = _parcels()
+    normed  = QuantileNormaliser(_KEYS).fit_transform(parcels, write_back=True)
+    assert _raw(parcels) == {p.id: list(normed[i]) for i, p in enumerate(parcels)}
+    parcels = _parcels()
+    before  = _raw(parcels)
+    QuantileNormaliser(_KEYS, write_back=True).fit_transform(parcels, write_back=False)
+    assert _raw(parcels) == before
+    # Extra metrics outside metric_keys are left alone.
+    parcels = _parcels(missing=("vacancy",))
+    QuantileNormaliser(_KEYS).fit_transform(parcels, write_back=True)
+    assert all(p.metrics["vacancy"] is None for p in parcels)
+
+    # An (N, F) matrix has no parcels to write into.
+    raw = np.array(list(_raw(_parcels()).values()))
+    try:
+        QuantileNormaliser(_KEYS, write_back=True).fit_transform(raw)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for write_back on a matrix")
+    print("write-back ok")
+
+
+if __name__ == "__main__":
+    test_fit_transform_and_partial_fit()
+    test_state_round_trip()
+    test_write_back_only_when_asked()
+    print("all CoG normaliser checks passed")
@@ -0,0 +1,214 @@
+"""
+CoG payload + kernel consistency checks
+Guards the two hand-written equivalences the CoG endpoints rely on:
+
+  1. The binary wire format (cog_payload.encode_binary) round-trips to the
+     same parcels as the "columnar" JSON format, across header lengths that
+     exercise every alignment pad, odd buffer lengths and every dtype —
+     decoded by a Python mirror of frontend/src/services/cogPayload.js and,
+     when node is installed, by decodeCogBinary itself.
+  2. The multi-seed ascent kernels (_discrete_solve_multi_numpy, the bound
+     _discrete_solve_multi and _discrete_solve_serial, Numba when
+     available) and the bootstrap kernels match _discrete_solve_core_py
+     seed-for-seed.
+
+Run from backend/:  python test_cog_payload_kernels.py
+(the test_* functions also run under pytest)
+"""
+
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import cog_solver
+from cog_payload import encode_binary, parcel_columns, parcels_as_columnar
+from geo import project
+
+_JS_DECODER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "frontend", "src", "services", "cogPayload.js",
+)
+
+
+# ── Binary payload ─────────────────────────────────────────────────────────
+
+def _decode_binary(payload):
+    """Python mirror of decodeCogBinary: (header, {name: ndarray})."""
+    (header_len,) = struct.unpack_from("<I", payload, 0)
+    header = json.loads(payload[4:4 + header_len].decode("utf-8"))
+    base = -(-(4 + header_len) // 8) * 8
+    assert payload[4 + header_len:base] == b"\0" * (base - 4 - header_len)
+    columns = {}
+    for spec in header["buffers"]:
+        assert spec["offset"] % 8 == 0, spec
+        start = base + spec["offset"]
+        columns[spec["name"]] = np.frombuffer(
+            payload, dtype=spec["dtype"], count=spec["length"], offset=start,
+        )
+    last = header["buffers"][-1]
+    end = base + last["offset"] + last["length"] * np.dtype(last["dtype"]).itemsize
+    assert len(payload) == end + (-end % 8), (len(payload), end)
+    return header, columns
+
+
+def _decode_with_node(payload):
+    """decodeCogBinary + columnsToParcels run by node, or None without node."""
+    node = shutil.which("node")
+    if node is None or not os.path.exists(_JS_DECODER):
+        return None
+    script = (
+        "import { readFileSync } from 'fs';"
+        f"import {{ decodeCogBinary, columnsToParcels }} from {json.dumps(os.path.abspath(_JS_DECODER))};"
+        "const b = readFileSync(process.argv[1]);"
+        "const d = decodeCogBinary(b.buffer.slice(b.byteOffset, b.byteOffset + b.length));"
+        "const { columns, buffers, ...header } = d;"
+        "console.log(JSON.stringify({ header, parcels: columnsToParcels(d),"
+        "  scores: Array.from(columns.scores) }));"
+    )
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as fh:
+        fh.write(payload)
+    try:
+        out = subprocess.run(
+            [node, "--no-warnings", "--input-type=module", "-e", script, fh.name],
+            capture_output=True, text=True, check=True,
+        ).stdout
+    finally:
+        os.unlink(fh.name)
+    return json.loads(out)
+
+
+def _random_columns(rng, n):
+    vocab = ("residential", "commercial", "mixed")[: max(1, n % 4)]
+    return parcel_columns(
+        ids=rng.integers(-5, 1 << 40, n),
+        latlng=np.c_[-26.2 + rng.random(n) * 0.2, 28.0 + rng.random(n) * 0.2],
+        scores=rng.random(n),
+        feasible=rng.random(n) > 0.3,
+        zoning_idx=rng.integers(0, len(vocab), n),
+        zoning_vocab=vocab,
+    )
+
+
+def test_binary_round_trip():
+    rng = np.random.default_rng(10)
+    checked_node = False
+    for n in (0, 1, 3, 7, 64, 257):
+        for pad in range(8):                     # every header alignment
+            cols = _random_columns(rng, n)
+            header = {"success": True, "lat": -26.1, "lng": 28.05, "note": "x" * pad}
+            payload = encode_binary(header, cols)
+            expected = parcels_as_columnar(cols)
+
+            got_header, got = _decode_binary(payload)
+            assert got_header["parcel_count"] == n
+            assert got_header["zoning_vocab"] == expected["zoning_vocab"]
+            assert {k: got_header[k] for k in header} == header
+            assert got["ids"].tolist() == expected["ids"]
+            assert got["lats"].tolist() == expected["lats"]
+            assert got["lngs"].tolist() == expected["lngs"]
+            assert got["feasible"].astype(bool).tolist() == expected["feasible"]
+            assert got["zoning_idx"].tolist() == expected["zoning_idx"]
+            # scores travel as float32; columnar rounds to 4 dp
+            assert np.allclose(got["scores"], cols["scores"], rtol=0, atol=1e-7)
+            assert np.allclose(got["scores"], expected["scores"], rtol=0, atol=5.1e-5)
+
+            if n and pad in (0, 5):
+                js = _decode_with_node(payload)
+                if js is None:
+                    continue
+                checked_node = True
+                assert {k: js["header"][k] for k in header} == header
+                vocab = expected["zoning_vocab"]
+                assert [p["id"] for p in js["parcels"]] == expected["ids"]
+                assert [p["lat"] for p in js["parcels"]] == expected["lats"]
+                assert [p["lng"] for p in js["parcels"]] == expected["lngs"]
+                assert [p["feasible"] for p in js["parcels"]] == expected["feasible"]
+                assert [p["zoning"] for p in js["parcels"]] == [
+                    vocab[i] for i in expected["zoning_idx"]
+                ]
+                assert js["scores"] == got["scores"].astype(np.float64).tolist()
+    print(f"binary round trip ok (node decoder {'checked' if checked_node else 'skipped'})")
+
+
+# ── Multi-seed kernels ─────────────────────────────────────────────────────
+
+def _random_case(rng, case):
+    n = int(rng.integers(12, 400))
+    positions = np.c_[-26.1 + rng.random(n) * 0.1, 28.0 + rng.random(n) * 0.1]
+    pos_m = project(positions)
+    nb = cog_solver._build_neighbour_index(
+        positions, min(int(rng.integers(3, 12)), n - 1), pos_m=pos_m,
+    ).astype(np.int64)
+    dtype = np.float32 if case % 2 else np.float64
+    V = rng.random(n)
+    if case % 3 == 0:
+        V = np.round(V, 1)                       # plateaus → lateral / tabu moves
+    feasible = rng.random(n) > 0.2
+    return (V.astype(dtype), pos_m, nb, feasible,
+            int(rng.integers(1, 80)), int(rng.integers(0, 6)))
+
+
+def _scalar(V, pos_m, nb, feasible, max_iter, seeds, tabu):
+    out = [cog_solver._discrete_solve_core_py(V, pos_m, nb, feasible, max_iter, s, tabu)
+           for s in seeds]
+    return tuple(np.array(col) for col in zip(*out))
+
+
+def test_multi_seed_kernels_match_scalar():
+    cog_solver._load_acceleration()
+    kernels = {"numpy": cog_solver._discrete_solve_multi_numpy,
+               "bound": cog_solver._discrete_solve_multi,
+               "serial": cog_solver._discrete_solve_serial}
+    rng = np.random.default_rng(3)
+    for case in range(40):
+        V, pos_m, nb, feasible, max_iter, tabu = _random_case(rng, case)
+        seeds = rng.integers(0, len(V), int(rng.integers(1, 12))).astype(np.int64)
+        ref = _scalar(V, pos_m, nb, feasible, max_iter, seeds, tabu)
+        for name, kernel in kernels.items():
+            landing, iterations, converged, delta = kernel(
+                V, pos_m, nb, feasible, max_iter, seeds, tabu,
+            )
+            assert (landing == ref[0]).all(), (name, case)
+            assert (iterations == ref[1]).all(), (name, case)
+            assert (converged == ref[2]).all(), (name, case)
+            assert np.allclose(delta, ref[3], rtol=1e-9, atol=1e-9), (name, case)
+    print(f"multi-seed kernels ok ({', '.join(kernels)}; "
+          f"numba={cog_solver.acceleration_info()['numba_jit']})")
+
+
+def test_bootstrap_kernels_match_scalar():
+    cog_solver._load_acceleration()
+    kernels = {"numpy": cog_solver._bootstrap_multi_numpy,
+               "bound": cog_solver._bootstrap_multi}
+    rng = np.random.default_rng(4)
+    for case in range(20):
+        V, pos_m, nb, feasible, max_iter, tabu = _random_case(rng, case)
+        B, R = int(rng.integers(1, 6)), int(rng.integers(1, 6))
+        V_bt = np.ascontiguousarray(
+            np.stack([rng.permutation(V) for _ in range(B)]), dtype=V.dtype,
+        )
+        seeds = rng.integers(0, len(V), (B, R)).astype(np.int64)
+        ref = np.stack([
+            _scalar(V_bt[b], pos_m, nb, feasible, max_iter, seeds[b], tabu)[0]
+            for b in range(B)
+        ])
+        for name, kernel in kernels.items():
+            landing = kernel(V_bt, pos_m, nb, feasible, max_iter, seeds, tabu)
+            assert (landing == ref).all(), (name, case)
+    print(f"bootstrap kernels ok ({', '.join(kernels)})")
+
+
+if __name__ == "__main__":
+    test_binary_round_trip()
+    test_multi_seed_kernels_match_scalar()
+    test_bootstrap_kernels_match_scalar()
+    print("all CoG consistency checks passed")
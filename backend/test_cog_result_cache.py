@@ -0,0 +1,122 @@
+"""
+CoG result cache checks
+Guards cog_result_cache, the memo behind /api/cog/solve:
+
+  1. Versioned lookups: ``get(key, data_version)`` drops a result solved
+     from older parcel data, and serves it when either version is unknown.
+  2. result_key: equivalent weight vectors ({25, 25, …} / {0.25, 0.25, …},
+     any scale) share a key; any change to a SolverConfig field, an option,
+     the zoning filter, the kind, the area or the data version changes it.
+
+Run from backend/:  python test_cog_result_cache.py
+(the test_* functions also run under pytest)
+"""
+
+import dataclasses
+import os
+import random
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cog_result_cache import CachedResult, _ResultLRUCache, result_key
+from cog_solver import WEIGHT_TO_METRIC, SolverConfig
+
+_PERCENT = {"rentalYield": 25, "pricePerSqm": 25, "vacancy": 20,
+            "transitProximity": 15, "footfall": 15}
+
+
+# ── Versioned lookups ──────────────────────────────────────────────────────
+
+def test_outdated_result_is_dropped():
+    cache = _ResultLRUCache()
+    cache.put("a", CachedResult(area_id=1, payload={"lat": 1.0}, data_version="v1"))
+    assert cache.get("a", "v1").payload == {"lat": 1.0}
+    assert cache.get("a") is not None                  # caller's version unknown
+
+    assert cache.get("a", "v2") is None
+    assert cache.get("a", "v1") is None                # dropped, not skipped
+    stats = cache.stats()
+    assert stats["outdated"] == 1 and stats["entries"] == 0
+
+    # A result stored without a version (the key carries it) is never outdated.
+    cache.put("b", CachedResult(area_id=1, payload={}))
+    assert cache.get("b", "v2") is not None
+    print("versioned lookups ok")
+
+
+# ── result_key ─────────────────────────────────────────────────────────────
+
+def _key(weights=_PERCENT, zoning=("residential", "mixed"), config=None, **options):
+    return result_key(1, "solve", weights, set(zoning), config or SolverConfig(),
+                      **options)
+
+
+def test_equivalent_weights_share_a_key():
+    base = _key()
+    assert _key({k: v / 100 for k, v in _PERCENT.items()}) == base
+    assert _key({k: v * 3 for k, v in _PERCENT.items()}) == base
+    assert _key({k: str(v) for k, v in _PERCENT.items()}) == base
+    assert _key({**_PERCENT, "unknownSlider": 0}) == base
+    assert _key(zoning=("mixed", "residential")) == base
+
+    # Every integer-percent profile matches its fraction form, although the
+    # two normalisations differ in the last bit for some of them.
+    rng = random.Random(15)
+    for _ in range(500):
+        cuts  = sorted(rng.sample(range(1, 100), len(WEIGHT_TO_METRIC) - 1))
+        parts = [b - a for a, b in zip([0] + cuts, cuts + [100])]
+        percent = dict(zip(WEIGHT_TO_METRIC, parts))
+        assert _key(percent) == _key({k: v / 100 for k, v in percent.items()}), percent
+
+    batch = [("balanced", _PERCENT), ("value", {"rentalYield": 1})]
+    batch_frac = [("balanced", {k: v / 100 for k, v in _PERCENT.items()}),
+                  ("value", {"rentalYield": 40})]
+    assert (result_key(1, "batch", batch, set(), SolverConfig())
+            == result_key(1, "batch", batch_frac, set(), SolverConfig()))
+    assert _key({**_PERCENT, "footfall": 16}) != base
+    print("equivalent weights ok")
+
+
+def _changed(value):
+    """A different value of the same type as a SolverConfig default."""
+    if isinstance(value, bool):
+        return not value
+    if isinstance(value, (int, float)):
+        return value * 2 + 1
+    if isinstance(value, str):
+        return value + "_other"
+    if isinstance(value, dict):
+        return {**value, "rental_yield": (0.0, 1.0)}
+    raise TypeError(f"no perturbation for {type(value).__name__}")
+
+
+def test_every_input_changes_the_key():
+    default = SolverConfig()
+    keys = {"base": _key()}
+    for f in dataclasses.fields(SolverConfig):
+        config = dataclasses.replace(default, **{f.name: _changed(getattr(default, f.name))})
+        keys[f"config.{f.name}"] = _key(config=config)
+    for name, value in {"tiled": True, "tile_m": 2000.0, "halo_m": 250.0,
+                        "include_parcels": False, "top_k": 3}.items():
+        keys[f"option.{name}"] = _key(**{name: value})
+    keys["option.tile_m+"] = _key(tile_m=2500.0)
+    keys["zoning"]  = _key(zoning=("residential",))
+    keys["kind"]    = result_key(1, "tiled", _PERCENT, {"residential", "mixed"}, default)
+    keys["area"]    = result_key(2, "solve", _PERCENT, {"residential", "mixed"}, default)
+    keys["version"] = result_key(1, "solve", _PERCENT, {"residential", "mixed"}, default,
+                                 data_version="v2")
+
+    same = [name for name, key in keys.items()
+            if name != "base" and key == keys["base"]]
+    assert not same, f"inputs not in the key: {same}"
+    assert len(set(keys.values())) == len(keys)
+    print(f"result_key covers {len(keys) - 1} inputs")
+
+
+if __name__ == "__main__":
+    test_outdated_result_is_dropped()
+    test_equivalent_weights_share_a_key()
+    test_every_input_changes_the_key()
+    print("all CoG result cache checks passed")
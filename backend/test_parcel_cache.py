@@ -0,0 +1,382 @@
+"""
+Parcel cache concurrency checks
+Covers the paths of parcel_cache._ParcelLRUCache that only show up under
+concurrent requests or across worker processes:
+
+  1. Stale-while-revalidate: an expired entry is served (flagged stale)
+     while exactly one background refresh reloads it; a failing refresher
+     leaves the stale entry in place and is counted.
+  2. Single-flight loading: concurrent get_or_load misses wait on one
+     loader call, and a loader exception reaches every waiter.
+  3. Cross-worker invalidation: two cache instances over the same
+     COG_CACHE_DIR (standing in for two Gunicorn workers) see each other's
+     writes and invalidations.
+  4. Data-version revalidation: a changed probe version invalidates the
+     entry, fires the invalidation listeners (and so drops the area's
+     memoised solve results), and a failing probe falls back to the last
+     known version.  A worker whose last probe is behind re-probes instead
+     of deleting a newer worker's shared entry.
+
+Run from backend/:  python test_parcel_cache.py
+(the test_* functions also run under pytest)
+"""
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import parcel_cache
+from cog_result_cache import CachedResult, _ResultLRUCache
+from parcel_cache import ParcelCacheEntry, _ParcelLRUCache
+
+_WAIT_S = 5.0
+# How long a test loader holds its flight open — long enough for every
+# thread released by the barrier in _in_threads to reach get_or_load.
+_LOAD_S = 0.2
+
+
+@contextlib.contextmanager
+def _patched(**values):
+    """Temporarily override parcel_cache module constants (TTL_SECONDS, …)."""
+    saved = {name: getattr(parcel_cache, name) for name in values}
+    for name, value in values.items():
+        setattr(parcel_cache, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(parcel_cache, name, value)
+
+
+@contextlib.contextmanager
+def _shared_dir():
+    root = tempfile.mkdtemp(prefix="cog_cache_test_")
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _entry(area_id, n=12, seed=0, data_version=None, age_s=0.0):
+    """A small ParcelCacheEntry built directly (no normaliser fit)."""
+    rng = np.random.default_rng(seed)
+    positions = np.c_[-26.1 + rng.random(n) * 0.05, 28.0 + rng.random(n) * 0.05]
+    return ParcelCacheEntry(
+        area_id=area_id,
+        positions=positions,
+        normed=rng.random((n, 5)),
+        zoning_idx=np.zeros(n, dtype=np.int16),
+        zoning_vocab=("residential",),
+        hazard_flags=np.zeros(n, dtype=bool),
+        parcel_ids=np.arange(n, dtype=np.int64),
+        metric_keys=("a", "b", "c", "d", "e"),
+        created_at=time.monotonic() - age_s,
+        data_version=data_version,
+    )
+
+
+def _in_threads(fn, n):
+    """Run ``fn()`` on ``n`` threads started together; (results, errors)."""
+    results, errors = [None] * n, [None] * n
+    start = threading.Barrier(n)
+
+    def run(i):
+        start.wait()
+        try:
+            results[i] = fn()
+        except BaseException as exc:
+            errors[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(_WAIT_S)
+    return results, errors
+
+
+def _wait_for(cond):
+    deadline = time.monotonic() + _WAIT_S
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+# ── Stale-while-revalidate ─────────────────────────────────────────────────
+
+def test_stale_entry_served_while_one_refresh_runs():
+    with _patched(TTL_SECONDS=60.0, STALE_SECONDS=60.0):
+        cache = _ParcelLRUCache(shared_dir=None)
+        stale = _entry(1, age_s=90.0)              # past TTL, inside window
+        cache.put(1, stale)
+
+        release, calls = threading.Event(), []
+
+        def refresher(area_id, old):
+            calls.append((area_id, old))
+            assert release.wait(_WAIT_S)
+            fresh = _entry(area_id, seed=1)
+            cache.put(area_id, fresh)
+            return fresh
+
+        cache.set_refresher(refresher)
+        served = [cache.get(1) for _ in range(5)]
+        served += _in_threads(lambda: cache.get(1), 8)[0]
+        assert all(e is stale for e in served)
+        assert stale.stale
+        _wait_for(lambda: calls)
+        assert cache.stats()["refreshing"] == [1]
+
+        release.set()
+        _wait_for(lambda: not cache.stats()["refreshing"])
+        stats = cache.stats()
+        assert len(calls) == 1 and calls[0] == (1, stale)
+        assert stats["refreshes"] == 1 and stats["stale_hits"] == 13
+        fresh = cache.get(1)
+        assert fresh is not stale and not fresh.stale and not fresh.is_expired()
+    print("stale-while-revalidate ok (13 stale hits, 1 refresh)")
+
+
+def test_refresher_failure_keeps_stale_entry():
+    with _patched(TTL_SECONDS=60.0, STALE_SECONDS=60.0):
+        cache = _ParcelLRUCache(shared_dir=None)
+        stale = _entry(2, age_s=90.0)
+        cache.put(2, stale)
+        attempts = []
+
+        def refresher(area_id, old):
+            attempts.append(area_id)
+            raise RuntimeError("database unavailable")
+
+        cache.set_refresher(refresher)
+        assert cache.get(2) is stale
+        _wait_for(lambda: cache.stats()["refresh_errors"] == 1)
+        _wait_for(lambda: not cache.stats()["refreshing"])
+        # Still served, and the next stale hit retries the refresh.
+        assert cache.get(2) is stale
+        _wait_for(lambda: cache.stats()["refresh_errors"] == 2)
+        assert attempts == [2, 2] and cache.stats()["refreshes"] == 0
+
+        # A refresher returning None drops the area.
+        cache.set_refresher(lambda area_id, old: None)
+        _wait_for(lambda: not cache.stats()["refreshing"])
+        assert cache.get(2) is stale
+        _wait_for(lambda: cache.stats()["entries"] == 0)
+        assert cache.get(2) is None
+
+    with _patched(TTL_SECONDS=60.0, STALE_SECONDS=10.0):
+        # Past the stale window the entry is evicted, not served.
+        cache = _ParcelLRUCache(shared_dir=None)
+        cache.set_refresher(lambda area_id, old: old)
+        cache.put(3, _entry(3, age_s=90.0))
+        assert cache.get(3) is None and cache.stats()["refreshes"] == 0
+    print("refresher failures ok")
+
+
+# ── Single-flight loading ──────────────────────────────────────────────────
+
+def test_concurrent_misses_share_one_loader():
+    cache = _ParcelLRUCache(shared_dir=None)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(_LOAD_S)
+        entry = _entry(4)
+        cache.put(4, entry)
+        return entry
+
+    def load():
+        return cache.get_or_load(4, loader, timeout=_WAIT_S)
+
+    results, errors = _in_threads(load, 8)
+    assert errors == [None] * 8, errors
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results) and results[0].area_id == 4
+    assert cache.stats()["refreshing"] == []
+    # Later calls are plain hits.
+    assert cache.get_or_load(4, loader) is results[0] and len(calls) == 1
+    print("single-flight load ok (8 callers, 1 loader call)")
+
+
+def test_loader_exception_reaches_every_waiter():
+    cache = _ParcelLRUCache(shared_dir=None)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(_LOAD_S)
+        raise LookupError("no parcels for area 5")
+
+    results, errors = _in_threads(
+        lambda: cache.get_or_load(5, loader, timeout=_WAIT_S), 6,
+    )
+    assert len(calls) == 1
+    assert results == [None] * 6
+    assert all(isinstance(e, LookupError) for e in errors), errors
+
+    # The failed flight is cleared: the next miss runs the loader again.
+    entry = _entry(5)
+    assert cache.get_or_load(5, lambda: (cache.put(5, entry), entry)[1]) is entry
+    print("loader exceptions ok (6 waiters)")
+
+
+# ── Cross-worker invalidation ──────────────────────────────────────────────
+
+def test_invalidation_seen_by_second_instance():
+    with _shared_dir() as root:
+        worker_a = _ParcelLRUCache(shared_dir=root)
+        worker_b = _ParcelLRUCache(shared_dir=root)
+        dropped = []
+        worker_b.add_invalidation_listener(dropped.append)
+
+        worker_a.put(6, _entry(6))
+        seen = worker_b.get(6)
+        assert seen is not None and seen.n_parcels == 12
+        assert seen.shared_version == worker_a.get(6).shared_version
+
+        # A new version written by A replaces B's mapped copy.
+        worker_a.put(6, _entry(6, n=20, seed=2))
+        assert worker_b.get(6).n_parcels == 20
+
+        worker_a.invalidate(6)
+        assert worker_b.get(6) is None
+        assert dropped == [6]
+        assert worker_b.stats()["entries"] == 0
+        assert not os.path.exists(os.path.join(root, "area_6.json"))
+    print("cross-instance invalidation ok")
+
+
+# ── Data-version revalidation ──────────────────────────────────────────────
+
+class _FakeProbe:
+    """Version probe returning ``version`` (or raising ``error``), counted."""
+
+    def __init__(self, version):
+        self.version = version
+        self.error   = None
+        self.calls   = 0
+
+    def __call__(self, area_id):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.version
+
+
+def test_version_change_invalidates_entry_and_results():
+    revalidate_s = 0.05
+    with _patched(REVALIDATE_SECONDS=revalidate_s):
+        cache   = _ParcelLRUCache(shared_dir=None)
+        results = _ResultLRUCache()
+        dropped = []
+        probe   = _FakeProbe("v1")
+        cache.set_version_probe(probe)
+        cache.add_invalidation_listener(dropped.append)
+        cache.add_invalidation_listener(results.invalidate_area)
+
+        cache.put(7, _entry(7, data_version=cache.current_version(7)))
+        results.put("k7", CachedResult(area_id=7, payload={}, data_version="v1"))
+        results.put("k8", CachedResult(area_id=8, payload={}, data_version="v1"))
+        assert cache.get(7) is not None and probe.calls == 1
+
+        # Inside the window the last probe is reused.
+        probe.version = "v2"
+        assert cache.get(7) is not None and probe.calls == 1
+
+        time.sleep(revalidate_s * 1.5)
+        assert cache.get(7) is None
+        assert probe.calls == 2 and dropped == [7]
+        assert results.get("k7") is None and results.get("k8") is not None
+        stats = cache.stats()
+        assert stats["version_checks"] == 2 and stats["version_changes"] == 1
+
+        # An entry built from older rows (e.g. mapped from another worker)
+        # is dropped on sight, even with no probe change in this process.
+        cache.put(7, _entry(7, data_version="v1"))
+        assert cache.get(7) is None and dropped == [7, 7]
+        cache.put(7, _entry(7, data_version="v2"))
+        assert cache.get(7) is not None
+    print("version change invalidation ok")
+
+
+def test_failing_probe_falls_back_to_last_version():
+    revalidate_s = 0.05
+    with _patched(REVALIDATE_SECONDS=revalidate_s):
+        cache = _ParcelLRUCache(shared_dir=None)
+        probe = _FakeProbe("v1")
+        probe.error = OSError("connection refused")
+        cache.set_version_probe(probe)
+        assert cache.current_version(9) is None        # nothing known yet
+
+        probe.error = None
+        assert cache.current_version(9) == "v1"
+        entry = _entry(9, data_version="v1")
+        cache.put(9, entry)
+
+        probe.error = OSError("connection refused")
+        time.sleep(revalidate_s * 1.5)
+        assert cache.current_version(9) == "v1"
+        assert cache.get(9) is entry
+        stats = cache.stats()
+        assert stats["version_errors"] == 3 and stats["version_changes"] == 0
+
+        # Once the probe recovers, a real change still invalidates.
+        probe.error, probe.version = None, "v2"
+        assert cache.get(9) is None
+    print("failing probe fallback ok")
+
+
+def test_lagging_worker_reprobes_before_dropping_shared_entry():
+    with _patched(REVALIDATE_SECONDS=60.0), _shared_dir() as root:
+        worker_b = _ParcelLRUCache(shared_dir=root)
+        probe_b  = _FakeProbe("v1")
+        dropped_a, dropped_b = [], []
+        worker_b.set_version_probe(probe_b)
+        worker_b.add_invalidation_listener(dropped_b.append)
+        worker_b.put(10, _entry(10, data_version=worker_b.current_version(10)))
+
+        # The rows change.  A probes first, reloads and publishes v2 while
+        # B's last probe (v1) is still inside its window.
+        probe_b.version = "v2"
+        worker_a = _ParcelLRUCache(shared_dir=root)
+        worker_a.set_version_probe(_FakeProbe("v2"))
+        worker_a.add_invalidation_listener(dropped_a.append)
+        worker_a.put(10, _entry(10, n=20, seed=4, data_version=worker_a.current_version(10)))
+
+        # B re-probes at once, adopts v2 and serves A's entry.
+        seen = worker_b.get(10)
+        assert seen is not None and seen.n_parcels == 20 and seen.data_version == "v2"
+        assert probe_b.calls == 2 and worker_b.current_version(10) == "v2"
+        assert dropped_b == [10]                       # its v1 results go
+        assert os.path.exists(os.path.join(root, "area_10.json"))
+        assert worker_a.get(10).n_parcels == 20 and dropped_a == []
+
+        # An entry that really is older is still dropped, shared copy too.
+        worker_c = _ParcelLRUCache(shared_dir=root)
+        worker_c.put(10, _entry(10, data_version="v1"))
+        assert worker_b.get(10) is None and probe_b.calls == 3
+        assert not os.path.exists(os.path.join(root, "area_10.json"))
+        assert worker_a.get(10) is None and dropped_a == [10]
+    print("lagging worker re-probe ok")
+
+
+if __name__ == "__main__":
+    test_stale_entry_served_while_one_refresh_runs()
+    test_refresher_failure_keeps_stale_entry()
+    test_concurrent_misses_share_one_loader()
+    test_loader_exception_reaches_every_waiter()
+    test_invalidation_seen_by_second_instance()
+    test_version_change_invalidates_entry_and_results()
+    test_failing_probe_falls_back_to_last_version()
+    test_lagging_worker_reprobes_before_dropping_shared_entry()
+    print("all parcel cache checks passed")
@@ -34,6 +34,7 @@
 
 import { useState, useEffect, useRef, useCallback } from 'react';
 import areaDataService from '../services/areaDataService';
+import { readCogResponse } from '../services/cogPayload';
 
 // ── Scenario presets ───────────────────────────────────────────────────────
 export const SCENARIOS = {
@@ -184,9 +185,10 @@ export function useCogSolver({ areaId, isActive = true, previewActive = isActive
         method:  'POST',
         headers: { 'Content-Type': 'application/json' },
         signal:  previewAbortRef.current.signal,
-        body:    JSON.stringify(_buildBody(w, z)),
+        // Binary parcel payload: ~4× smaller than per-object JSON during drags
+        body:    JSON.stringify({ ..._buildBody(w, z), format: 'binary' }),
       });
-      const data = await resp.json();
+      const data = await readCogResponse(resp);
       if (data.success) {
         setPreviewResult(data);
       } else {
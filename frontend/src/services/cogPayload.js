@@ -0,0 +1,72 @@
+/**
+ * CoG Payload decoder
+ * Decodes the binary per-parcel encoding returned by /api/cog/solve and
+ * /api/cog/preview when the request body carries `format: 'binary'`.
+ *
+ * Layout (little-endian, see backend/cog_payload.py):
+ *   uint32 header_len | UTF-8 JSON header | pad to 8 | 8-byte aligned buffers
+ * The header holds every scalar response field plus `parcel_count`,
+ * `zoning_vocab` and `buffers: [{ name, dtype, offset, length }]`.
+ */
+
+export const COG_BINARY_MIMETYPE = 'application/vnd.digitalestate.cog+binary';
+
+const TYPED_ARRAYS = {
+  '<i8': BigInt64Array,
+  '<f8': Float64Array,
+  '<f4': Float32Array,
+  '|u1': Uint8Array,
+  '<i2': Int16Array,
+};
+
+/**
+ * Decode an ArrayBuffer into `{ ...header, columns }` where `columns` maps
+ * buffer name → typed array view (no copy; buffers are 8-byte aligned).
+ */
+export function decodeCogBinary(buffer) {
+  const view      = new DataView(buffer);
+  const headerLen = view.getUint32(0, true);
+  const header    = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLen)));
+  const base      = Math.ceil((4 + headerLen) / 8) * 8;
+
+  const columns = {};
+  for (const { name, dtype, offset, length } of header.buffers) {
+    const Typed = TYPED_ARRAYS[dtype];
+    if (!Typed) throw new Error(`Unsupported CoG buffer dtype: ${dtype}`);
+    columns[name] = new Typed(buffer, base + offset, length);
+  }
+  return { ...header, columns };
+}
+
+/**
+ * Rebuild the default `parcels: [{ id, lat, lng, score, feasible, zoning }]`
+ * shape from decoded columns, for components that expect objects.
+ */
+export function columnsToParcels({ columns, zoning_vocab: vocab }) {
+  const n = columns.ids.length;
+  const parcels = new Array(n);
+  for (let i = 0; i < n; i++) {
+    parcels[i] = {
+      id:       Number(columns.ids[i]),
+      lat:      columns.lats[i],
+      lng:      columns.lngs[i],
+      score:    Math.round(columns.scores[i] * 1e4) / 1e4,
+      feasible: columns.feasible[i] === 1,
+      zoning:   vocab[columns.zoning_idx[i]],
+    };
+  }
+  return parcels;
+}
+
+/**
+ * Read a fetch Response that may be binary (success) or JSON (errors and
+ * the default format) and return the usual response object.
+ */
+export async function readCogResponse(resp) {
+  const ct = (resp.headers.get('Content-Type') || '').toLowerCase();
+  if (!ct.startsWith(COG_BINARY_MIMETYPE)) return resp.json();
+
+  const decoded = decodeCogBinary(await resp.arrayBuffer());
+  const { columns, buffers, ...rest } = decoded;
+  return { ...rest, parcels: columnsToParcels(decoded) };
+}